@@ -0,0 +1,120 @@
+"""
+Benchmark: base64_service vs. the previous ConfigValidator / validator Base64 handling.
+
+Usage:
+    python benchmarks/bench_base64_service.py [subscription_body.txt ...]
+
+Pass saved Base64 subscription bodies to benchmark on real data. Without arguments a synthetic
+~5 MB subscription (vmess / ssr / ss links, wrapped at 76 columns) is used. Each round decodes the
+body and then decodes every vmess/ssr payload and ss userinfo as often as validation and cleaning do. Cold
+rounds start from a new, empty service (a scheduled run); warm rounds model the same body or links
+arriving again from other sources.
+"""
+import base64
+import json
+import os
+import random
+import sys
+import time
+from typing import Callable, List, Optional
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.base64_service import Base64Service
+
+ROUNDS = 3
+LINK_COUNT = 25000
+
+
+def build_synthetic_body(link_count: int = LINK_COUNT) -> str:
+    rng = random.Random(5)
+    links = []
+    for index in range(link_count):
+        kind = index % 3
+        if kind == 0:
+            vmess = {"v": "2", "ps": f"node-{index}", "add": f"n{index}.example.com", "port": "443",
+                     "id": "a3482e88-686a-4a58-8126-99c9df64b7bf", "aid": "0", "net": "ws", "type": "none",
+                     "host": f"n{index}.example.com", "path": "/ws", "tls": "tls"}
+            links.append("vmess://" + base64.b64encode(json.dumps(vmess).encode()).decode())
+        elif kind == 1:
+            password = base64.urlsafe_b64encode(f"pw{rng.randrange(10**6)}".encode()).decode().rstrip('=')
+            core = f"n{index}.example.com:8080:origin:aes-256-cfb:plain:{password}/?remarks=" + base64.urlsafe_b64encode(f"r{index}".encode()).decode().rstrip('=')
+            links.append("ssr://" + base64.urlsafe_b64encode(core.encode()).decode().rstrip('='))
+        else:
+            userinfo = base64.urlsafe_b64encode(b"aes-256-gcm:secret").decode().rstrip('=')
+            links.append(f"ss://{userinfo}@n{index}.example.com:8388#ss-{index}")
+    body = base64.b64encode("\n".join(links).encode()).decode()
+    return "\n".join(body[i:i + 76] for i in range(0, len(body), 76))
+
+
+def payloads_of(decoded_body: str) -> List[str]:
+    """
+    The Base64 decodes validation performs: vmess payloads once (is_valid), ssr payloads and ss
+    userinfo twice (is_valid, then clean).
+    """
+    payloads = []
+    for link in decoded_body.splitlines():
+        if link.startswith("vmess://"):
+            payloads.append(link[8:])
+        elif link.startswith("ssr://"):
+            payloads.extend([link[6:].split('#')[0].split('/?')[0]] * 2)
+        elif link.startswith("ss://"):
+            payloads.extend([link[5:].split('@')[0]] * 2)
+    return payloads
+
+
+def legacy_decode(text: str) -> Optional[bytes]:
+    padded = text.replace('-', '+').replace('_', '/')
+    padded += '=' * (-len(padded) % 4)
+    try:
+        return base64.b64decode(padded, validate=True)
+    except Exception:
+        return None
+
+
+def legacy_round(body: str) -> int:
+    """is_base64 (decode) + decode_base64_text (decode again) + one decode per payload."""
+    compact = ''.join(body.split())
+    base64.b64decode(compact, validate=True) # is_base64
+    decoded_body = base64.b64decode(compact, validate=True).decode('utf-8', errors='ignore')
+    return sum(1 for payload in payloads_of(decoded_body) if legacy_decode(payload) is not None)
+
+
+def service_round(service: Base64Service, body: str) -> int:
+    compact = ''.join(body.split())
+    service.is_base64(compact)
+    decoded_body, _ = service.decode_nested_text(compact)
+    return sum(1 for payload in payloads_of(decoded_body) if service.decode(payload) is not None)
+
+
+def bench(name: str, func: Callable[[str], int], bodies: List[str], rounds: int = ROUNDS) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        decoded = sum(func(body) for body in bodies)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / rounds
+    print(f"{name:<34} {elapsed_ms:10.1f} ms/round   payloads: {decoded}")
+    return elapsed_ms
+
+
+def main():
+    if len(sys.argv) > 1:
+        bodies = []
+        for path in sys.argv[1:]:
+            with open(path, 'r', encoding='utf-8') as f:
+                bodies.append(f.read())
+        print(f"Benchmarking on {len(bodies)} subscription bodies, {ROUNDS} rounds.")
+    else:
+        bodies = [build_synthetic_body()]
+        print(f"Benchmarking on a synthetic Base64 subscription ({len(bodies[0]) // 1024} KB, {LINK_COUNT} links), {ROUNDS} rounds.")
+
+    legacy_ms = bench("legacy (decode per check)", legacy_round, bodies)
+    new_service = lambda: Base64Service(max_entries=200000, max_bytes=256 * 1024 * 1024)
+    cold_ms = bench("base64_service, empty cache", lambda body: service_round(new_service(), body), bodies)
+    service = new_service()
+    service_round(service, bodies[0])
+    warm_ms = bench("base64_service, warm cache", lambda body: service_round(service, body), bodies)
+    print(f"{'':<34} speed-up x{legacy_ms / cold_ms:.1f} (cold), x{legacy_ms / warm_ms:.1f} (warm)")
+
+
+if __name__ == '__main__':
+    main()
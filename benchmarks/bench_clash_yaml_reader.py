@@ -0,0 +1,107 @@
+"""
+Benchmark: streaming Clash reader vs. yaml.safe_load of the whole document.
+
+Usage:
+    python benchmarks/bench_clash_yaml_reader.py [clash_config.yaml ...]
+
+Pass saved Clash configs to benchmark on real data. Without arguments a synthetic ~8 MB config
+(block-style proxies of several types, an anchored defaults block merged with '<<', and a large
+proxy-groups section) is used. Each variant runs in a forked child process so its peak RSS
+(libyaml allocations included) can be reported; Linux/macOS only. Also checks that the streaming
+reader returns the same proxies as yaml.safe_load.
+"""
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import time
+from typing import Callable, List
+
+import yaml
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.parsers.clash_yaml_reader import YAML_LOADER, iter_clash_entries
+
+PROXY_COUNT = 30000
+
+
+def build_synthetic_config(proxy_count: int = PROXY_COUNT) -> str:
+    rng = random.Random(3)
+    lines = ["port: 7890", "mode: rule", "defaults: &defaults", "  udp: true", "  skip-cert-verify: false", "proxies:"]
+    names = []
+    for index in range(proxy_count):
+        name = f"node-{index}"
+        names.append(name)
+        kind = rng.randrange(4)
+        lines.append(f"  - name: {name}")
+        lines.append(f"    server: n{index}.example.com")
+        lines.append(f"    port: {rng.choice([443, 8443, 2053])}")
+        lines.append("    <<: *defaults")
+        if kind == 0:
+            lines += ["    type: vmess", "    uuid: a3482e88-686a-4a58-8126-99c9df64b7bf", "    alterId: 0", "    cipher: auto",
+                      "    tls: true", "    network: ws", "    ws-opts:", "      path: /ws", "      headers:", f"        Host: n{index}.example.com"]
+        elif kind == 1:
+            lines += ["    type: vless", "    uuid: a3482e88-686a-4a58-8126-99c9df64b7bf", "    tls: true", "    servername: www.example.com",
+                      "    reality-opts:", "      public-key: Z84J2IelR9ch3k8VtlVhhs5ycBUlXA7wHBWcBrjqnAw", "      short-id: 6ba85179"]
+        elif kind == 2:
+            lines += ["    type: trojan", "    password: secret", f"    sni: n{index}.example.com"]
+        else:
+            lines += ["    type: ss", "    cipher: aes-256-gcm", "    password: secret"]
+    lines.append("proxy-groups:")
+    for group in ("auto", "select", "fallback"):
+        lines += [f"  - name: {group}", "    type: select", "    proxies:"] + [f"      - {name}" for name in names]
+    lines += ["proxy-providers:", "  remote:", "    type: http", "    url: https://sub.example.com/clash.yaml", "rules:", "  - MATCH,select"]
+    return "\n".join(lines) + "\n"
+
+
+def legacy_entries(content: str) -> List:
+    clash_data = yaml.safe_load(content)
+    return [proxy for proxy in clash_data.get('proxies', [])]
+
+
+def _run_child(func: Callable[[str], int], contents: List[str], results) -> None:
+    start = time.perf_counter()
+    count = sum(func(content) for content in contents)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss # KB on Linux
+    results.put((elapsed, peak_kb, count))
+
+
+def bench(name: str, func: Callable[[str], int], contents: List[str]) -> None:
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    child = context.Process(target=_run_child, args=(func, contents, results))
+    child.start()
+    elapsed, peak_kb, count = results.get()
+    child.join()
+    print(f"{name:<34} {elapsed:8.2f} s   peak RSS {peak_kb / 1024:8.1f} MB   proxies: {count}")
+
+
+def main():
+    if len(sys.argv) > 1:
+        contents = []
+        for path in sys.argv[1:]:
+            with open(path, 'r', encoding='utf-8') as f:
+                contents.append(f.read())
+        print(f"Benchmarking on {len(contents)} Clash configs.")
+    else:
+        contents = [build_synthetic_config()]
+        print(f"Benchmarking on a synthetic Clash config with {PROXY_COUNT} proxies ({len(contents[0]) // (1024 * 1024)} MB).")
+    print(f"Loader: {YAML_LOADER.__name__}")
+
+    bench("yaml.safe_load (previous)", lambda content: len(legacy_entries(content)), contents)
+    bench("full load with fast loader", lambda content: sum(1 for entry in iter_clash_entries(content) if entry[0] == 'proxies'), contents)
+    bench("streaming", lambda content: sum(1 for entry in iter_clash_entries(content, streaming=True) if entry[0] == 'proxies'), contents)
+
+    mismatches = 0
+    for content in contents:
+        streamed = [entry for section, _, entry in iter_clash_entries(content, streaming=True) if section == 'proxies']
+        if streamed != legacy_entries(content):
+            mismatches += 1
+    print(f"Configs with different proxies: {mismatches}")
+
+
+if __name__ == '__main__':
+    main()
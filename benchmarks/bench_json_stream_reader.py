@@ -0,0 +1,100 @@
+"""
+Benchmark: incremental JSON reading vs. loading the whole document.
+
+Usage:
+    python benchmarks/bench_json_stream_reader.py [singbox_config.json ...]
+
+Pass saved SingBox configs to benchmark on real data. Without arguments the synthetic config of
+bench_singbox_converters.py is used, scaled to 50,000 outbounds. Two workloads are measured:
+iterating the 'outbounds' array, and collecting every string value that contains a link (the
+generic-JSON path). For the second one every fifth synthetic outbound also carries a share link
+(the trojan ones written with escaped ':\\/\\/', as PHP and Go JSON encoders do). Each variant
+runs in a forked child process so its peak RSS can be reported; Linux/macOS only.
+"""
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from typing import Any, Callable, Iterator, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.bench_parsed_link import build_synthetic_links
+from benchmarks.bench_singbox_converters import build_synthetic_config
+from src.parsers.json_stream_reader import JSON_BACKEND, iter_json_array_items, iter_json_strings, load_json
+from src.utils.link_scanner import LinkScanner
+
+OUTBOUND_COUNT = 50000
+LINK_EVERY = 5 # one share link per this many outbounds in the link strings workload
+ESCAPED_SCHEME_SEPARATOR = ':\\/\\/' # '://' as written by JSON encoders that escape '/'
+
+
+def build_link_document(outbound_count: int) -> str:
+    """The synthetic config with a 'share_link' string on every LINK_EVERY-th outbound."""
+    config = json.loads(build_synthetic_config(outbound_count))
+    links = build_synthetic_links(outbound_count // LINK_EVERY + 1)
+    for index, outbound in enumerate(config['outbounds'][::LINK_EVERY]):
+        outbound['share_link'] = links[index]
+    return json.dumps(config).replace('"trojan://', '"trojan' + ESCAPED_SCHEME_SEPARATOR)
+
+
+def iter_document_strings(json_data: Any) -> Iterator[str]:
+    stack = [json_data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            yield item
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+
+
+def _run_child(func: Callable[[str], int], contents: List[str], results) -> None:
+    start = time.perf_counter()
+    count = sum(func(content) for content in contents)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss # KB on Linux
+    results.put((elapsed, peak_kb, count))
+
+
+def bench(name: str, func: Callable[[str], int], contents: List[str]) -> None:
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    child = context.Process(target=_run_child, args=(func, contents, results))
+    child.start()
+    elapsed, peak_kb, count = results.get()
+    child.join()
+    print(f"{name:<38} {elapsed:8.2f} s   peak RSS {peak_kb / 1024:8.1f} MB   items: {count}")
+
+
+def main():
+    if len(sys.argv) > 1:
+        contents = []
+        for path in sys.argv[1:]:
+            with open(path, 'r', encoding='utf-8') as f:
+                contents.append(f.read())
+        link_contents = contents
+        print(f"Benchmarking on {len(contents)} JSON files.")
+    else:
+        contents = [build_synthetic_config(OUTBOUND_COUNT)]
+        link_contents = [build_link_document(OUTBOUND_COUNT)]
+        print(f"Benchmarking on a synthetic SingBox config with {OUTBOUND_COUNT} outbounds ({len(contents[0]) // (1024 * 1024)} MB).")
+    print(f"Fast backend: {JSON_BACKEND}")
+
+    scanner = LinkScanner()
+    print("Outbounds:")
+    bench("json.loads (previous)", lambda content: len(json.loads(content).get('outbounds', [])), contents)
+    bench(f"load_json ({JSON_BACKEND})", lambda content: len(load_json(content).get('outbounds', [])), contents)
+    bench("iter_json_array_items", lambda content: sum(1 for _ in iter_json_array_items(content, 'outbounds')), contents)
+    link_count = sum(content.count('://') + content.count(ESCAPED_SCHEME_SEPARATOR) for content in link_contents)
+    print(f"Link strings ({link_count} links):")
+    bench("json.loads + walk (previous)",
+          lambda content: sum(1 for value in iter_document_strings(json.loads(content)) if scanner.contains_link(value)), link_contents)
+    bench("iter_json_strings", lambda content: sum(1 for _ in iter_json_strings(content, scanner.contains_link)), link_contents)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark: output files written from canonicalized links vs. the links as collected.
+
+Usage:
+    python benchmarks/bench_link_canonicalizer.py [links.txt ...]
+
+Pass saved link lists (one link per line, e.g. output/mixed.txt of an earlier run) to benchmark on
+real data; every line is assumed to be a link of the protocol its scheme names. Without arguments a
+synthetic mix of VMess / VLESS / Reality / Trojan links is used, written the way channels publish
+them: default and empty query parameters, lower-case escapes and long remarks with emoji.
+The client column is the time a client takes to load the Base64 subscription file: decode it and
+split every line into its URL parts and query parameters.
+"""
+import base64
+import json
+import os
+import random
+import sys
+import time
+from typing import List, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.link_canonicalizer import canonicalize_links
+
+LINK_COUNT = 30000
+CLIENT_ROUNDS = 5
+
+
+def build_synthetic_links(link_count: int = LINK_COUNT) -> List[Tuple[str, str]]:
+    rng = random.Random(20)
+    links = []
+    for index in range(link_count):
+        uuid = f"{rng.getrandbits(32):08x}-4a58-4126-99c9-{rng.getrandbits(48):012x}"
+        remark = f"%F0%9F%87%A9%F0%9F%87%AA%20Germany%20%7C%20@channel_{index % 40}%20%7C%20Join%20us%20%F0%9F%94%A5%20node%20{index}"
+        kind = index % 4
+        if kind == 0:
+            vmess = {"v": "2", "ps": f"🇩🇪 Germany | @channel_{index % 40} | node {index}", "add": f"n{index}.example.com",
+                     "port": "443", "id": uuid, "aid": "0", "scy": "auto", "net": "ws", "type": "none",
+                     "host": "", "path": "/ws", "tls": "tls", "sni": "", "alpn": "", "fp": ""}
+            links.append(('vmess', "vmess://" + base64.b64encode(json.dumps(vmess, indent=2).encode()).decode()))
+        elif kind == 1:
+            links.append(('vless', f"vless://{uuid}@N{index}.Example.com:443?encryption=none&security=tls&type=ws&headerType=none&host=&path=%2fws&sni=n{index}.example.com&fp=&alpn=#{remark}"))
+        elif kind == 2:
+            links.append(('reality', f"vless://{uuid}@n{index}.example.com:443?type=tcp&security=reality&pbk=abc{index}&sid=&spx=%2f&sni=www.example.com&fp=chrome&flow=xtls-rprx-vision#{remark}"))
+        else:
+            links.append(('trojan', f"trojan://pw{index}@n{index}.example.com:443?security=tls&type=tcp&headerType=none&sni=n{index}.example.com&allowInsecure=0#{remark}"))
+    return links
+
+
+def load_links(paths: List[str]) -> List[Tuple[str, str]]:
+    links = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if '://' in line:
+                    links.append((line.split('://', 1)[0].lower(), line))
+    return links
+
+
+def client_load_ms(encoded_file: bytes) -> float:
+    start = time.perf_counter()
+    for _ in range(CLIENT_ROUNDS):
+        for line in base64.b64decode(encoded_file).decode('utf-8').splitlines():
+            parts = urlsplit(line)
+            parse_qsl(parts.query)
+    return (time.perf_counter() - start) * 1000 / CLIENT_ROUNDS
+
+
+def report(name: str, links: List[str]) -> None:
+    plaintext = "\n".join(links).encode('utf-8')
+    encoded = base64.b64encode(plaintext)
+    print(f"{name:<24} {len(links):7d} links   plaintext {len(plaintext) / 1024:8.1f} KiB   "
+          f"base64 {len(encoded) / 1024:8.1f} KiB   client load {client_load_ms(encoded):7.1f} ms")
+
+
+def main():
+    if len(sys.argv) > 1:
+        links = load_links(sys.argv[1:])
+        print(f"Benchmarking on {len(links)} saved links.")
+    else:
+        links = build_synthetic_links()
+        print(f"Benchmarking on {len(links)} synthetic VMess/VLESS/Reality/Trojan links.")
+
+    link_infos = [{'protocol': protocol, 'link': link} for protocol, link in links]
+    start = time.perf_counter()
+    canonical = canonicalize_links(link_infos)
+    canonicalize_ms = (time.perf_counter() - start) * 1000
+
+    report("as collected", [link for _, link in links])
+    report("canonicalized", [link_info['link'] for link_info in canonical])
+    print(f"canonicalization took {canonicalize_ms:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
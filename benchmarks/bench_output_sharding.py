@@ -0,0 +1,70 @@
+"""
+Benchmark: shard stability of jump-hash assignment vs. sequential chunking of the sorted list.
+
+Usage:
+    python benchmarks/bench_output_sharding.py
+
+20,000 synthetic VLESS/Reality/Trojan links are split into shards of at most 500 links. Each
+scenario changes the link set like a collection run does (links dropped, new links found) and
+counts the links that kept their shard and the shards whose content changed, i.e. the files
+clients and mirrors have to fetch again.
+"""
+import os
+import random
+import sys
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.bench_parsed_link import build_synthetic_links
+from src.utils.output_sharding import jump_consistent_hash, link_shard_key, shard_count
+
+LINK_COUNT = 20000
+MAX_LINKS = 500
+
+
+def jump_hash_shards(links: List[str]) -> Dict[str, int]:
+    keys = {link: link_shard_key(link) for link in links}
+    count = shard_count([(key, 1) for key in keys.values()], MAX_LINKS, 0)
+    return {link: jump_consistent_hash(key, count) for link, key in keys.items()}
+
+
+def sequential_shards(links: List[str]) -> Dict[str, int]:
+    return {link: position // MAX_LINKS for position, link in enumerate(sorted(links))}
+
+
+def compare(before: Dict[str, int], after: Dict[str, int]) -> str:
+    kept = [link for link in before if link in after]
+    stayed = sum(1 for link in kept if before[link] == after[link])
+    contents_before: Dict[int, set] = {}
+    contents_after: Dict[int, set] = {}
+    for link, shard in before.items():
+        contents_before.setdefault(shard, set()).add(link)
+    for link, shard in after.items():
+        contents_after.setdefault(shard, set()).add(link)
+    changed = sum(1 for shard, content in contents_after.items() if contents_before.get(shard) != content)
+    return f"links kept in their shard {stayed / len(kept):7.2%}   shards changed {changed:4d} of {len(contents_after):4d}"
+
+
+def main():
+    random.seed(7)
+    links = build_synthetic_links(LINK_COUNT)
+    extra_links = build_synthetic_links(LINK_COUNT + LINK_COUNT // 10)[LINK_COUNT:]
+    scenarios = {
+        '20 replaced': random.sample(links, LINK_COUNT - 20) + extra_links[:20],
+        '1% replaced': random.sample(links, LINK_COUNT - LINK_COUNT // 100) + extra_links[:LINK_COUNT // 100],
+        '10% added': links + extra_links,
+    }
+
+    for name, assign in (('jump hash', jump_hash_shards), ('sequential chunks', sequential_shards)):
+        start = time.perf_counter()
+        before = assign(links)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"{name} ({elapsed_ms:.1f} ms for {len(links)} links, {len(set(before.values()))} shards)")
+        for scenario, scenario_links in scenarios.items():
+            print(f"  {scenario:<12} {compare(before, assign(scenario_links))}")
+
+
+if __name__ == '__main__':
+    main()
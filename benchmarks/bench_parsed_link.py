@@ -0,0 +1,132 @@
+"""
+Benchmark: parse-once ParsedLink validation vs. the previous per-check urlparse.
+
+Usage:
+    python benchmarks/bench_parsed_link.py [links.txt ...]
+
+Pass saved link lists (one link per line) to benchmark on real data. Without arguments a synthetic
+mix of VLESS (plain and Reality) and Trojan links is used. Each link goes through what extraction
+does to it: the scanner's Reality check (VLESS only), cleaning and validation. The previous
+pipeline ran urlparse + parse_qs for the Reality check and again inside is_valid; now the link is
+parsed once into a ParsedLink and the validator reads the record. The memory column is the
+size of one parsed link as kept for reuse (urlparse result + parse_qs dict before, ParsedLink
+now), measured with tracemalloc.
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, List
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.parsed_link import _parse_link_cached, parse_link
+from src.utils.protocol_validators.base_validator import BaseValidator
+from src.utils.protocol_validators.trojan_validator import TrojanValidator
+from src.utils.protocol_validators.vless_validator import VlessValidator
+
+LINK_COUNT = 100000
+
+
+def build_synthetic_links(link_count: int = LINK_COUNT) -> List[str]:
+    rng = random.Random(16)
+    links = []
+    for index in range(link_count):
+        uuid = f"{rng.getrandbits(32):08x}-4a58-4126-99c9-{rng.getrandbits(48):012x}"
+        kind = index % 3
+        if kind == 0:
+            links.append(f"vless://{uuid}@n{index}.example.com:443?type=ws&security=tls&sni=n{index}.example.com&path=%2Fws#node-{index}")
+        elif kind == 1:
+            links.append(f"vless://{uuid}@n{index}.example.com:443?type=tcp&security=reality&pbk=abc{index}&sni=www.example.com&fp=chrome#reality-{index}")
+        else:
+            links.append(f"trojan://pw{index}@n{index}.example.com:443?sni=n{index}.example.com#trojan-{index}")
+    return links
+
+
+def legacy_is_reality_link(link: str) -> bool:
+    return parse_qs(urlparse(link).query).get('security', [''])[0] == 'reality'
+
+
+def legacy_is_valid(link: str) -> bool:
+    """VlessValidator / TrojanValidator.is_valid before ParsedLink: one more urlparse + parse_qs."""
+    parsed_url = urlparse(link)
+    netloc = parsed_url.netloc
+    if '@' not in netloc:
+        return False
+    credential, host_port = netloc.split('@', 1)
+    if ':' not in host_port:
+        return False
+    host, port_str = host_port.rsplit(':', 1)
+    query_params = parse_qs(parsed_url.query)
+    if link.startswith("vless://"):
+        if not BaseValidator._is_valid_uuid(credential):
+            return False
+        if query_params.get('security', [''])[0] == 'reality' and 'pbk' not in query_params:
+            return False
+    return BaseValidator._is_valid_port(int(port_str)) and BaseValidator._is_valid_host(host)
+
+
+def legacy_pipeline(links: List[str]) -> int:
+    valid = 0
+    for link in links:
+        if link.startswith("vless://"):
+            legacy_is_reality_link(link)
+        if legacy_is_valid(link.strip()):
+            valid += 1
+    return valid
+
+
+def parsed_link_pipeline(links: List[str]) -> int:
+    valid = 0
+    for link in links:
+        if link.startswith("vless://"):
+            VlessValidator.is_reality_link(link)
+            valid += VlessValidator.is_valid(VlessValidator.clean(link))
+        else:
+            valid += TrojanValidator.is_valid(TrojanValidator.clean(link))
+    return valid
+
+
+def legacy_parse(link: str):
+    parsed_url = urlparse(link)
+    return parsed_url, parse_qs(parsed_url.query)
+
+
+def bytes_per_parse(parse: Callable[[str], object], links: List[str]) -> float:
+    _parse_link_cached.cache_clear()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    parsed = [parse(link) for link in links]
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return (retained - sys.getsizeof(parsed)) / len(parsed)
+
+
+def bench(name: str, func: Callable[[List[str]], int], parse: Callable[[str], object], links: List[str]) -> None:
+    _parse_link_cached.cache_clear()
+    start = time.perf_counter()
+    valid = func(links)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    per_link = bytes_per_parse(parse, links)
+    print(f"{name:<28} {elapsed_ms:9.1f} ms   {per_link:7.0f} bytes per parsed link   valid: {valid}")
+
+
+def main():
+    if len(sys.argv) > 1:
+        links = []
+        for path in sys.argv[1:]:
+            with open(path, 'r', encoding='utf-8') as f:
+                links.extend(line.strip() for line in f if line.startswith(("vless://", "trojan://")))
+        print(f"Benchmarking on {len(links)} VLESS/Trojan links.")
+    else:
+        links = build_synthetic_links()
+        print(f"Benchmarking on {len(links)} synthetic VLESS/Reality/Trojan links.")
+
+    bench("urlparse per check (prev.)", legacy_pipeline, legacy_parse, links)
+    bench("ParsedLink (parse once)", parsed_link_pipeline, parse_link, links)
+
+
+if __name__ == '__main__':
+    main()
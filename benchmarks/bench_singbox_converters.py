@@ -0,0 +1,113 @@
+"""
+Benchmark: SingBox outbound converters vs. the previous json.dumps + link rescan per outbound.
+
+Usage:
+    python benchmarks/bench_singbox_converters.py [singbox_config.json ...]
+
+Pass saved SingBox configs to benchmark on real data. Without arguments a synthetic bundle of
+10,000 outbounds (vless/reality, vmess, trojan, hysteria2, tuic, shadowsocks, wireguard plus
+selector/urltest/direct utility outbounds) is used. Measures the whole _parse_singbox_config call,
+JSON loading included, and prints how many links each path recovers.
+"""
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.parsers.config_parser import ConfigParser
+
+ROUNDS = 3
+OUTBOUND_COUNT = 10000
+UUID = "a3482e88-686a-4a58-8126-99c9df64b7bf"
+
+
+def build_outbound(rng: random.Random, index: int) -> Dict:
+    server = f"node{index}.example.com"
+    port = rng.choice([443, 8443, 2053])
+    tls = {"enabled": True, "server_name": server, "utls": {"enabled": True, "fingerprint": "chrome"}}
+    kind = index % 7
+    if kind == 0:
+        reality_tls = dict(tls, reality={"enabled": True, "public_key": "Z84J2IelR9ch3k8VtlVhhs5ycBUlXA7wHBWcBrjqnAw", "short_id": "6ba85179"})
+        return {"type": "vless", "tag": f"reality-{index}", "server": server, "server_port": port, "uuid": UUID,
+                "flow": "xtls-rprx-vision", "tls": reality_tls}
+    if kind == 1:
+        return {"type": "vmess", "tag": f"vmess-{index}", "server": server, "server_port": port, "uuid": UUID,
+                "security": "auto", "tls": tls, "transport": {"type": "ws", "path": "/ws", "headers": {"Host": server}}}
+    if kind == 2:
+        return {"type": "trojan", "tag": f"trojan-{index}", "server": server, "server_port": port, "password": "secret",
+                "tls": tls, "transport": {"type": "grpc", "service_name": "grpc"}}
+    if kind == 3:
+        return {"type": "hysteria2", "tag": f"hy2-{index}", "server": server, "server_port": port, "password": "secret",
+                "tls": {"enabled": True, "server_name": server}}
+    if kind == 4:
+        return {"type": "tuic", "tag": f"tuic-{index}", "server": server, "server_port": port, "uuid": UUID,
+                "password": "secret", "congestion_control": "bbr", "tls": {"enabled": True, "server_name": server}}
+    if kind == 5:
+        return {"type": "shadowsocks", "tag": f"ss-{index}", "server": server, "server_port": 8388,
+                "method": "2022-blake3-aes-128-gcm", "password": "c2VjcmV0c2VjcmV0c2VjcmV0"}
+    return {"type": "wireguard", "tag": f"wg-{index}", "server": server, "server_port": 51820,
+            "local_address": ["172.16.0.2/32"], "private_key": "cHJpdmF0ZQ==", "peer_public_key": "cHVibGlj"}
+
+
+def build_synthetic_config(outbound_count: int = OUTBOUND_COUNT) -> str:
+    rng = random.Random(12)
+    outbounds: List[Dict] = [build_outbound(rng, index) for index in range(outbound_count)]
+    tags = [outbound["tag"] for outbound in outbounds]
+    outbounds += [
+        {"type": "selector", "tag": "select", "outbounds": tags},
+        {"type": "urltest", "tag": "auto", "outbounds": tags},
+        {"type": "direct", "tag": "direct"},
+    ]
+    return json.dumps({"log": {"level": "warn"}, "outbounds": outbounds})
+
+
+def legacy_parse(parser: ConfigParser, content: str) -> List[Dict]:
+    """The previous loop: every non-utility outbound is dumped back to JSON and rescanned for links."""
+    links = []
+    for outbound_obj in json.loads(content).get('outbounds', []):
+        if isinstance(outbound_obj, dict) and outbound_obj.get('type') not in ['direct', 'block', 'selector', 'urltest', 'fallback', 'loadbalance', 'dns', 'http', 'socks']:
+            links.extend(parser._extract_direct_links(json.dumps(outbound_obj)))
+    return links
+
+
+def bench(name: str, func: Callable[[str], List], contents: List[str]) -> List:
+    with contextlib.redirect_stdout(io.StringIO()): # the parser logs every step
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            for content in contents:
+                result = func(content)
+        elapsed_ms = (time.perf_counter() - start) * 1000 / ROUNDS
+    print(f"{name:<28} {elapsed_ms:10.1f} ms/round   links: {len(result)}")
+    return result
+
+
+def main():
+    if len(sys.argv) > 1:
+        contents = []
+        for path in sys.argv[1:]:
+            with open(path, 'r', encoding='utf-8') as f:
+                contents.append(f.read())
+        print(f"Benchmarking on {len(contents)} SingBox configs, {ROUNDS} rounds.")
+    else:
+        contents = [build_synthetic_config()]
+        print(f"Benchmarking on a synthetic SingBox config with {OUTBOUND_COUNT} outbounds "
+              f"({len(contents[0]) // 1024} KB), {ROUNDS} rounds.")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser = ConfigParser()
+    bench("legacy (dump + rescan)", lambda content: legacy_parse(parser, content), contents)
+    links = bench("converters", parser._parse_singbox_config, contents)
+    protocols: Dict[str, int] = {}
+    for link in links:
+        protocols[link['protocol']] = protocols.get(link['protocol'], 0) + 1
+    print("Converted links by protocol: " + ", ".join(f"{protocol}={count}" for protocol, count in sorted(protocols.items())))
+
+
+if __name__ == '__main__':
+    main()
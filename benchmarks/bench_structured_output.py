@@ -0,0 +1,66 @@
+"""
+Benchmark: Clash YAML and SingBox JSON written in the same pass as the URI lists vs. a separate
+converter run over the written plaintext file.
+
+Usage:
+    python benchmarks/bench_structured_output.py
+
+100,000 synthetic VLESS/Reality/Trojan links are written to all four formats in one pass. The
+separate-converter column models the external converter service: it reads the plaintext file
+back and parses every link again (cold parse cache) before writing Clash and SingBox files.
+"""
+import os
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from typing import Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.bench_parsed_link import build_synthetic_links
+from src.utils.parsed_link import _parse_link_cached
+from src.utils.structured_output import ClashYamlWriter, SingBoxJsonWriter
+from src.utils.subscription_writer import SubscriptionFileWriter
+
+LINK_COUNT = 100000
+
+
+def write_all(output_dir: str, links: List[str], writer_factories: Dict[str, callable]) -> Dict[str, float]:
+    with ExitStack() as stack:
+        writers = [stack.enter_context(factory(os.path.join(output_dir, name))) for name, factory in writer_factories.items()]
+        for link in links:
+            for writer in writers:
+                writer.add(link)
+    return {writer.format_name: writer.elapsed_seconds * 1000 for writer in writers}
+
+
+def main():
+    links = sorted(build_synthetic_links(LINK_COUNT))
+    output_dir = tempfile.mkdtemp()
+    print(f"Writing {len(links)} links.")
+
+    _parse_link_cached.cache_clear()
+    start = time.perf_counter()
+    timings = write_all(output_dir, links, {
+        'links.txt': SubscriptionFileWriter,
+        'links.b64': lambda path: SubscriptionFileWriter(path, encode_base64=True),
+        'links.yaml': ClashYamlWriter,
+        'links.json': SingBoxJsonWriter,
+    })
+    single_pass_ms = (time.perf_counter() - start) * 1000
+    for format_name, elapsed_ms in timings.items():
+        print(f"  {format_name:<10} {elapsed_ms:8.1f} ms")
+    print(f"{'single pass, all formats':<34} {single_pass_ms:8.1f} ms")
+
+    _parse_link_cached.cache_clear()
+    start = time.perf_counter()
+    with open(os.path.join(output_dir, 'links.txt'), 'r', encoding='utf-8') as f:
+        reread_links = [line.rstrip('\n') for line in f]
+    write_all(output_dir, reread_links, {'converted.yaml': ClashYamlWriter, 'converted.json': SingBoxJsonWriter})
+    converter_ms = (time.perf_counter() - start) * 1000
+    print(f"{'separate converter (Clash+SingBox)':<34} {converter_ms:8.1f} ms (on top of writing the URI lists)")
+
+
+if __name__ == '__main__':
+    main()
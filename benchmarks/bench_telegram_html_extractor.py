@@ -0,0 +1,109 @@
+"""
+Benchmark: Telegram page extraction backends vs. the previous BeautifulSoup path.
+
+Usage:
+    python benchmarks/bench_telegram_html_extractor.py [recorded_page.html ...]
+
+Pass saved t.me/s/<channel> pages to benchmark on real data. Without arguments a synthetic
+page with the same structure (20 message wrappers, code blocks, links) is used.
+"""
+import os
+import sys
+import time
+from typing import Callable, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bs4 import BeautifulSoup
+
+from src.parsers.telegram_html_extractor import (
+    BeautifulSoupExtractor, LxmlExtractor, SelectolaxExtractor, SelectolaxHTMLParser, lxml_html
+)
+
+ROUNDS = 50
+
+
+def build_synthetic_page(message_count: int = 20) -> str:
+    messages = []
+    for i in range(message_count):
+        post_id = 1000 + i
+        messages.append(f"""
+<div class="tgme_widget_message_wrap js-widget_message_wrap">
+  <div class="tgme_widget_message text_not_supported_wrap js-widget_message" data-post="channel/{post_id}">
+    <div class="tgme_widget_message_bubble">
+      <div class="tgme_widget_message_author"><a class="tgme_widget_message_owner_name" href="https://t.me/channel"><span>Channel</span></a></div>
+      <div class="tgme_widget_message_text js-message_text" dir="auto">New servers 🚀<br/>
+        <code>vless://a3482e88-686a-4a58-8126-99c9df64b7bf@example{i}.com:443?security=reality&amp;pbk=abc&amp;type=tcp#Server{i}</code><br/>
+        <pre>trojan://password{i}@10.0.0.{i % 250}:443?sni=example.com#T{i}</pre>
+        Join <a href="https://t.me/otherchannel{i}">@otherchannel{i}</a> for more ✅
+      </div>
+      <div class="tgme_widget_message_footer compact js-message_footer">
+        <div class="tgme_widget_message_info short js-message_info">
+          <span class="tgme_widget_message_views">1.2K</span>
+          <span class="tgme_widget_message_meta"><a class="tgme_widget_message_date" href="https://t.me/channel/{post_id}"><time datetime="2024-05-01T10:{i:02d}:00+00:00" class="time">10:{i:02d}</time></a></span>
+        </div>
+      </div>
+    </div>
+  </div>
+</div>""")
+    header = '<html><head><title>Channel</title></head><body><header class="tgme_header">' + ('<div>nav</div>' * 50) + '</header><section class="tgme_channel_history">'
+    return header + ''.join(messages) + '</section></body></html>'
+
+
+def legacy_extract(html: str) -> List[str]:
+    """The previous collect_from_channel path: full html.parser tree, find_all per wrapper, second soup round trip."""
+    results = []
+    soup = BeautifulSoup(html, 'html.parser')
+    for msg_wrap in soup.find_all('div', class_='tgme_widget_message_wrap'):
+        message_text_div = msg_wrap.find('div', class_='tgme_widget_message_text')
+        parts = []
+        if message_text_div:
+            parts.append(message_text_div.get_text(separator='\n', strip=True))
+        for pre in msg_wrap.find_all('pre'):
+            parts.append(pre.get_text(separator='\n', strip=True))
+        for code in msg_wrap.find_all('code'):
+            parts.append(code.get_text(separator='\n', strip=True))
+        parts.extend(a['href'] for a in msg_wrap.find_all('a', href=True))
+        combined = "\n".join(parts).strip()
+        time_element = msg_wrap.find('time', class_='time')
+        _ = time_element['datetime'] if time_element else None
+        results.append(str(BeautifulSoup(combined, 'html.parser')))
+    return results
+
+
+def bench(name: str, func: Callable[[str], object], pages: List[str]):
+    func(pages[0]) # warm-up
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for page in pages:
+            func(page)
+    elapsed = time.perf_counter() - start
+    per_page_ms = elapsed * 1000 / (ROUNDS * len(pages))
+    print(f"{name:<28} {per_page_ms:8.3f} ms/page")
+    return per_page_ms
+
+
+def main():
+    if len(sys.argv) > 1:
+        pages = []
+        for path in sys.argv[1:]:
+            with open(path, 'r', encoding='utf-8') as f:
+                pages.append(f.read())
+        print(f"Benchmarking on {len(pages)} recorded pages, {ROUNDS} rounds.")
+    else:
+        pages = [build_synthetic_page()]
+        print(f"Benchmarking on a synthetic 20-message page, {ROUNDS} rounds.")
+
+    baseline = bench("legacy (html.parser)", legacy_extract, pages)
+    backends = [BeautifulSoupExtractor()]
+    if lxml_html is not None:
+        backends.append(LxmlExtractor())
+    if SelectolaxHTMLParser is not None:
+        backends.append(SelectolaxExtractor())
+    for extractor in backends:
+        per_page = bench(f"{extractor.name}", lambda page, e=extractor: [m.combined_text() for m in e.extract_messages(page)], pages)
+        print(f"{'':<28} speed-up x{baseline / per_page:.1f}")
+
+
+if __name__ == '__main__':
+    main()
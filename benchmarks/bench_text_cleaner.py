@@ -0,0 +1,115 @@
+"""
+Benchmark: text_cleaner vs. the previous regex-based cleaning in ConfigValidator.
+
+Usage:
+    python benchmarks/bench_text_cleaner.py [telegram_messages.txt ...]
+
+Pass files with saved Telegram message texts (one message per blank-line separated block) to benchmark
+on real data. Without arguments a synthetic corpus of Farsi/English channel posts with links, emojis,
+zero-width characters and trailing junk is used. Measures preliminary cleaning plus trailing-junk
+removal of every link candidate, and prints the per-rule hit counters.
+"""
+import os
+import random
+import re
+import sys
+import time
+from typing import Callable, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.link_scanner import SCHEME_LINK_REGEX
+from src.utils.stats_reporter import stats_reporter
+from src.utils.text_cleaner import DEFAULT_TRAILING_JUNK_PHRASES, TextCleaner, build_trailing_junk_rules
+
+ROUNDS = 5
+
+LINKS = [
+    "vless://a3482e88-686a-4a58-8126-99c9df64b7bf@example.com:443?security=reality&pbk=abc&type=tcp#Server",
+    "trojan://password@10.0.0.1:443?sni=example.com#T",
+    "ss://YWVzLTI1Ni1nY206cGFzcw@example.com:8388#SS",
+    "hy2://password@example.com:443?sni=example.com#H2",
+    "vmess://eyJhZGQiOiJleGFtcGxlLmNvbSIsInBvcnQiOiI0NDMiLCJpZCI6ImEzNDgyZTg4In0=",
+]
+TRAILERS = ["🚀🔥", "✅", "Channel", "|ᴄᴏᴜɴᴛʀʏ: IR", "#سرور #فیلترشکن", "", "", "‌"]
+PROSE = [
+    "سرور‌های جدید برای اپراتورها 🌐",
+    "برای دوستان خود ارسال کنید ‏",
+    "ایرانسل، مخابرات و رایتل تست شده ✅",
+    "Join @v2ray_channel for more &amp; better servers",
+    "پربرکت باشید 🙏‍",
+]
+
+
+def build_synthetic_corpus(message_count: int = 3000) -> List[str]:
+    rng = random.Random(7)
+    messages = []
+    for _ in range(message_count):
+        lines = [rng.choice(PROSE)]
+        for _ in range(rng.randint(1, 4)):
+            lines.append(rng.choice(LINKS) + rng.choice(TRAILERS))
+        lines.append(rng.choice(PROSE))
+        messages.append("\n".join(lines))
+    return messages
+
+
+LEGACY_REMOVAL_REGEX = r'[\u200c-\u200f\u0600-\u0605\u061B-\u061F\u064B-\u065F\u0670\u06D6-\u06DD\u06DF-\u06ED\u200B-\u200F\u200D\u0640\u202A-\u202E\u2066-\u2069\uFEFF\u0000-\u0008\u000B\u000C\u000E-\u001F\u007F-\u009F]'
+# Same rules as text_cleaner, each with its own leading-whitespace run as in the previous pattern
+LEGACY_JUNK_PATTERN = '|'.join(f'(?:\\s*{pattern})' for _, pattern in build_trailing_junk_rules(DEFAULT_TRAILING_JUNK_PHRASES))
+
+
+def legacy_clean(message: str) -> List[str]:
+    """The previous structure: two regex passes over the text, then a re.compile per candidate."""
+    text = re.sub(LEGACY_REMOVAL_REGEX, '', message)
+    text = text.replace('&amp;', '&').replace('&gt;', '>').replace('&lt;', '<')
+    text = re.sub(r'\s+', ' ', text).strip()
+    results = []
+    for match in SCHEME_LINK_REGEX.finditer(text):
+        trailing_junk_pattern = re.compile(LEGACY_JUNK_PATTERN, re.IGNORECASE | re.DOTALL | re.UNICODE)
+        candidate = match.group(0).strip()
+        junk_match = trailing_junk_pattern.search(candidate)
+        results.append(candidate[:junk_match.start()].strip() if junk_match else candidate)
+    return results
+
+
+def engine_clean(cleaner: TextCleaner, message: str) -> List[str]:
+    text = cleaner.clean_for_splitting(message)
+    return [cleaner.strip_trailing_junk(match.group(0)) for match in SCHEME_LINK_REGEX.finditer(text)]
+
+
+def bench(name: str, func: Callable[[str], List[str]], messages: List[str]) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for message in messages:
+            func(message)
+    elapsed = time.perf_counter() - start
+    total_mb = sum(len(message.encode('utf-8')) for message in messages) * ROUNDS / (1024 * 1024)
+    print(f"{name:<28} {total_mb / elapsed:8.2f} MB/s")
+    return elapsed
+
+
+def main():
+    if len(sys.argv) > 1:
+        messages = []
+        for path in sys.argv[1:]:
+            with open(path, 'r', encoding='utf-8') as f:
+                messages.extend(block for block in f.read().split('\n\n') if block.strip())
+        print(f"Benchmarking on {len(messages)} recorded messages, {ROUNDS} rounds.")
+    else:
+        messages = build_synthetic_corpus()
+        print(f"Benchmarking on {len(messages)} synthetic Telegram messages, {ROUNDS} rounds.")
+
+    cleaner = TextCleaner()
+    legacy_time = bench("legacy (regex per call)", legacy_clean, messages)
+    engine_time = bench("text_cleaner", lambda message: engine_clean(cleaner, message), messages)
+    print(f"{'':<28} speed-up x{legacy_time / engine_time:.1f}")
+
+    mismatches = sum(1 for message in messages if legacy_clean(message) != engine_clean(cleaner, message))
+    print(f"Messages with different results: {mismatches}")
+    print("Rule hits (all rounds):")
+    for rule_name, count in sorted(stats_reporter.cleaning_rule_hits.items(), key=lambda item: item[1], reverse=True):
+        print(f"  {rule_name:<16} {count}")
+
+
+if __name__ == '__main__':
+    main()
@@ -10,9 +10,13 @@ import logging # Import the logging module
 from src.utils.settings_manager import settings
 from src.utils.source_manager import source_manager
 from src.utils.stats_reporter import stats_reporter
-from src.utils.output_manager import OutputManager # Corrected to import the class directly
+from src.utils.output_manager import output_manager
 from src.collectors.telegram_collector import TelegramCollector
 from src.collectors.web_collector import WebCollector
+from src.parsers.parse_cache import parse_cache
+from src.utils.dedup_index import DedupIndex
+from src.utils.link_canonicalizer import canonicalize_links
+from src.utils.proxy_selector import LinkQualityScorer, select_top_links, strip_link_metadata
 from src.utils.logging_config import setup_logging # Import the logging setup
 
 # --- Setup Logging (should be done once at the very beginning of the script execution) ---
@@ -60,20 +64,22 @@ async def main_collector_flow():
         if web_collector:
             await web_collector.close()
 
-        # Deduplicate all collected links before final save and report
-        unique_links: Dict[str, Dict] = {}
-        for item in all_collected_links:
-            unique_links[item['link']] = item
+        # Deduplicate all collected links (by server identity, not raw link string) before final save and report
+        dedup_index = DedupIndex().extend(all_collected_links)
+        stats_reporter.record_semantic_duplicates(dedup_index.duplicates)
+        final_unique_links: List[Dict] = dedup_index.links()
 
-        final_unique_links: List[Dict] = list(unique_links.values())
+        # Keep the best-scoring links under MAX_PROXIES_PER_PROTOCOL / MAX_TOTAL_PROXIES, then drop the selection metadata
+        source_scores = {**source_manager._all_website_scores, **source_manager._all_telegram_scores}
+        final_unique_links = strip_link_metadata(select_top_links(final_unique_links, LinkQualityScorer(source_scores)))
 
-        # Save collected links using the OutputManager
-        # Instantiate OutputManager correctly and call its async method
-        output_manager_instance = OutputManager(final_unique_links) 
-        await output_manager_instance.save_all_configs() # Call the async method
+        # Rewrite links to their canonical, smallest form, then save them using the OutputManager
+        final_unique_links = canonicalize_links(final_unique_links)
+        output_manager.save_configs(final_unique_links)
 
         # Finalize SourceManager (save scores and status)
         source_manager.save_sources() # This is the correct method call as per your SourceManager
+        parse_cache.save() # Persist parse results for the next run (if enabled in settings)
 
 
         # Generate and print final report
@@ -1,5 +1,4 @@
 import httpx
-from bs4 import BeautifulSoup
 import re
 import os
 import json
@@ -11,19 +10,30 @@ from typing import Optional, List, Dict, Tuple
 from src.utils.settings_manager import settings
 from src.utils.source_manager import source_manager
 from src.utils.stats_reporter import stats_reporter
+from src.utils.fetch_scheduler import FetchScheduler
+from src.utils.channel_cursor_store import channel_cursor_store
+from src.utils.dedup_index import dedupe_links
 from src.parsers.config_parser import ConfigParser 
+from src.parsers.telegram_html_extractor import get_telegram_html_extractor, TelegramMessage
 
 
 class TelegramCollector:
     def __init__(self):
         self.client = httpx.AsyncClient(timeout=settings.COLLECTION_TIMEOUT_SECONDS)
         self.config_parser = ConfigParser() 
-        print("TelegramCollector: Initialized for Telegram Web (t.me/s/) collection.")
+        self.scheduler = FetchScheduler("Telegram")
+        self.html_extractor = get_telegram_html_extractor()
+        print(f"TelegramCollector: Initialized for Telegram Web (t.me/s/) collection. HTML extraction backend: {self.html_extractor.name}.")
 
-    async def _fetch_channel_page(self, channel_username: str) -> Optional[str]:
-        """Fetches the HTML content of a Telegram Web channel page."""
+    async def _fetch_channel_page(self, channel_username: str, before_post_id: Optional[int] = None) -> Optional[str]:
+        """
+        Fetches the HTML content of a Telegram Web channel page.
+        With before_post_id, fetches the older history page (t.me/s/<channel>?before=<post_id>).
+        """
         clean_username = channel_username.lstrip('@')
         url = f"https://t.me/s/{clean_username}"
+        if before_post_id is not None:
+            url += f"?before={before_post_id}"
         print(f"TelegramCollector: Attempting to fetch channel page: {url}")
 
         try:
@@ -31,7 +41,7 @@ class TelegramCollector:
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
                 "Accept-Language": "en-US,en;q=0.9,fa;q=0.8"
             }
-            response = await self.client.get(url, headers=headers, follow_redirects=True)
+            response = await self.scheduler.fetch(self.client, url, headers=headers, follow_redirects=True)
             response.raise_for_status()
             print(f"TelegramCollector: Successfully fetched {url}. Status: {response.status_code}")
             return response.text
@@ -45,8 +55,8 @@ class TelegramCollector:
                 source_manager.update_telegram_channel_score(channel_username, -100)
                 print(f"TelegramCollector: Channel {channel_username} not found (404). Consider blacklisting.")
             elif e.response.status_code == 429:
-                print(f"TelegramCollector: Rate limit hit for {url} (429). Consider increasing delay or using proxies.")
-                source_manager.update_telegram_channel_score(channel_username, -50)
+                # FetchScheduler already paused and retried this host; a persistent 429 is not the channel's fault.
+                print(f"TelegramCollector: Rate limit persisted for {url} (429) after retries. Leaving channel score unchanged.")
             else:
                 source_manager.update_telegram_channel_score(channel_username, -20)
             return None
@@ -60,16 +70,6 @@ class TelegramCollector:
             source_manager.update_telegram_channel_score(channel_username, -25)
             return None
 
-    def _extract_date_from_message_html(self, message_soup_tag: BeautifulSoup) -> Optional[datetime]:
-        """Extracts datetime from a BeautifulSoup message tag."""
-        try:
-            time_element = message_soup_tag.find('time', class_='time')
-            if time_element and 'datetime' in time_element.attrs:
-                return datetime.fromisoformat(time_element['datetime'])
-        except Exception:
-            pass
-        return None
-
     def _is_config_recent(self, message_date: Optional[datetime]) -> bool:
         """Checks if a config message is within the lookback duration."""
         if not message_date:
@@ -104,78 +104,127 @@ class TelegramCollector:
 
     async def collect_from_channel(self, channel_username: str) -> List[Dict]:
         """
-        Collects config links from a single Telegram channel page (t.me/s/).
-        Parses HTML, extracts text from various message components, and discovers new channels.
+        Collects config links from a Telegram channel (t.me/s/).
+        In paginated mode, walks older history pages via the ?before=<post_id> cursor, parsing each
+        page as soon as it arrives, until a message is older than the lookback cutoff, the message
+        cap is reached, an already-parsed post (per the persisted cursor) is hit, or
+        TELEGRAM_MAX_PAGES_PER_CHANNEL pages were fetched.
+        Links of already-parsed posts that are still within the lookback window come from the cursor cache.
         """
         collected_links: List[Dict] = []
-        html_content = await self._fetch_channel_page(channel_username)
+        cursor_links: List[Dict] = [] # Links of newly parsed posts, with post ID and date, for the cursor cache
+        processed_message_count: int = 0
+        max_pages = settings.TELEGRAM_MAX_PAGES_PER_CHANNEL if settings.TELEGRAM_PAGINATION_ENABLED else 1
+        before_post_id: Optional[int] = None
+        last_seen_post_id = channel_cursor_store.get_last_post_id(channel_username)
+        newest_post_id: Optional[int] = None
+        history_gap = False # An older page failed to fetch, so posts between it and the cursor were not parsed
+
+        for page_number in range(1, max_pages + 1):
+            html_content = await self._fetch_channel_page(channel_username, before_post_id)
+
+            if not html_content:
+                if page_number == 1:
+                    print(f"TelegramCollector: No HTML content for {channel_username}. Skipping parsing.")
+                    return []
+                print(f"TelegramCollector: History page {page_number} of {channel_username} could not be fetched. Cursor not advanced.")
+                history_gap = True
+                break
 
-        if not html_content:
-            print(f"TelegramCollector: No HTML content for {channel_username}. Skipping parsing.")
-            return []
+            messages = self.html_extractor.extract_messages(html_content, last_seen_post_id)
+
+            if not messages:
+                if page_number == 1:
+                    print(f"TelegramCollector: No messages found on channel page {channel_username} ({self.html_extractor.name} backend). Score -1.")
+                    source_manager.update_telegram_channel_score(channel_username, -1)
+                    return []
+                print(f"TelegramCollector: History page {page_number} of {channel_username} has no messages. End of history.")
+                break
+            else:
+                print(f"TelegramCollector: Found {len(messages)} message HTML wrappers for {channel_username} (page {page_number}).")
 
-        soup = BeautifulSoup(html_content, 'html.parser')
-        messages_html = soup.find_all('div', class_='tgme_widget_message_wrap')
+            page_post_ids = [message.post_id for message in messages if message.post_id is not None]
+            if page_post_ids:
+                newest_post_id = max(page_post_ids) if newest_post_id is None else max(newest_post_id, max(page_post_ids))
 
-        if not messages_html:
-            print(f"TelegramCollector: No messages found on channel page {channel_username} using BeautifulSoup. Score -1.")
+            reached_limit, processed_message_count = await self._process_page_messages(
+                channel_username, messages, processed_message_count, collected_links, cursor_links, last_seen_post_id
+            )
+            if reached_limit:
+                break
+
+            oldest_post_id = min(page_post_ids) if page_post_ids else None
+            if oldest_post_id is None or oldest_post_id <= 1 or (before_post_id is not None and oldest_post_id >= before_post_id):
+                break # No usable cursor, start of channel history, or the page did not move backwards.
+            before_post_id = oldest_post_id
+        else:
+            if settings.TELEGRAM_PAGINATION_ENABLED:
+                print(f"TelegramCollector: Page limit ({max_pages}) reached for {channel_username}.")
+
+        cutoff_date = datetime.now(timezone.utc) - settings.TELEGRAM_MESSAGE_LOOKBACK_DURATION
+        cached_links = [item for item in channel_cursor_store.get_cached_links(channel_username, cutoff_date) if item['protocol'] in settings.ACTIVE_PROTOCOLS]
+        if cached_links:
+            print(f"TelegramCollector: Reusing {len(cached_links)} cached links from already-parsed posts in {channel_username}.")
+            for link_info in cached_links:
+                collected_links.append({**link_info, 'source': channel_username, 'source_type': 'telegram'})
+                stats_reporter.increment_total_collected()
+                stats_reporter.increment_protocol_count(link_info['protocol'])
+                stats_reporter.record_source_link("telegram", channel_username, link_info['protocol'])
+        # Only advance the cursor over a contiguous range of parsed posts; after a gap the next run parses them again
+        channel_cursor_store.update_channel(channel_username, None if history_gap else newest_post_id, cursor_links, cutoff_date)
+
+        collected_links = dedupe_links(collected_links) # Ensure uniqueness (one link per server)
+
+        if not collected_links:
+            print(f"TelegramCollector: No unique config links found in {channel_username} after all processing. Score -1.")
             source_manager.update_telegram_channel_score(channel_username, -1)
-            return []
         else:
-            print(f"TelegramCollector: Found {len(messages_html)} message HTML wrappers for {channel_username}.")
-
-        messages_with_dates: List[Tuple[Optional[datetime], BeautifulSoup, BeautifulSoup]] = []
-        for msg_wrap in messages_html:
-            # NEW: Extract content from different HTML elements within a message.
-            # This is crucial for telegram messages that embed configs in code blocks or links.
-            message_text_div = msg_wrap.find('div', class_='tgme_widget_message_text')
-            
-            # Extract content from preformatted text blocks (often used for configs)
-            pre_elements = msg_wrap.find_all('pre')
-            # Extract content from code blocks
-            code_elements = msg_wrap.find_all('code')
-            # Extract content from href attributes in anchor tags (for links in descriptions)
-            a_elements_hrefs = [a['href'] for a in msg_wrap.find_all('a', href=True) if 'href' in a.attrs]
-            
-            # Combine all relevant text content
-            all_message_content_parts = []
-            if message_text_div:
-                all_message_content_parts.append(message_text_div.get_text(separator='\n', strip=True))
-            for pre in pre_elements:
-                all_message_content_parts.append(pre.get_text(separator='\n', strip=True))
-            for code in code_elements:
-                all_message_content_parts.append(code.get_text(separator='\n', strip=True))
-            all_message_content_parts.extend(a_elements_hrefs) # Add extracted hrefs directly
-
-            # Combine all parts into a single string for parsing
-            combined_message_text_for_parsing = "\n".join(all_message_content_parts).strip()
+            print(f"TelegramCollector: Successfully found {len(collected_links)} unique valid links in {channel_username}. Score +1.")
+            source_manager.update_telegram_channel_score(channel_username, 1)
 
+        return collected_links
 
+    async def _process_page_messages(self, channel_username: str, messages: List[TelegramMessage],
+                                     processed_message_count: int, collected_links: List[Dict],
+                                     cursor_links: List[Dict], last_seen_post_id: Optional[int]) -> Tuple[bool, int]:
+        """
+        Parses the messages of a single channel page (newest first) and appends found links to collected_links
+        (and, with post ID and date, to cursor_links). Messages at or below last_seen_post_id were skipped by the
+        extractor before any text extraction. Returns (limit_reached, processed_message_count); limit_reached is True
+        once a message is older than the lookback cutoff, the per-channel message cap is hit or already-parsed posts
+        were reached, so no older pages need to be fetched.
+        """
+        reached_seen_posts = False
+        messages_with_dates: List[Tuple[Optional[datetime], TelegramMessage, str]] = []
+        for message in messages:
+            if message.seen:
+                reached_seen_posts = True
+                continue # Parsed in a previous run; its links come from the cursor cache.
+
+            # Message text, <pre>/<code> blocks and hrefs, already extracted in one pass by the HTML extractor.
+            combined_message_text_for_parsing = message.combined_text()
             if not combined_message_text_for_parsing:
-                # print("TelegramCollector: Message wrapper without relevant text content. Skipping.") # Too verbose, skip this often empty message
                 continue
 
-            msg_date = self._extract_date_from_message_html(msg_wrap)
-            messages_with_dates.append((msg_date, BeautifulSoup(combined_message_text_for_parsing, 'html.parser'), msg_wrap)) # Pass the extracted text as a new soup
+            messages_with_dates.append((message.date, message, combined_message_text_for_parsing))
 
         messages_with_dates.sort(key=lambda x: x[0] if x[0] else datetime.min.replace(tzinfo=timezone.utc), reverse=True)
 
-        processed_message_count: int = 0
-        for msg_date, message_content_soup, msg_wrap in messages_with_dates: # message_content_soup now holds the *extracted text*, not full HTML
+        for msg_date, message, message_content in messages_with_dates:
             if not self._is_config_recent(msg_date):
                 print(f"TelegramCollector: Message from {msg_date} is too old for {channel_username}. Skipping further messages in this channel.")
-                break # Assuming messages are sorted by date, no need to check older ones.
+                return True, processed_message_count # Messages are sorted by date, so older ones (and older pages) can be skipped.
 
             if settings.TELEGRAM_MAX_MESSAGES_PER_CHANNEL is not None and processed_message_count >= settings.TELEGRAM_MAX_MESSAGES_PER_CHANNEL:
                 print(f"TelegramCollector: Max messages per channel limit ({settings.TELEGRAM_MAX_MESSAGES_PER_CHANNEL}) reached for {channel_username}. Stopping message processing.")
-                break
+                return True, processed_message_count
 
             processed_message_count += 1
-            print(f"TelegramCollector: Processing message {processed_message_count} from {msg_date} in {channel_username}. Content snippet: '{str(message_content_soup)[:100]}...'") # Log content being parsed
+            print(f"TelegramCollector: Processing message {processed_message_count} from {msg_date} in {channel_username}. Content snippet: '{message_content[:100]}...'") # Log content being parsed
 
             # NEW: Delegate parsing, cleaning, and validation to ConfigParser
             # ConfigParser will return fully validated and cleaned links.
-            parsed_links_info = self.config_parser.parse_content(str(message_content_soup)) # Pass content as string to parser
+            parsed_links_info = self.config_parser.parse_content(message_content)
 
             if not parsed_links_info:
                 # print(f"TelegramCollector: No config links parsed from message {processed_message_count} in {channel_username}.")
@@ -187,7 +236,11 @@ class TelegramCollector:
                 
                 if protocol and link:
                     if protocol in settings.ACTIVE_PROTOCOLS:
-                        collected_links.append({'protocol': protocol, 'link': link})
+                        post_date = msg_date.isoformat() if msg_date else None
+                        # source / source_type / date feed the top-K selection and are stripped before output
+                        collected_links.append({'protocol': protocol, 'link': link, 'source': channel_username,
+                                                'source_type': 'telegram', 'date': post_date})
+                        cursor_links.append({'protocol': protocol, 'link': link, 'post_id': message.post_id, 'date': post_date})
                         stats_reporter.increment_total_collected()
                         stats_reporter.increment_protocol_count(protocol)
                         stats_reporter.record_source_link("telegram", channel_username, protocol)
@@ -202,26 +255,16 @@ class TelegramCollector:
 
             # --- Discovering new channels from message HTML (within the original message wrapper) ---
             if settings.ENABLE_TELEGRAM_CHANNEL_DISCOVERY:
-                # Search for t.me links in message text or other parts.
-                # Use the original msg_wrap for discovery to not miss links in HTML structure.
-                for a_tag in msg_wrap.find_all('a', href=True):
-                    href = a_tag['href']
+                # Search for t.me links in all hrefs of the original message wrapper.
+                for href in message.hrefs:
                     if 't.me/' in href:
                         await self._discover_and_add_channel(href)
                     elif href.startswith('@'): # Direct @username mentions
                          await self._discover_and_add_channel(href)
 
-
-        collected_links = list({item['link']: item for item in collected_links}.values()) # Ensure uniqueness
-
-        if not collected_links:
-            print(f"TelegramCollector: No unique config links found in {channel_username} after all processing. Score -1.")
-            source_manager.update_telegram_channel_score(channel_username, -1)
-        else:
-            print(f"TelegramCollector: Successfully found {len(collected_links)} unique valid links in {channel_username}. Score +1.")
-            source_manager.update_telegram_channel_score(channel_username, 1)
-
-        return collected_links
+        if reached_seen_posts:
+            print(f"TelegramCollector: Reached already-parsed posts (cursor {last_seen_post_id}) in {channel_username}. Skipping older history.")
+        return reached_seen_posts, processed_message_count
 
     async def collect_from_telegram(self) -> List[Dict]:
         """Main method to collect from all active Telegram channels."""
@@ -234,14 +277,16 @@ class TelegramCollector:
         else:
             print(f"TelegramCollector: Starting collection from {len(active_channels)} active Telegram channels.")
 
-        tasks = []
+        # Highest scoring channels are fetched first; concurrency and per-host rate are bounded by the scheduler.
+        jobs = []
         for channel in active_channels:
-            tasks.append(self.collect_from_channel(channel))
+            priority = source_manager._all_telegram_scores.get(channel, 0)
+            jobs.append((channel, priority, lambda channel=channel: self.collect_from_channel(channel)))
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        results = await self.scheduler.run(jobs)
 
-        for i, result in enumerate(results):
-            channel = active_channels[i]
+        for channel in active_channels:
+            result = results.get(channel)
             if isinstance(result, Exception):
                 print(f"TelegramCollector: FATAL ERROR processing channel {channel}: {result}")
                 traceback.print_exc()
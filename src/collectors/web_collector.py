@@ -4,32 +4,60 @@ import os # Not directly used in this version, but can be kept for future
 import json # Not directly used in this version, but can be kept for future
 import asyncio
 import traceback
-from typing import Optional, List, Dict # Ensure all necessary types are imported
+from typing import Optional, List, Dict, Tuple # Ensure all necessary types are imported
 
 from src.utils.settings_manager import settings
 from src.utils.source_manager import source_manager
 from src.utils.stats_reporter import stats_reporter
+from src.utils.fetch_scheduler import FetchScheduler
+from src.utils.http_validator_cache import http_validator_cache
 from src.parsers.config_parser import ConfigParser # Import ConfigParser
+from src.parsers.incremental_link_parser import IncrementalLinkParser
 
 class WebCollector:
     def __init__(self):
         # NEW: ConfigParser now handles all parsing, cleaning, and validation
         self.config_parser = ConfigParser()
         self.client = httpx.AsyncClient(timeout=settings.COLLECTION_TIMEOUT_SECONDS)
+        self.scheduler = FetchScheduler("Web")
         print("WebCollector initialized.")
 
-    async def _fetch_url_content(self, url: str) -> Optional[str]:
-        """Fetches content from a given URL."""
+    async def _fetch_url_links(self, url: str) -> Optional[Tuple[httpx.Response, Optional[List[Dict]], bool]]:
+        """
+        Downloads a URL as a conditional GET (If-None-Match / If-Modified-Since when validators are cached)
+        and parses the body while it streams in. Returns (response, links, complete); links is None for a
+        304 Not Modified response. Returns None on error.
+        Bodies larger than settings.MAX_SUBSCRIPTION_BODY_BYTES are cut off at the cap (complete is False).
+        """
         print(f"WebCollector: Attempting to fetch URL content from: {url}") # Detailed log
         try:
             # Add a User-Agent header to mimic a browser
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
             }
-            response = await self.client.get(url, headers=headers, follow_redirects=True)
-            response.raise_for_status() # Raise an exception for 4xx/5xx responses
-            print(f"WebCollector: Successfully fetched {url}. Status: {response.status_code}") # Success log
-            return response.text
+            headers.update(http_validator_cache.get_conditional_headers(url))
+            async with self.scheduler.stream(self.client, url, headers=headers, follow_redirects=True) as response:
+                if response.status_code == 304:
+                    print(f"WebCollector: {url} not modified since last run (304).")
+                    return response, None, True
+                if response.is_error:
+                    await response.aread() # Error bodies are small; read them for the log snippet below
+                response.raise_for_status() # Raise an exception for 4xx/5xx responses
+                print(f"WebCollector: Streaming {url}. Status: {response.status_code}") # Success log
+
+                link_parser = IncrementalLinkParser(self.config_parser, streaming=settings.ENABLE_STREAMING_DOWNLOAD)
+                links: List[Dict] = []
+                oversized = False
+                async for chunk in response.aiter_text():
+                    links.extend(link_parser.feed(chunk))
+                    if response.num_bytes_downloaded > settings.MAX_SUBSCRIPTION_BODY_BYTES:
+                        oversized = True
+                        print(f"WebCollector: WARNING: {url} exceeded the {settings.MAX_SUBSCRIPTION_BODY_BYTES // (1024 * 1024)} MB body limit. Stopping download.")
+                        break
+                links.extend(link_parser.close())
+                stats_reporter.record_streamed_body(link_parser.mode or 'empty', oversized)
+                print(f"WebCollector: Finished {url} ({response.num_bytes_downloaded} bytes, parsed as '{link_parser.mode}').")
+                return response, links, not oversized
         except httpx.TimeoutException:
             print(f"WebCollector: ERROR: Timeout fetching {url}") # Detailed error
             source_manager.update_website_score(url, -settings.COLLECTION_TIMEOUT_SECONDS)
@@ -39,8 +67,8 @@ class WebCollector:
             if e.response.status_code == 404:
                 source_manager.update_website_score(url, -50)
             elif e.response.status_code == 429:
-                print(f"WebCollector: Rate limit hit for {url}. Consider increasing delay or using proxies.")
-                source_manager.update_website_score(url, -30)
+                # FetchScheduler already paused and retried this host; a persistent 429 is not the source's fault.
+                print(f"WebCollector: Rate limit persisted for {url} (429) after retries. Leaving website score unchanged.")
             else:
                 source_manager.update_website_score(url, -10)
             return None
@@ -82,19 +110,29 @@ class WebCollector:
         Collects config links from a single website URL, parses content, and updates stats.
         """
         processed_url = self._get_raw_github_url(url)
-        content = await self._fetch_url_content(processed_url)
+        fetch_result = await self._fetch_url_links(processed_url)
         collected_links: List[Dict] = []
-
-        if not content:
+        if fetch_result is None:
             print(f"WebCollector: No content fetched for {url}. Skipping parsing.") # Detailed log
             return []
-
-        # NEW: Delegate parsing, cleaning, and validation to ConfigParser
-        parsed_links_info: List[Dict] = self.config_parser.parse_content(content)
+        response, parsed_links_info, complete_body = fetch_result
+
+        cached_response = http_validator_cache.get_cached_response(processed_url)
+        if parsed_links_info is None:
+            if cached_response is None:
+                print(f"WebCollector: {url} returned 304 but no cached links exist. Skipping parsing.") # Detailed log
+                return []
+            # Unchanged since the last run: reuse the previously parsed links without calling ConfigParser.
+            parsed_links_info = cached_response['links']
+            stats_reporter.record_http_cache_hit(cached_response.get('content_length', 0))
+            print(f"WebCollector: Reusing {len(parsed_links_info)} cached links for {url}.")
+        else:
+            stats_reporter.record_http_cache_miss()
+            http_validator_cache.store(processed_url, response.headers, parsed_links_info, response.num_bytes_downloaded, complete_body)
 
         if not parsed_links_info:
             if not settings.IGNORE_UNPARSEABLE_CONTENT:
-                print(f"WebCollector: Could not parse ANY links from {url}. Content snippet: {content[:200]}...") # Detailed log
+                print(f"WebCollector: Could not parse ANY links from {url}.") # Detailed log
                 source_manager.update_website_score(url, -2)
             else:
                 print(f"WebCollector: No links parsed from {url}. Ignoring unparseable content as per settings.") # Detailed log
@@ -112,7 +150,7 @@ class WebCollector:
 
             # Filter based on active protocols in settings
             if protocol in settings.ACTIVE_PROTOCOLS:
-                collected_links.append(link_info)
+                collected_links.append({**link_info, 'source': url, 'source_type': 'web'}) # metadata for the top-K selection
                 stats_reporter.increment_total_collected()
                 stats_reporter.increment_protocol_count(protocol)
                 stats_reporter.record_source_link("web", url, protocol)
@@ -146,14 +184,16 @@ class WebCollector:
         else:
             print(f"WebCollector: Starting collection from {len(active_websites)} active websites.") # Detailed log
 
-        tasks = []
+        # Highest scoring websites are fetched first; concurrency and per-host rate are bounded by the scheduler.
+        jobs = []
         for url in active_websites:
-            tasks.append(self.collect_from_website(url))
+            priority = source_manager._all_website_scores.get(url, 0)
+            jobs.append((url, priority, lambda url=url: self.collect_from_website(url)))
 
-        results: List[Exception | List[Dict]] = await asyncio.gather(*tasks, return_exceptions=True)
+        results = await self.scheduler.run(jobs)
 
-        for i, result in enumerate(results):
-            url = active_websites[i]
+        for url in active_websites:
+            result = results.get(url)
             if isinstance(result, Exception):
                 print(f"WebCollector: FATAL ERROR processing website {url}: {result}") # Critical error log
                 traceback.print_exc()
@@ -165,6 +205,7 @@ class WebCollector:
             if website_name in active_websites and source_manager._all_website_scores.get(website_name, 0) <= settings.MAX_TIMEOUT_SCORE_WEB:
                 stats_reporter.add_newly_timed_out_website(website_name)
 
+        http_validator_cache.save()
         print(f"WebCollector: Finished collection. Total links from web: {len(all_collected_links)}")
         return all_collected_links
 
@@ -0,0 +1,246 @@
+from typing import Callable, Dict, Optional, Tuple
+
+from src.parsers import share_uri
+from src.utils.protocol_validators.base_validator import BaseValidator
+
+# Clash/Mihomo proxy object -> (protocol, canonical share URI). Each converter checks the structured
+# fields it needs (endpoint, credentials, UUID) and returns None for an incomplete or invalid proxy,
+# so the resulting URI does not have to be parsed and validated again.
+ClashConverter = Callable[[Dict], Optional[Tuple[str, str]]]
+
+
+def _opts(proxy: Dict, key: str) -> Dict:
+    value = proxy.get(key)
+    return value if isinstance(value, dict) else {}
+
+
+def _first(value):
+    """Clash allows either a scalar or a list for hosts/paths; share URIs carry one value."""
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value
+
+
+def _endpoint(proxy: Dict) -> Optional[Tuple[str, int]]:
+    server, port = proxy.get('server'), proxy.get('port')
+    if not share_uri.is_valid_endpoint(server, port):
+        return None
+    return server, int(port)
+
+
+def _transport_params(proxy: Dict) -> Dict[str, share_uri.QueryValue]:
+    """Transport query parameters from 'network' and its '<network>-opts' block."""
+    network = proxy.get('network') or 'tcp'
+    if network == 'ws':
+        ws_opts = _opts(proxy, 'ws-opts')
+        return share_uri.transport_params('ws', host=_opts(ws_opts, 'headers').get('Host'), path=ws_opts.get('path'))
+    if network == 'grpc':
+        return share_uri.transport_params('grpc', service_name=_opts(proxy, 'grpc-opts').get('grpc-service-name'))
+    if network == 'h2':
+        h2_opts = _opts(proxy, 'h2-opts')
+        return share_uri.transport_params('h2', host=_first(h2_opts.get('host')), path=h2_opts.get('path'))
+    if network == 'http': # Clash 'http' is TCP with HTTP/1.1 header obfuscation
+        http_opts = _opts(proxy, 'http-opts')
+        return share_uri.transport_params(
+            'tcp', host=_first(_opts(http_opts, 'headers').get('Host')), path=_first(http_opts.get('path')), header_type='http'
+        )
+    return share_uri.transport_params(network)
+
+
+def convert_vmess(proxy: Dict) -> Optional[Tuple[str, str]]:
+    endpoint = _endpoint(proxy)
+    uuid = proxy.get('uuid')
+    if endpoint is None or not BaseValidator._is_valid_uuid(str(uuid)):
+        return None
+    transport = _transport_params(proxy)
+    return 'vmess', share_uri.build_vmess_uri(
+        endpoint[0], endpoint[1], str(uuid), name=proxy.get('name'), alter_id=proxy.get('alterId', 0),
+        cipher=proxy.get('cipher') or 'auto', network=share_uri.vmess_network(transport['type']), header_type=transport['headerType'],
+        host=transport['host'], path=transport['path'] or transport['serviceName'],
+        tls=bool(proxy.get('tls')), sni=proxy.get('servername'), alpn=share_uri.join_values(proxy.get('alpn')),
+        fingerprint=proxy.get('client-fingerprint'),
+    )
+
+
+def convert_vless(proxy: Dict) -> Optional[Tuple[str, str]]:
+    endpoint = _endpoint(proxy)
+    uuid = proxy.get('uuid')
+    if endpoint is None or not BaseValidator._is_valid_uuid(str(uuid)):
+        return None
+    reality_opts = _opts(proxy, 'reality-opts')
+    if reality_opts and not reality_opts.get('public-key'):
+        return None
+    security = 'reality' if reality_opts else ('tls' if proxy.get('tls') else 'none')
+    params = {
+        'security': security, 'sni': proxy.get('servername'), 'fp': proxy.get('client-fingerprint'),
+        'pbk': reality_opts.get('public-key'), 'sid': reality_opts.get('short-id'), 'flow': proxy.get('flow'),
+        'alpn': share_uri.join_values(proxy.get('alpn')), 'allowInsecure': share_uri.flag_param(proxy.get('skip-cert-verify')),
+    }
+    params.update(_transport_params(proxy))
+    uri = share_uri.build_vless_uri(endpoint[0], endpoint[1], str(uuid), name=proxy.get('name'), params=params)
+    return ('reality' if reality_opts else 'vless'), uri
+
+
+def convert_trojan(proxy: Dict) -> Optional[Tuple[str, str]]:
+    endpoint = _endpoint(proxy)
+    password = proxy.get('password')
+    if endpoint is None or not password:
+        return None
+    params = {
+        'sni': proxy.get('sni'), 'fp': proxy.get('client-fingerprint'), 'alpn': share_uri.join_values(proxy.get('alpn')),
+        'allowInsecure': share_uri.flag_param(proxy.get('skip-cert-verify')),
+    }
+    params.update(_transport_params(proxy))
+    return 'trojan', share_uri.build_trojan_uri(endpoint[0], endpoint[1], str(password), name=proxy.get('name'), params=params)
+
+
+def convert_ss(proxy: Dict) -> Optional[Tuple[str, str]]:
+    endpoint = _endpoint(proxy)
+    cipher, password = proxy.get('cipher'), proxy.get('password')
+    if endpoint is None or not cipher or password in (None, ''):
+        return None
+    plugin = None
+    if proxy.get('plugin'):
+        plugin_opts = _opts(proxy, 'plugin-opts')
+        plugin_parts = [str(proxy['plugin'])] + [f"{key}={value}" for key, value in plugin_opts.items() if value not in (None, '')]
+        plugin = ';'.join(plugin_parts)
+    return 'ss', share_uri.build_ss_uri(endpoint[0], endpoint[1], str(cipher), str(password), name=proxy.get('name'), plugin=plugin)
+
+
+def convert_ssr(proxy: Dict) -> Optional[Tuple[str, str]]:
+    endpoint = _endpoint(proxy)
+    method = proxy.get('cipher') or proxy.get('method')
+    protocol, obfs, password = proxy.get('protocol'), proxy.get('obfs'), proxy.get('password')
+    if endpoint is None or not (method and protocol and obfs) or password in (None, ''):
+        return None
+    return 'ssr', share_uri.build_ssr_uri(
+        endpoint[0], endpoint[1], str(protocol), str(method), str(obfs), str(password), name=proxy.get('name'),
+        obfs_param=proxy.get('obfs-param') or proxy.get('obfsparam'),
+        protocol_param=proxy.get('protocol-param') or proxy.get('protparam'),
+    )
+
+
+def convert_hysteria2(proxy: Dict) -> Optional[Tuple[str, str]]:
+    endpoint = _endpoint(proxy)
+    password = proxy.get('password') or proxy.get('auth')
+    if endpoint is None or not password:
+        return None
+    insecure = share_uri.flag_param(proxy.get('skip-cert-verify'))
+    sni = proxy.get('sni') or (None if insecure else endpoint[0])
+    params = {
+        'sni': sni, 'insecure': insecure, 'obfs': proxy.get('obfs'), 'obfs-password': proxy.get('obfs-password'),
+        'mport': proxy.get('ports'), 'alpn': share_uri.join_values(proxy.get('alpn')),
+    }
+    return 'hysteria2', share_uri.build_hysteria2_uri(endpoint[0], endpoint[1], str(password), name=proxy.get('name'), params=params)
+
+
+def convert_hysteria(proxy: Dict) -> Optional[Tuple[str, str]]:
+    endpoint = _endpoint(proxy)
+    if endpoint is None:
+        return None
+    params = {
+        'protocol': proxy.get('protocol'), 'auth': proxy.get('auth-str') or proxy.get('auth'), 'peer': proxy.get('sni'),
+        'insecure': share_uri.flag_param(proxy.get('skip-cert-verify')), 'upmbps': proxy.get('up'), 'downmbps': proxy.get('down'),
+        'alpn': share_uri.join_values(proxy.get('alpn')), 'obfs': proxy.get('obfs'),
+    }
+    return 'hysteria', share_uri.build_hysteria_uri(endpoint[0], endpoint[1], name=proxy.get('name'), params=params)
+
+
+def convert_tuic(proxy: Dict) -> Optional[Tuple[str, str]]:
+    endpoint = _endpoint(proxy)
+    uuid, password = proxy.get('uuid'), proxy.get('password')
+    if endpoint is None or not BaseValidator._is_valid_uuid(str(uuid)) or not password:
+        return None
+    params = {
+        'sni': proxy.get('sni'), 'congestion_control': proxy.get('congestion-controller'),
+        'udp_relay_mode': proxy.get('udp-relay-mode'), 'alpn': share_uri.join_values(proxy.get('alpn')),
+        'allow_insecure': share_uri.flag_param(proxy.get('skip-cert-verify')),
+    }
+    return 'tuic', share_uri.build_tuic_uri(endpoint[0], endpoint[1], str(uuid), str(password), name=proxy.get('name'), params=params)
+
+
+def convert_wireguard(proxy: Dict) -> Optional[Tuple[str, str]]:
+    endpoint = _endpoint(proxy)
+    private_key, public_key = proxy.get('private-key'), proxy.get('public-key')
+    if endpoint is None or not private_key or not public_key:
+        return None
+    addresses = [address for address in (proxy.get('ip'), proxy.get('ipv6')) if address]
+    params = {
+        'address': ','.join(addresses) or None, 'presharedkey': proxy.get('pre-shared-key'),
+        'reserved': share_uri.join_values(proxy.get('reserved')), 'mtu': proxy.get('mtu'),
+    }
+    return 'wireguard', share_uri.build_wireguard_uri(
+        endpoint[0], endpoint[1], str(private_key), str(public_key), name=proxy.get('name'), params=params
+    )
+
+
+def convert_socks5(proxy: Dict) -> Optional[Tuple[str, str]]:
+    endpoint = _endpoint(proxy)
+    if endpoint is None:
+        return None
+    return 'socks5', share_uri.build_socks5_uri(endpoint[0], endpoint[1], proxy.get('username'), proxy.get('password'), name=proxy.get('name'))
+
+
+def convert_http(proxy: Dict) -> Optional[Tuple[str, str]]:
+    endpoint = _endpoint(proxy)
+    if endpoint is None:
+        return None
+    return 'http', share_uri.build_http_uri(endpoint[0], endpoint[1], proxy.get('username'), proxy.get('password'), name=proxy.get('name'))
+
+
+def convert_ssh(proxy: Dict) -> Optional[Tuple[str, str]]:
+    endpoint = _endpoint(proxy)
+    if endpoint is None or not proxy.get('username'):
+        return None
+    return 'ssh', share_uri.build_ssh_uri(endpoint[0], endpoint[1], proxy.get('username'), proxy.get('password'), name=proxy.get('name'))
+
+
+def convert_snell(proxy: Dict) -> Optional[Tuple[str, str]]:
+    endpoint = _endpoint(proxy)
+    psk = proxy.get('psk')
+    if endpoint is None or not psk:
+        return None
+    obfs_opts = _opts(proxy, 'obfs-opts')
+    params = {'version': proxy.get('version'), 'obfs': obfs_opts.get('mode'), 'obfs-host': obfs_opts.get('host')}
+    return 'snell', share_uri.build_snell_uri(endpoint[0], endpoint[1], str(psk), name=proxy.get('name'), params=params)
+
+
+def convert_anytls(proxy: Dict) -> Optional[Tuple[str, str]]:
+    endpoint = _endpoint(proxy)
+    password = proxy.get('password')
+    if endpoint is None or not password:
+        return None
+    params = {'sni': proxy.get('sni'), 'insecure': share_uri.flag_param(proxy.get('skip-cert-verify')), 'fp': proxy.get('client-fingerprint')}
+    return 'anytls', share_uri.build_anytls_uri(endpoint[0], endpoint[1], str(password), name=proxy.get('name'), params=params)
+
+
+def convert_mieru(proxy: Dict) -> Optional[Tuple[str, str]]:
+    endpoint = _endpoint(proxy)
+    if endpoint is None or not proxy.get('username') or not proxy.get('password'):
+        return None
+    params = {'transport': proxy.get('transport'), 'multiplexing': proxy.get('multiplexing')}
+    return 'mieru', share_uri.build_mieru_uri(
+        endpoint[0], endpoint[1], proxy.get('username'), proxy.get('password'), name=proxy.get('name'), params=params
+    )
+
+
+# Clash 'type' (lowercased) -> converter
+CLASH_CONVERTERS: Dict[str, ClashConverter] = {
+    'vmess': convert_vmess,
+    'vless': convert_vless,
+    'trojan': convert_trojan,
+    'ss': convert_ss,
+    'ssr': convert_ssr,
+    'hysteria2': convert_hysteria2,
+    'hy2': convert_hysteria2,
+    'hysteria': convert_hysteria,
+    'tuic': convert_tuic,
+    'wireguard': convert_wireguard,
+    'socks5': convert_socks5,
+    'http': convert_http,
+    'ssh': convert_ssh,
+    'snell': convert_snell,
+    'anytls': convert_anytls,
+    'mieru': convert_mieru,
+}
+
@@ -0,0 +1,162 @@
+from typing import Any, Dict, Iterator, List, Tuple
+
+import yaml
+
+# libyaml-backed loader when PyYAML was built with it, the pure-Python one otherwise
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+PROXIES = 'proxies'
+PROXY_PROVIDERS = 'proxy-providers'
+
+_SCALAR_TAGS = frozenset(
+    'tag:yaml.org,2002:' + name for name in ('null', 'bool', 'int', 'float', 'str', 'timestamp', 'binary')
+)
+
+
+class _EventBuilder:
+    """
+    Builds Python values from a YAML event stream, one node at a time, with SafeLoader's scalar
+    typing. Nodes that are not needed are consumed without building them, except anchored nodes,
+    which are kept so later aliases (and '<<' merge keys) resolve.
+    """
+
+    def __init__(self, events: Iterator[yaml.Event]):
+        self.events = events
+        self.anchors: Dict[str, Any] = {}
+        self.resolver = yaml.resolver.Resolver()
+        self.constructor = yaml.constructor.SafeConstructor()
+
+    def next_event(self) -> yaml.Event:
+        return next(self.events)
+
+    def build(self, event: yaml.Event, keep: bool = True) -> Any:
+        if isinstance(event, yaml.AliasEvent):
+            if event.anchor not in self.anchors:
+                raise yaml.YAMLError(f"found undefined alias '{event.anchor}'")
+            return self.anchors[event.anchor]
+
+        keep = keep or event.anchor is not None
+        if isinstance(event, yaml.ScalarEvent):
+            value = self._build_scalar(event) if keep else None
+        elif isinstance(event, yaml.SequenceStartEvent):
+            value = self._build_sequence(keep)
+        elif isinstance(event, yaml.MappingStartEvent):
+            value = self._build_mapping(keep)
+        else:
+            raise yaml.YAMLError(f"unexpected YAML event {event!r}")
+
+        if event.anchor is not None:
+            self.anchors[event.anchor] = value
+        return value
+
+    def _build_scalar(self, event: yaml.ScalarEvent) -> Any:
+        tag = event.tag
+        if tag is None or tag == '!':
+            tag = self.resolver.resolve(yaml.ScalarNode, event.value, event.implicit)
+        if tag not in _SCALAR_TAGS:
+            return event.value
+        node = yaml.ScalarNode(tag, event.value, style=event.style)
+        return self.constructor.yaml_constructors[tag](self.constructor, node)
+
+    def _build_sequence(self, keep: bool) -> Any:
+        items: List[Any] = []
+        while True:
+            event = self.next_event()
+            if isinstance(event, yaml.SequenceEndEvent):
+                return items if keep else None
+            item = self.build(event, keep)
+            if keep:
+                items.append(item)
+
+    def _build_mapping(self, keep: bool) -> Any:
+        mapping: Dict[Any, Any] = {}
+        merges: List[Any] = []
+        while True:
+            event = self.next_event()
+            if isinstance(event, yaml.MappingEndEvent):
+                break
+            key = self.build(event, keep)
+            value = self.build(self.next_event(), keep)
+            if not keep:
+                continue
+            if key == '<<':
+                merges.extend(value if isinstance(value, list) else [value])
+            else:
+                try:
+                    mapping[key] = value
+                except TypeError: # unhashable (sequence/mapping) key
+                    continue
+        if not keep:
+            return None
+        # Explicit keys win over merged ones, earlier merge sources over later ones
+        for merged in merges:
+            if isinstance(merged, dict):
+                for key, value in merged.items():
+                    mapping.setdefault(key, value)
+        return mapping
+
+
+def _stream_clash_entries(content: str) -> Iterator[Tuple[str, Any, Any]]:
+    events = yaml.parse(content, Loader=YAML_LOADER)
+    try:
+        builder = _EventBuilder(events)
+        event = builder.next_event()
+        while isinstance(event, (yaml.StreamStartEvent, yaml.DocumentStartEvent)):
+            event = builder.next_event()
+        if not isinstance(event, yaml.MappingStartEvent):
+            return # Not a Clash config (empty document, scalar or top-level list)
+
+        while True:
+            event = builder.next_event()
+            if isinstance(event, yaml.MappingEndEvent):
+                return # Only the first document is read
+            key = builder.build(event)
+            value_event = builder.next_event()
+            if key == PROXIES and isinstance(value_event, yaml.SequenceStartEvent) and value_event.anchor is None:
+                index = 0
+                while True:
+                    event = builder.next_event()
+                    if isinstance(event, yaml.SequenceEndEvent):
+                        break
+                    yield PROXIES, index, builder.build(event)
+                    index += 1
+            elif key == PROXY_PROVIDERS and isinstance(value_event, yaml.MappingStartEvent) and value_event.anchor is None:
+                while True:
+                    event = builder.next_event()
+                    if isinstance(event, yaml.MappingEndEvent):
+                        break
+                    name = builder.build(event)
+                    yield PROXY_PROVIDERS, name, builder.build(builder.next_event())
+            elif key in (PROXIES, PROXY_PROVIDERS): # anchored section: build it whole
+                yield from _section_entries(key, builder.build(value_event))
+            else:
+                builder.build(value_event, keep=False)
+    finally:
+        events.close()
+
+
+def _section_entries(section: str, value: Any) -> Iterator[Tuple[str, Any, Any]]:
+    if section == PROXIES and isinstance(value, list):
+        for index, proxy in enumerate(value):
+            yield PROXIES, index, proxy
+    elif section == PROXY_PROVIDERS and isinstance(value, dict):
+        for name, provider in value.items():
+            yield PROXY_PROVIDERS, name, provider
+
+
+def iter_clash_entries(content: str, streaming: bool = False) -> Iterator[Tuple[str, Any, Any]]:
+    """
+    Yields (section, key, value) for every entry of the 'proxies' list (key = index) and the
+    'proxy-providers' mapping (key = provider name), in document order.
+    With streaming=True the document is walked event by event: each entry is built, yielded and
+    dropped before the next one is read, and other top-level sections are skipped without being built.
+    Otherwise the whole document is loaded at once. Nothing is yielded if the top level is not a mapping.
+    """
+    if streaming:
+        yield from _stream_clash_entries(content)
+        return
+    clash_data = yaml.load(content, Loader=YAML_LOADER)
+    if not isinstance(clash_data, dict):
+        return
+    for section in (PROXIES, PROXY_PROVIDERS):
+        yield from _section_entries(section, clash_data.get(section))
@@ -0,0 +1,97 @@
+import re
+
+from src.utils.base64_service import base64_service
+from src.utils.link_scanner import SCHEME_LINK_REGEX
+
+# Content classes, each handled by exactly one parser in ConfigParser
+LINKS = 'links'
+BASE64 = 'base64'
+BASE64_LINES = 'base64_lines'
+CLASH_YAML = 'clash_yaml'
+SINGBOX_JSON = 'singbox_json'
+JSON = 'json'
+HTML = 'html'
+
+SNIFF_WINDOW_CHARS = 4096
+
+BASE64_BODY_REGEX = re.compile(r'^[A-Za-z0-9+/_=\-\s]+$')
+BASE64_LINE_REGEX = re.compile(r'^[A-Za-z0-9+/_\-]{16,}={0,2}$')
+CLASH_SECTION_REGEX = re.compile(r'^(?:proxies|proxy-providers):', re.MULTILINE)
+YAML_KEY_LINE_REGEX = re.compile(r'^[\w.-]+:(?:\s|$)')
+HTML_START_REGEX = re.compile(r'<(?:!doctype|html|head|body|div|p|a|table|meta)\b', re.IGNORECASE)
+LINE_START_LINK_REGEX = re.compile(r'^[A-Za-z][A-Za-z0-9+.-]*://')
+
+
+class SniffResult:
+    """The class chosen for a body and how sure the sniffer is about it (0..1)."""
+    __slots__ = ('content_class', 'confidence')
+
+    def __init__(self, content_class: str, confidence: float):
+        self.content_class = content_class
+        self.confidence = confidence
+
+    def __repr__(self) -> str:
+        return f"SniffResult({self.content_class!r}, {self.confidence:.2f})"
+
+
+def _sample(content: str) -> str:
+    """First window plus one window from the middle of the body."""
+    if len(content) <= SNIFF_WINDOW_CHARS * 2:
+        return content
+    middle = len(content) // 2
+    return content[:SNIFF_WINDOW_CHARS] + "\n" + content[middle:middle + SNIFF_WINDOW_CHARS]
+
+
+def _first_line(text: str) -> str:
+    for line in text.splitlines():
+        line = line.strip()
+        if line and not line.startswith('#'):
+            return line
+    return ''
+
+
+def sniff_content(content: str) -> SniffResult:
+    """
+    Classifies a body from its first characters and a sampled window, without parsing it.
+    Anything that matches no structured format is treated as text with links (LINKS, low confidence).
+    """
+    stripped = content.strip()
+    if not stripped:
+        return SniffResult(LINKS, 0.0)
+    head = stripped[:SNIFF_WINDOW_CHARS]
+    first_char = head[0]
+
+    if first_char == '<' and HTML_START_REGEX.match(head):
+        return SniffResult(HTML, 0.9)
+
+    if first_char in '{[':
+        sample = _sample(stripped)
+        if '"outbounds"' in sample:
+            return SniffResult(SINGBOX_JSON, 0.9)
+        if '"proxies"' in sample or '"proxy-providers"' in sample:
+            return SniffResult(CLASH_YAML, 0.7) # JSON is valid YAML
+        return SniffResult(JSON, 0.8)
+
+    first_line = _first_line(head)
+    if LINE_START_LINK_REGEX.match(first_line):
+        return SniffResult(LINKS, 0.95)
+
+    if YAML_KEY_LINE_REGEX.match(first_line) or first_line.startswith('- '):
+        if CLASH_SECTION_REGEX.search(stripped):
+            return SniffResult(CLASH_YAML, 0.9)
+
+    if BASE64_BODY_REGEX.match(head):
+        lines = [line.strip() for line in head.splitlines() if line.strip()]
+        # Per-line Base64: the first two lines each decode to a whole link. In a wrapped blob the
+        # second line decodes to the middle of a link.
+        if len(lines) > 1 and all(BASE64_LINE_REGEX.match(line) for line in lines[:2]):
+            decoded_lines = [base64_service.decode_text(line) for line in lines[:2]] # cached for the later per-line decode
+            if all(decoded and LINE_START_LINK_REGEX.match(decoded) for decoded in decoded_lines):
+                return SniffResult(BASE64_LINES, 0.9)
+        return SniffResult(BASE64, 0.8 if len(stripped) >= 16 else 0.4)
+
+    if SCHEME_LINK_REGEX.search(head):
+        return SniffResult(LINKS, 0.7)
+    if '<' in head and HTML_START_REGEX.search(head):
+        return SniffResult(HTML, 0.6)
+    return SniffResult(LINKS, 0.3)
@@ -0,0 +1,189 @@
+import base64
+import binascii
+import codecs
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+# Scheme at the start of a line-oriented subscription ("vless://...", "ss://...")
+LINK_LINE_REGEX = re.compile(r'^[A-Za-z][A-Za-z0-9+.-]*://')
+# Standard and URL-safe Base64 alphabet plus padding and whitespace
+BASE64_HEAD_REGEX = re.compile(r'^[A-Za-z0-9+/_=\-\s]+$')
+BASE64_URLSAFE_TABLE = str.maketrans('-_', '+/')
+WHITESPACE_REGEX = re.compile(r'\s+')
+# Characters that cannot appear in a (whitespace-stripped, URL-safe translated) Base64 body
+BASE64_INVALID_REGEX = re.compile(r'[^A-Za-z0-9+/=]')
+# Same, on raw body text (URL-safe alphabet and whitespace allowed)
+BASE64_RAW_INVALID_REGEX = re.compile(r'[^A-Za-z0-9+/=_\-\s]')
+# Wrapped Base64 lines are at most this long (MIME); a shorter run of Base64 characters before an
+# invalid character on the same line is taken to be plain text (e.g. a 'Channel: ...' footer).
+BASE64_LINE_CHARS = 76
+
+# Non-whitespace characters needed before the body format is sniffed
+SNIFF_HEAD_CHARS = 64
+
+
+class IncrementalLinkParser:
+    """
+    Parses a subscription body chunk by chunk while it is being downloaded.
+
+    The format is sniffed from the first characters of the body:
+    - 'links':    one link per line. Complete lines are parsed as they arrive; the unfinished
+                  last line of a chunk is carried over to the next one.
+    - 'base64':   a Base64-encoded link list (plain or wrapped). Characters are decoded in
+                  4-character aligned blocks and the decoded text goes through a nested parser.
+    - 'buffered': anything else (Clash YAML, sing-box/JSON, HTML, ...). These formats need the whole
+                  document, so the body is buffered and handed to ConfigParser.parse_content on close().
+    Only links are kept across chunks, so memory stays around one chunk for 'links' and 'base64' bodies.
+    """
+
+    def __init__(self, config_parser, streaming: bool = True, allow_base64: bool = True):
+        self.config_parser = config_parser
+        self.allow_base64 = allow_base64
+        self.mode: Optional[str] = None if streaming else 'buffered'
+        self._head: List[str] = []
+        self._head_chars: int = 0
+        self._carry: str = ''
+        self._buffer: List[str] = []
+        self._base64_pending: str = ''
+        self._decoded_parser: Optional["IncrementalLinkParser"] = None
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        self._seen_links: Set[Tuple[str, str]] = set()
+
+    def _sniff_mode(self, head: str) -> str:
+        stripped = head.lstrip()
+        if LINK_LINE_REGEX.match(stripped):
+            return 'links'
+        if self.allow_base64 and BASE64_HEAD_REGEX.match(stripped):
+            return 'base64'
+        return 'buffered'
+
+    def _emit(self, links: List[Dict]) -> List[Dict]:
+        """
+        Drops exact repeats of links already emitted from this body. Emitted links cannot be taken back,
+        so copies of one server with other parameters are all passed on: the ranked DedupIndex run over
+        all collected links picks the best copy.
+        """
+        emitted: List[Dict] = []
+        for link_info in links:
+            key = (link_info['protocol'], link_info['link'])
+            if key not in self._seen_links:
+                self._seen_links.add(key)
+                emitted.append(link_info)
+        return emitted
+
+    def _feed_lines(self, text: str) -> List[Dict]:
+        text = self._carry + text
+        last_newline = text.rfind('\n')
+        if last_newline == -1:
+            self._carry = text
+            return []
+        self._carry = text[last_newline + 1:]
+        complete_lines = text[:last_newline]
+        if not complete_lines.strip():
+            return []
+        return self._emit(self.config_parser._extract_direct_links(complete_lines))
+
+    def _feed_base64(self, text: str) -> List[Dict]:
+        pending = self._base64_pending + WHITESPACE_REGEX.sub('', text).translate(BASE64_URLSAFE_TABLE)
+        if BASE64_INVALID_REGEX.search(pending):
+            return self._leave_base64(text)
+        aligned_length = len(pending) // 4 * 4
+        if not aligned_length:
+            self._base64_pending = pending
+            return []
+        try:
+            decoded_bytes = base64.b64decode(pending[:aligned_length], validate=True)
+        except (binascii.Error, ValueError):
+            return self._leave_base64(text)
+        self._base64_pending = pending[aligned_length:]
+        return self._feed_decoded(self._decoder.decode(decoded_bytes))
+
+    def _leave_base64(self, text: str) -> List[Dict]:
+        """
+        The body stopped being Base64 inside this chunk (e.g. an HTML comment or a footer after the
+        encoded list). Decodes everything up to the line with the first invalid character, flushes
+        and closes the decoded-text parser, and parses the rest of the body as plain text lines.
+        """
+        print("IncrementalLinkParser: Body stopped decoding as Base64. Parsing the remainder as plain text lines.")
+        raw = self._base64_pending + text # pending holds fewer than 4 characters carried from the last chunk
+        self._base64_pending = ''
+        invalid = BASE64_RAW_INVALID_REGEX.search(raw)
+        split = invalid.start() if invalid else 0
+        line_start = raw.rfind('\n', 0, split) + 1
+        if split - line_start < BASE64_LINE_CHARS:
+            split = line_start
+        links = self._finish_base64(WHITESPACE_REGEX.sub('', raw[:split]).translate(BASE64_URLSAFE_TABLE))
+        self.mode = 'links'
+        links.extend(self._feed_lines(raw[split:]))
+        return links
+
+    def _finish_base64(self, data: str) -> List[Dict]:
+        """Decodes the last Base64 characters of the encoded part (padding them) and closes the decoded-text parser."""
+        links: List[Dict] = []
+        if len(data) % 4 == 1: # A single leftover character cannot encode a byte
+            data = data[:-1]
+        if data:
+            data += '=' * (-len(data) % 4)
+            try:
+                links.extend(self._feed_decoded(self._decoder.decode(base64.b64decode(data), final=True)))
+            except (binascii.Error, ValueError):
+                print("IncrementalLinkParser: Could not decode the trailing Base64 block. Ignoring it.")
+        if self._decoded_parser is not None:
+            links.extend(self._emit(self._decoded_parser.close()))
+            self._decoded_parser = None
+        return links
+
+    def _feed_decoded(self, decoded_text: str) -> List[Dict]:
+        if self._decoded_parser is None:
+            self._decoded_parser = IncrementalLinkParser(self.config_parser, allow_base64=False)
+        return self._emit(self._decoded_parser.feed(decoded_text))
+
+    def _dispatch(self, text: str) -> List[Dict]:
+        if self.mode == 'links':
+            return self._feed_lines(text)
+        if self.mode == 'base64':
+            return self._feed_base64(text)
+        self._buffer.append(text)
+        return []
+
+    def feed(self, text: str) -> List[Dict]:
+        """Consumes the next decoded chunk of the body and returns the links completed by it."""
+        if not text:
+            return []
+        if self.mode is not None:
+            return self._dispatch(text)
+
+        self._head.append(text)
+        self._head_chars += len(text.strip())
+        if self._head_chars < SNIFF_HEAD_CHARS:
+            return []
+        return self._start(''.join(self._head))
+
+    def _start(self, head: str) -> List[Dict]:
+        self._head = []
+        self.mode = self._sniff_mode(head)
+        print(f"IncrementalLinkParser: Body sniffed as '{self.mode}'.")
+        return self._dispatch(head)
+
+    def close(self) -> List[Dict]:
+        """Flushes the carried-over line / Base64 tail (or parses the buffered body) and returns the remaining links."""
+        links: List[Dict] = []
+        if self.mode is None:
+            head = ''.join(self._head)
+            if not head.strip():
+                return []
+            links.extend(self._start(head))
+
+        if self.mode == 'links':
+            tail, self._carry = self._carry, ''
+            if tail.strip():
+                links.extend(self._emit(self.config_parser._extract_direct_links(tail)))
+        elif self.mode == 'base64':
+            tail, self._base64_pending = self._base64_pending, ''
+            links.extend(self._finish_base64(tail))
+        elif self.mode == 'buffered':
+            content = ''.join(self._buffer)
+            self._buffer = []
+            if content.strip():
+                links.extend(self._emit(self.config_parser.parse_content(content)))
+        return links
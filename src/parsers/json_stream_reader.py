@@ -0,0 +1,111 @@
+import json
+import re
+from json.decoder import scanstring
+from typing import Any, Callable, Iterator
+
+# Optional faster JSON backend for whole-document loads. json from the standard library is used when it is not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_BACKEND = 'orjson' if orjson is not None else 'json'
+
+# A JSON string token (escapes included); group 2 is set when the string is an object key
+STRING_TOKEN_REGEX = re.compile(r'"([^"\\]*(?:\\.[^"\\]*)*)"(\s*:)?', re.DOTALL)
+# Strings and brackets, for skipping a container without building it
+STRUCTURE_TOKEN_REGEX = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}]', re.DOTALL)
+WHITESPACE_REGEX = re.compile(r'[ \t\n\r]*')
+
+_decoder = json.JSONDecoder()
+
+
+def load_json(content: str) -> Any:
+    """json.loads through orjson when available. Both raise json.JSONDecodeError subclasses."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def iter_json_strings(content: str, predicate: Callable[[str], bool]) -> Iterator[str]:
+    """
+    Yields string values (object keys excluded) of a JSON text that satisfy predicate, straight from
+    the raw text: no document tree is built, and only strings that contain '://' (also in its
+    escaped ':\\/\\/' form) are unescaped and passed to predicate.
+    """
+    for match in STRING_TOKEN_REGEX.finditer(content):
+        if match.group(2) is not None:
+            continue
+        raw_value = match.group(1)
+        if '://' not in raw_value and ':\\/\\/' not in raw_value:
+            continue
+        value = scanstring(content, match.start(1))[0] if '\\' in raw_value else raw_value
+        if predicate(value):
+            yield value
+
+
+def _skip_whitespace(content: str, position: int) -> int:
+    return WHITESPACE_REGEX.match(content, position).end()
+
+
+def _expect(content: str, position: int, char: str) -> int:
+    if content[position:position + 1] != char:
+        raise json.JSONDecodeError(f"Expecting '{char}'", content, position)
+    return position + 1
+
+
+def _skip_value(content: str, position: int) -> int:
+    """Returns the position after the value starting at position. Containers are skipped without building them."""
+    if content[position:position + 1] not in ('{', '['):
+        return _decoder.raw_decode(content, position)[1]
+    depth = 0
+    for token in STRUCTURE_TOKEN_REGEX.finditer(content, position):
+        text = token.group(0)
+        if text in ('{', '['):
+            depth += 1
+        elif text in ('}', ']'):
+            depth -= 1
+            if depth == 0:
+                return token.end()
+    raise json.JSONDecodeError("Unterminated container", content, position)
+
+
+def iter_json_array_items(content: str, key: str) -> Iterator[Any]:
+    """
+    Yields the items of the array stored under key in the top-level JSON object, one at a time:
+    each item is decoded, yielded and dropped before the next one is read. Other top-level values
+    are skipped without being built. Nothing is yielded if the top level is not an object.
+    Raises json.JSONDecodeError on malformed input (items yielded before the error stay valid).
+    """
+    position = _skip_whitespace(content, 0)
+    if content[position:position + 1] != '{':
+        return
+    position = _skip_whitespace(content, position + 1)
+    if content[position:position + 1] == '}':
+        return
+    while True:
+        position = _expect(content, position, '"')
+        member_key, position = scanstring(content, position)
+        position = _skip_whitespace(content, position)
+        position = _skip_whitespace(content, _expect(content, position, ':'))
+
+        if member_key == key and content[position:position + 1] == '[':
+            position = _skip_whitespace(content, position + 1)
+            if content[position:position + 1] == ']':
+                position += 1
+            else:
+                while True:
+                    item, position = _decoder.raw_decode(content, position)
+                    yield item
+                    position = _skip_whitespace(content, position)
+                    if content[position:position + 1] == ']':
+                        position += 1
+                        break
+                    position = _skip_whitespace(content, _expect(content, position, ','))
+        else:
+            position = _skip_value(content, position)
+
+        position = _skip_whitespace(content, position)
+        if content[position:position + 1] == '}':
+            return
+        position = _skip_whitespace(content, _expect(content, position, ','))
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from src.utils.settings_manager import settings
+
+# Bump when the parser output for the same input can change (new extraction logic, validator fixes, ...).
+PARSE_CACHE_SCHEMA_VERSION = 11
+
+
+def compute_parser_version() -> str:
+    """
+    Fingerprint of everything that changes what ConfigParser.parse_content returns for a given input:
+    the cache schema version, ACTIVE_PROTOCOLS and the parser settings.
+    """
+    fingerprint = json.dumps({
+        'schema': PARSE_CACHE_SCHEMA_VERSION,
+        'active_protocols': sorted(settings.ACTIVE_PROTOCOLS),
+        'parser_settings': settings.config_data.get('parser_settings', {}),
+    }, sort_keys=True)
+    return hashlib.blake2b(fingerprint.encode('utf-8'), digest_size=8).hexdigest()
+
+
+class ParseCache:
+    """
+    LRU cache of ConfigParser.parse_content results keyed by a hash of the normalized input.
+    The same subscription body served by several mirrors, or the same message forwarded across channels,
+    is parsed once. Optionally persisted between runs; entries are dropped when the parser version changes.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, file_path: Optional[str] = None):
+        self.enabled: bool = settings.ENABLE_PARSE_CACHE
+        self.max_entries: int = max_entries or settings.PARSE_CACHE_MAX_ENTRIES
+        self.file_path = file_path or settings.PARSE_CACHE_FILE
+        self.version = compute_parser_version()
+        self._entries: "OrderedDict[str, List[Dict]]" = OrderedDict()
+        if self.enabled and settings.PERSIST_PARSE_CACHE:
+            self.load()
+
+    @staticmethod
+    def make_key(content: str) -> str:
+        """Hashes the input after normalizing line endings and surrounding whitespace."""
+        normalized = content.strip().replace('\r\n', '\n')
+        return hashlib.blake2b(normalized.encode('utf-8', errors='surrogatepass'), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        if not self.enabled:
+            return None
+        result = self._entries.get(key)
+        if result is None:
+            return None
+        self._entries.move_to_end(key)
+        return [dict(item) for item in result] # Callers may mutate the returned dicts
+
+    def put(self, key: str, result: List[Dict]):
+        if not self.enabled:
+            return
+        self._entries[key] = [{'protocol': item['protocol'], 'link': item['link']} for item in result]
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def load(self):
+        if not os.path.exists(self.file_path):
+            return
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"ParseCache: WARNING: Could not read parse cache {self.file_path}: {e}. Starting empty.")
+            return
+        if not isinstance(data, dict) or data.get('version') != self.version:
+            print("ParseCache: Persisted parse cache was built with different protocols/parser settings. Discarding it.")
+            return
+        for key, result in data.get('entries', []):
+            self._entries[key] = result
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        print(f"ParseCache: Loaded {len(self._entries)} cached parse results from {self.file_path}.")
+
+    def save(self):
+        """Persists the cache (in LRU order) if persistence is enabled."""
+        if not self.enabled or not settings.PERSIST_PARSE_CACHE:
+            return
+        tmp_path = f"{self.file_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.version, 'entries': list(self._entries.items())}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.file_path)
+            print(f"ParseCache: Saved {len(self._entries)} parse results to {self.file_path}.")
+        except OSError as e:
+            print(f"ParseCache: ERROR saving parse cache to {self.file_path}: {e}")
+
+
+# Create a global instance of ParseCache, shared by every ConfigParser (and so by both collectors)
+parse_cache = ParseCache()
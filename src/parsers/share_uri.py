@@ -0,0 +1,179 @@
+import base64
+import json
+from typing import Dict, Optional, Union
+from urllib.parse import quote
+
+from src.utils.protocol_validators.base_validator import BaseValidator
+
+# Canonical share-URI builders shared by the structured-config converters (Clash, SingBox).
+# Every builder takes already-extracted fields and returns the URI; empty optional fields are omitted.
+
+QueryValue = Union[str, int, None]
+
+
+def is_valid_endpoint(server, port) -> bool:
+    """True for a domain / IPv4 / IPv6 server and a port in 1..65535."""
+    if not isinstance(server, str) or not server:
+        return False
+    host = server[1:-1] if server.startswith('[') and server.endswith(']') else server
+    if not BaseValidator._is_valid_port(port):
+        return False
+    return BaseValidator._is_valid_domain(host) or BaseValidator._is_valid_ipv4(host) or BaseValidator._is_valid_ipv6(host)
+
+
+def format_host(server: str) -> str:
+    """Wraps bare IPv6 addresses in brackets for the authority part of a URI."""
+    if ':' in server and not server.startswith('['):
+        return f"[{server}]"
+    return server
+
+
+def build_query(params: Dict[str, QueryValue]) -> str:
+    """'?k=v&...' with percent-encoded values, skipping None/empty values. Key order is preserved."""
+    parts = [f"{key}={quote(str(value), safe='')}" for key, value in params.items() if value not in (None, '')]
+    return ('?' + '&'.join(parts)) if parts else ''
+
+
+def build_fragment(name) -> str:
+    return f"#{quote(str(name), safe='')}" if name not in (None, '') else ''
+
+
+def transport_params(network: Optional[str], host: Optional[str] = None, path: Optional[str] = None,
+                     service_name: Optional[str] = None, header_type: Optional[str] = None) -> Dict[str, QueryValue]:
+    """
+    type/headerType/host/path/serviceName query parameters of vless/trojan links (the same fields
+    go into the vmess JSON). HTTP/2 transports are written as 'http', the Xray / v2rayN share-link
+    name; the vmess JSON calls them 'h2' (see vmess_network).
+    """
+    network = (network or 'tcp').lower()
+    if network == 'h2':
+        network = 'http'
+    return {
+        'type': network, 'headerType': header_type, 'host': host, 'path': path,
+        'serviceName': service_name if network == 'grpc' else None,
+    }
+
+
+def vmess_network(network: str) -> str:
+    """'net' of the vmess JSON for a transport type from transport_params (HTTP/2 is 'h2' there)."""
+    return 'h2' if network == 'http' else network
+
+
+def join_values(value) -> Optional[str]:
+    """Comma-joins list values (alpn, reserved, ...); scalars are returned unchanged."""
+    if isinstance(value, list):
+        return ','.join(str(item) for item in value) if value else None
+    return value
+
+
+def flag_param(value) -> Optional[str]:
+    """'1' for a true boolean option, None (omitted) otherwise."""
+    return '1' if value is True or str(value).lower() == 'true' else None
+
+
+def _userinfo(*parts) -> str:
+    return ':'.join(quote(str(part), safe='') for part in parts)
+
+
+def _b64url_nopad(text: str) -> str:
+    return base64.urlsafe_b64encode(text.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def build_vmess_uri(server: str, port, uuid: str, name=None, alter_id=0, cipher: str = 'auto', network: str = 'tcp',
+                    header_type: Optional[str] = None, host: Optional[str] = None, path: Optional[str] = None,
+                    tls: bool = False, sni: Optional[str] = None, alpn: Optional[str] = None, fingerprint: Optional[str] = None) -> str:
+    """v2rayN format: vmess://base64(JSON)."""
+    vmess_obj = {
+        "v": "2", "ps": str(name or ''), "add": server, "port": str(port), "id": uuid, "aid": str(alter_id or 0),
+        "scy": cipher or 'auto', "net": network or 'tcp', "type": header_type or 'none', "host": host or '',
+        "path": path or '', "tls": 'tls' if tls else '', "sni": sni or '', "alpn": alpn or '', "fp": fingerprint or '',
+    }
+    encoded = base64.b64encode(json.dumps(vmess_obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')).decode('ascii')
+    return f"vmess://{encoded}"
+
+
+def build_vless_uri(server: str, port, uuid: str, name=None, params: Optional[Dict[str, QueryValue]] = None) -> str:
+    query = {'encryption': 'none'}
+    query.update(params or {})
+    return f"vless://{quote(uuid, safe='')}@{format_host(server)}:{port}{build_query(query)}{build_fragment(name)}"
+
+
+def build_trojan_uri(server: str, port, password: str, name=None, params: Optional[Dict[str, QueryValue]] = None) -> str:
+    query = {'security': 'tls'}
+    query.update(params or {})
+    return f"trojan://{_userinfo(password)}@{format_host(server)}:{port}{build_query(query)}{build_fragment(name)}"
+
+
+def build_ss_uri(server: str, port, method: str, password: str, name=None, plugin: Optional[str] = None) -> str:
+    """SIP002: ss://base64url(method:password)@host:port[/?plugin=...]#name"""
+    plugin_part = f"/?plugin={quote(plugin, safe='')}" if plugin else ''
+    return f"ss://{_b64url_nopad(f'{method}:{password}')}@{format_host(server)}:{port}{plugin_part}{build_fragment(name)}"
+
+
+def build_ssr_uri(server: str, port, protocol: str, method: str, obfs: str, password: str, name=None,
+                  obfs_param: Optional[str] = None, protocol_param: Optional[str] = None) -> str:
+    """ssr://base64url(host:port:protocol:method:obfs:base64url(password)/?obfsparam=..&protoparam=..&remarks=..)"""
+    main_part = f"{server}:{port}:{protocol}:{method}:{obfs}:{_b64url_nopad(str(password))}"
+    optional_params = []
+    if obfs_param:
+        optional_params.append(f"obfsparam={_b64url_nopad(str(obfs_param))}")
+    if protocol_param:
+        optional_params.append(f"protoparam={_b64url_nopad(str(protocol_param))}")
+    if name:
+        optional_params.append(f"remarks={_b64url_nopad(str(name))}")
+    if optional_params:
+        main_part += "/?" + "&".join(optional_params)
+    return f"ssr://{_b64url_nopad(main_part)}"
+
+
+def build_hysteria2_uri(server: str, port, password: str, name=None, params: Optional[Dict[str, QueryValue]] = None) -> str:
+    return f"hy2://{_userinfo(password)}@{format_host(server)}:{port}{build_query(params or {})}{build_fragment(name)}"
+
+
+def build_hysteria_uri(server: str, port, name=None, params: Optional[Dict[str, QueryValue]] = None) -> str:
+    return f"hysteria://{format_host(server)}:{port}{build_query(params or {})}{build_fragment(name)}"
+
+
+def build_tuic_uri(server: str, port, uuid: str, password: str, name=None, params: Optional[Dict[str, QueryValue]] = None) -> str:
+    return f"tuic://{_userinfo(uuid, password)}@{format_host(server)}:{port}{build_query(params or {})}{build_fragment(name)}"
+
+
+def build_wireguard_uri(server: str, port, private_key: str, public_key: str, name=None, params: Optional[Dict[str, QueryValue]] = None) -> str:
+    query = {'publickey': public_key}
+    query.update(params or {})
+    return f"wireguard://{_userinfo(private_key)}@{format_host(server)}:{port}{build_query(query)}{build_fragment(name)}"
+
+
+def _credential_uri(scheme: str, server: str, port, username=None, password=None, name=None,
+                    params: Optional[Dict[str, QueryValue]] = None) -> str:
+    credentials = ''
+    if username not in (None, ''):
+        credentials = (_userinfo(username, password) if password not in (None, '') else _userinfo(username)) + '@'
+    return f"{scheme}://{credentials}{format_host(server)}:{port}{build_query(params or {})}{build_fragment(name)}"
+
+
+def build_socks5_uri(server: str, port, username=None, password=None, name=None) -> str:
+    return _credential_uri('socks5', server, port, username, password, name)
+
+
+def build_http_uri(server: str, port, username=None, password=None, name=None) -> str:
+    return _credential_uri('http', server, port, username, password, name)
+
+
+def build_ssh_uri(server: str, port, username=None, password=None, name=None) -> str:
+    return _credential_uri('ssh', server, port, username, password, name)
+
+
+def build_mieru_uri(server: str, port, username=None, password=None, name=None, params: Optional[Dict[str, QueryValue]] = None) -> str:
+    return _credential_uri('mieru', server, port, username, password, name, params)
+
+
+def build_anytls_uri(server: str, port, password: str, name=None, params: Optional[Dict[str, QueryValue]] = None) -> str:
+    return f"anytls://{_userinfo(password)}@{format_host(server)}:{port}{build_query(params or {})}{build_fragment(name)}"
+
+
+def build_snell_uri(server: str, port, psk: str, name=None, params: Optional[Dict[str, QueryValue]] = None) -> str:
+    query: Dict[str, QueryValue] = {'psk': psk}
+    query.update(params or {})
+    return f"snell://{format_host(server)}:{port}{build_query(query)}{build_fragment(name)}"
+
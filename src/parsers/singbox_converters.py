@@ -0,0 +1,213 @@
+from typing import Callable, Dict, Optional, Tuple
+
+from src.parsers import share_uri
+from src.utils.protocol_validators.base_validator import BaseValidator
+
+# SingBox outbound -> (protocol, canonical share URI). Same contract as clash_converters: the
+# structured fields are checked here and None is returned for an incomplete or invalid outbound.
+SingBoxConverter = Callable[[Dict], Optional[Tuple[str, str]]]
+
+# Routing/utility outbounds that never describe a proxy server
+SINGBOX_UTILITY_TYPES = frozenset({'direct', 'block', 'dns', 'selector', 'urltest', 'fallback', 'loadbalance'})
+
+
+def _block(outbound: Dict, key: str) -> Dict:
+    value = outbound.get(key)
+    return value if isinstance(value, dict) else {}
+
+
+def _endpoint(outbound: Dict) -> Optional[Tuple[str, int]]:
+    server, port = outbound.get('server'), outbound.get('server_port')
+    if not share_uri.is_valid_endpoint(server, port):
+        return None
+    return server, int(port)
+
+
+def _tls_params(outbound: Dict) -> Dict[str, share_uri.QueryValue]:
+    """security/sni/fp/pbk/sid/alpn/allowInsecure from the 'tls' block (utls and reality included)."""
+    tls = _block(outbound, 'tls')
+    if not tls.get('enabled'):
+        return {'security': 'none'}
+    reality = _block(tls, 'reality')
+    utls = _block(tls, 'utls')
+    return {
+        'security': 'reality' if reality.get('enabled') else 'tls',
+        'sni': tls.get('server_name'),
+        'fp': utls.get('fingerprint') if utls.get('enabled', True) else None,
+        'pbk': reality.get('public_key') if reality.get('enabled') else None,
+        'sid': reality.get('short_id') if reality.get('enabled') else None,
+        'alpn': share_uri.join_values(tls.get('alpn')),
+        'allowInsecure': share_uri.flag_param(tls.get('insecure')),
+    }
+
+
+def _transport_params(outbound: Dict) -> Dict[str, share_uri.QueryValue]:
+    transport = _block(outbound, 'transport')
+    headers = _block(transport, 'headers')
+    host = transport.get('host') or headers.get('Host')
+    return share_uri.transport_params(
+        transport.get('type'), host=share_uri.join_values(host), path=transport.get('path'),
+        service_name=transport.get('service_name'),
+    )
+
+
+def _is_reality(params: Dict[str, share_uri.QueryValue]) -> bool:
+    return params.get('security') == 'reality'
+
+
+def convert_vless(outbound: Dict) -> Optional[Tuple[str, str]]:
+    endpoint = _endpoint(outbound)
+    uuid = outbound.get('uuid')
+    if endpoint is None or not BaseValidator._is_valid_uuid(str(uuid)):
+        return None
+    params = _tls_params(outbound)
+    if _is_reality(params) and not params.get('pbk'):
+        return None
+    params['flow'] = outbound.get('flow')
+    params.update(_transport_params(outbound))
+    uri = share_uri.build_vless_uri(endpoint[0], endpoint[1], str(uuid), name=outbound.get('tag'), params=params)
+    return ('reality' if _is_reality(params) else 'vless'), uri
+
+
+def convert_vmess(outbound: Dict) -> Optional[Tuple[str, str]]:
+    endpoint = _endpoint(outbound)
+    uuid = outbound.get('uuid')
+    if endpoint is None or not BaseValidator._is_valid_uuid(str(uuid)):
+        return None
+    tls = _tls_params(outbound)
+    transport = _transport_params(outbound)
+    return 'vmess', share_uri.build_vmess_uri(
+        endpoint[0], endpoint[1], str(uuid), name=outbound.get('tag'), alter_id=outbound.get('alter_id', 0),
+        cipher=outbound.get('security') or 'auto', network=share_uri.vmess_network(transport['type']), host=transport['host'],
+        path=transport['path'] or transport['serviceName'], tls=tls['security'] == 'tls', sni=tls.get('sni'),
+        alpn=tls.get('alpn'), fingerprint=tls.get('fp'),
+    )
+
+
+def convert_trojan(outbound: Dict) -> Optional[Tuple[str, str]]:
+    endpoint = _endpoint(outbound)
+    password = outbound.get('password')
+    if endpoint is None or not password:
+        return None
+    params = _tls_params(outbound)
+    params.update(_transport_params(outbound))
+    return 'trojan', share_uri.build_trojan_uri(endpoint[0], endpoint[1], str(password), name=outbound.get('tag'), params=params)
+
+
+def convert_shadowsocks(outbound: Dict) -> Optional[Tuple[str, str]]:
+    endpoint = _endpoint(outbound)
+    method, password = outbound.get('method'), outbound.get('password')
+    if endpoint is None or not method or password in (None, ''):
+        return None
+    plugin = outbound.get('plugin')
+    if plugin and outbound.get('plugin_opts'):
+        plugin = f"{plugin};{outbound['plugin_opts']}"
+    return 'ss', share_uri.build_ss_uri(endpoint[0], endpoint[1], str(method), str(password), name=outbound.get('tag'), plugin=plugin)
+
+
+def convert_hysteria2(outbound: Dict) -> Optional[Tuple[str, str]]:
+    endpoint = _endpoint(outbound)
+    password = outbound.get('password')
+    if endpoint is None or not password:
+        return None
+    tls = _tls_params(outbound)
+    obfs = _block(outbound, 'obfs')
+    insecure = tls.get('allowInsecure')
+    params = {
+        'sni': tls.get('sni') or (None if insecure else endpoint[0]), 'insecure': insecure,
+        'obfs': obfs.get('type'), 'obfs-password': obfs.get('password'), 'alpn': tls.get('alpn'),
+    }
+    return 'hysteria2', share_uri.build_hysteria2_uri(endpoint[0], endpoint[1], str(password), name=outbound.get('tag'), params=params)
+
+
+def convert_hysteria(outbound: Dict) -> Optional[Tuple[str, str]]:
+    endpoint = _endpoint(outbound)
+    if endpoint is None:
+        return None
+    tls = _tls_params(outbound)
+    params = {
+        'auth': outbound.get('auth_str'), 'peer': tls.get('sni'), 'insecure': tls.get('allowInsecure'),
+        'upmbps': outbound.get('up_mbps'), 'downmbps': outbound.get('down_mbps'), 'alpn': tls.get('alpn'),
+        'obfs': outbound.get('obfs'),
+    }
+    return 'hysteria', share_uri.build_hysteria_uri(endpoint[0], endpoint[1], name=outbound.get('tag'), params=params)
+
+
+def convert_tuic(outbound: Dict) -> Optional[Tuple[str, str]]:
+    endpoint = _endpoint(outbound)
+    uuid, password = outbound.get('uuid'), outbound.get('password')
+    if endpoint is None or not BaseValidator._is_valid_uuid(str(uuid)) or not password:
+        return None
+    tls = _tls_params(outbound)
+    params = {
+        'sni': tls.get('sni'), 'congestion_control': outbound.get('congestion_control'),
+        'udp_relay_mode': outbound.get('udp_relay_mode'), 'alpn': tls.get('alpn'), 'allow_insecure': tls.get('allowInsecure'),
+    }
+    return 'tuic', share_uri.build_tuic_uri(endpoint[0], endpoint[1], str(uuid), str(password), name=outbound.get('tag'), params=params)
+
+
+def convert_wireguard(outbound: Dict) -> Optional[Tuple[str, str]]:
+    # Single-peer form (server / peer_public_key) or the first entry of 'peers'
+    peers = outbound.get('peers')
+    peer = peers[0] if isinstance(peers, list) and peers and isinstance(peers[0], dict) else {}
+    endpoint = _endpoint(outbound) or _endpoint({'server': peer.get('server'), 'server_port': peer.get('server_port')})
+    private_key = outbound.get('private_key')
+    public_key = outbound.get('peer_public_key') or peer.get('public_key')
+    if endpoint is None or not private_key or not public_key:
+        return None
+    params = {
+        'address': share_uri.join_values(outbound.get('local_address')),
+        'presharedkey': outbound.get('pre_shared_key') or peer.get('pre_shared_key'),
+        'reserved': share_uri.join_values(outbound.get('reserved') or peer.get('reserved')), 'mtu': outbound.get('mtu'),
+    }
+    return 'wireguard', share_uri.build_wireguard_uri(
+        endpoint[0], endpoint[1], str(private_key), str(public_key), name=outbound.get('tag'), params=params
+    )
+
+
+def convert_socks(outbound: Dict) -> Optional[Tuple[str, str]]:
+    endpoint = _endpoint(outbound)
+    if endpoint is None or str(outbound.get('version', '5')) != '5':
+        return None
+    return 'socks5', share_uri.build_socks5_uri(endpoint[0], endpoint[1], outbound.get('username'), outbound.get('password'), name=outbound.get('tag'))
+
+
+def convert_http(outbound: Dict) -> Optional[Tuple[str, str]]:
+    endpoint = _endpoint(outbound)
+    if endpoint is None:
+        return None
+    return 'http', share_uri.build_http_uri(endpoint[0], endpoint[1], outbound.get('username'), outbound.get('password'), name=outbound.get('tag'))
+
+
+def convert_ssh(outbound: Dict) -> Optional[Tuple[str, str]]:
+    endpoint = _endpoint(outbound)
+    if endpoint is None or not outbound.get('user'):
+        return None
+    return 'ssh', share_uri.build_ssh_uri(endpoint[0], endpoint[1], outbound.get('user'), outbound.get('password'), name=outbound.get('tag'))
+
+
+def convert_anytls(outbound: Dict) -> Optional[Tuple[str, str]]:
+    endpoint = _endpoint(outbound)
+    password = outbound.get('password')
+    if endpoint is None or not password:
+        return None
+    tls = _tls_params(outbound)
+    params = {'sni': tls.get('sni'), 'insecure': tls.get('allowInsecure'), 'fp': tls.get('fp')}
+    return 'anytls', share_uri.build_anytls_uri(endpoint[0], endpoint[1], str(password), name=outbound.get('tag'), params=params)
+
+
+# SingBox outbound 'type' -> converter
+SINGBOX_CONVERTERS: Dict[str, SingBoxConverter] = {
+    'vless': convert_vless,
+    'vmess': convert_vmess,
+    'trojan': convert_trojan,
+    'shadowsocks': convert_shadowsocks,
+    'hysteria2': convert_hysteria2,
+    'hysteria': convert_hysteria,
+    'tuic': convert_tuic,
+    'wireguard': convert_wireguard,
+    'socks': convert_socks,
+    'http': convert_http,
+    'ssh': convert_ssh,
+    'anytls': convert_anytls,
+}
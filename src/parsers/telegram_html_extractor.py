@@ -0,0 +1,206 @@
+import re
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from src.utils.settings_manager import settings
+
+# Optional C-based HTML parsers. The extractor falls back to BeautifulSoup when they are not installed.
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxHTMLParser
+except ImportError:
+    SelectolaxHTMLParser = None
+
+try:
+    import lxml.html as lxml_html
+except ImportError:
+    lxml_html = None
+
+
+MESSAGE_WRAP_CLASS = 'tgme_widget_message_wrap'
+MESSAGE_TEXT_CLASS = 'tgme_widget_message_text'
+
+
+class TelegramMessage:
+    """
+    Everything the collector needs from one t.me/s/ message wrapper, extracted in a single pass.
+    For messages at or below the caller's last-seen post ID only post_id is filled and seen is True.
+    """
+    __slots__ = ('post_id', 'date', 'text', 'code_blocks', 'hrefs', 'seen')
+
+    def __init__(self, post_id: Optional[int], date: Optional[datetime] = None, text: str = '',
+                 code_blocks: Optional[List[str]] = None, hrefs: Optional[List[str]] = None, seen: bool = False):
+        self.post_id = post_id
+        self.date = date
+        self.text = text
+        self.code_blocks = code_blocks if code_blocks is not None else []
+        self.hrefs = hrefs if hrefs is not None else []
+        self.seen = seen
+
+    def combined_text(self) -> str:
+        """Message text, code blocks and hrefs joined into the single string handed to ConfigParser."""
+        parts = [self.text] if self.text else []
+        parts.extend(self.code_blocks)
+        parts.extend(self.hrefs)
+        return "\n".join(parts).strip()
+
+
+def _parse_post_id(data_post: Optional[str]) -> Optional[int]:
+    """Parses the numeric post ID from a data-post attribute ('channel/123')."""
+    if not data_post:
+        return None
+    try:
+        return int(data_post.rsplit('/', 1)[-1])
+    except ValueError:
+        return None
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _is_seen(post_id: Optional[int], last_seen_post_id: Optional[int]) -> bool:
+    return last_seen_post_id is not None and post_id is not None and post_id <= last_seen_post_id
+
+
+class BaseTelegramHtmlExtractor(ABC):
+    """Extraction backend interface: turns a channel page into TelegramMessage records (page order)."""
+    name = 'base'
+
+    @abstractmethod
+    def extract_messages(self, html: str, last_seen_post_id: Optional[int] = None) -> List[TelegramMessage]:
+        """Messages of the page; those at or below last_seen_post_id only carry post_id and seen=True."""
+        pass
+
+
+class BeautifulSoupExtractor(BaseTelegramHtmlExtractor):
+    """
+    BeautifulSoup backend. Only message wrappers are built into the tree (SoupStrainer) and each wrapper
+    is walked once. Uses the lxml tree builder when available, html.parser otherwise.
+    """
+    name = 'beautifulsoup'
+
+    def __init__(self):
+        self.parser_name = 'lxml' if lxml_html is not None else 'html.parser'
+        # The strainer sees the raw class attribute ("tgme_widget_message_wrap js-widget_message_wrap"), so match one class token.
+        self.strainer = SoupStrainer('div', class_=re.compile(rf'(?:^|\s){MESSAGE_WRAP_CLASS}(?:\s|$)'))
+
+    def extract_messages(self, html: str, last_seen_post_id: Optional[int] = None) -> List[TelegramMessage]:
+        soup = BeautifulSoup(html, self.parser_name, parse_only=self.strainer)
+        messages: List[TelegramMessage] = []
+        for wrap in soup.find_all('div', class_=MESSAGE_WRAP_CLASS):
+            post_div = wrap.find('div', attrs={'data-post': True})
+            post_id = _parse_post_id(post_div.get('data-post') if post_div else None)
+            if _is_seen(post_id, last_seen_post_id):
+                messages.append(TelegramMessage(post_id, seen=True))
+                continue
+
+            message = TelegramMessage(post_id)
+            for element in wrap.find_all(['div', 'pre', 'code', 'a', 'time']):
+                tag_name = element.name
+                if tag_name == 'a':
+                    href = element.get('href')
+                    if href:
+                        message.hrefs.append(href)
+                elif tag_name == 'pre' or tag_name == 'code':
+                    message.code_blocks.append(element.get_text(separator='\n', strip=True))
+                elif tag_name == 'time':
+                    if message.date is None and 'time' in (element.get('class') or []):
+                        message.date = _parse_date(element.get('datetime'))
+                elif not message.text and MESSAGE_TEXT_CLASS in (element.get('class') or []):
+                    message.text = element.get_text(separator='\n', strip=True)
+            messages.append(message)
+        return messages
+
+
+class SelectolaxExtractor(BaseTelegramHtmlExtractor):
+    """selectolax (lexbor, C) backend: one CSS query per wrapper returns every node of interest in document order."""
+    name = 'selectolax'
+    NODE_SELECTOR = f'div.{MESSAGE_TEXT_CLASS}, pre, code, a[href], time.time'
+
+    def extract_messages(self, html: str, last_seen_post_id: Optional[int] = None) -> List[TelegramMessage]:
+        tree = SelectolaxHTMLParser(html)
+        messages: List[TelegramMessage] = []
+        for wrap in tree.css(f'div.{MESSAGE_WRAP_CLASS}'):
+            post_div = wrap.css_first('div[data-post]')
+            post_id = _parse_post_id(post_div.attributes.get('data-post') if post_div else None)
+            if _is_seen(post_id, last_seen_post_id):
+                messages.append(TelegramMessage(post_id, seen=True))
+                continue
+
+            message = TelegramMessage(post_id)
+            for node in wrap.css(self.NODE_SELECTOR):
+                tag_name = node.tag
+                if tag_name == 'a':
+                    message.hrefs.append(node.attributes.get('href'))
+                elif tag_name == 'pre' or tag_name == 'code':
+                    message.code_blocks.append(node.text(separator='\n', strip=True))
+                elif tag_name == 'time':
+                    if message.date is None:
+                        message.date = _parse_date(node.attributes.get('datetime'))
+                elif not message.text:
+                    message.text = node.text(separator='\n', strip=True)
+            messages.append(message)
+        return messages
+
+
+class LxmlExtractor(BaseTelegramHtmlExtractor):
+    """lxml (libxml2, C) backend using XPath to select wrappers and their relevant nodes."""
+    name = 'lxml'
+    WRAP_XPATH = f'//div[contains(concat(" ", normalize-space(@class), " "), " {MESSAGE_WRAP_CLASS} ")]'
+    NODE_XPATH = (f'.//div[contains(concat(" ", normalize-space(@class), " "), " {MESSAGE_TEXT_CLASS} ")]'
+                  ' | .//pre | .//code | .//a[@href] | .//time[contains(concat(" ", normalize-space(@class), " "), " time ")]')
+
+    @staticmethod
+    def _node_text(node) -> str:
+        # Same result as BeautifulSoup's get_text(separator='\n', strip=True)
+        return '\n'.join(part.strip() for part in node.itertext() if part.strip())
+
+    def extract_messages(self, html: str, last_seen_post_id: Optional[int] = None) -> List[TelegramMessage]:
+        if not html.strip():
+            return []
+        tree = lxml_html.fromstring(html)
+        messages: List[TelegramMessage] = []
+        for wrap in tree.xpath(self.WRAP_XPATH):
+            post_divs = wrap.xpath('.//div[@data-post]')
+            post_id = _parse_post_id(post_divs[0].get('data-post') if post_divs else None)
+            if _is_seen(post_id, last_seen_post_id):
+                messages.append(TelegramMessage(post_id, seen=True))
+                continue
+
+            message = TelegramMessage(post_id)
+            for node in wrap.xpath(self.NODE_XPATH):
+                tag_name = node.tag
+                if tag_name == 'a':
+                    message.hrefs.append(node.get('href'))
+                elif tag_name == 'pre' or tag_name == 'code':
+                    message.code_blocks.append(self._node_text(node))
+                elif tag_name == 'time':
+                    if message.date is None:
+                        message.date = _parse_date(node.get('datetime'))
+                elif not message.text:
+                    message.text = self._node_text(node)
+            messages.append(message)
+        return messages
+
+
+def get_telegram_html_extractor(backend: Optional[str] = None) -> BaseTelegramHtmlExtractor:
+    """
+    Returns the extraction backend named by settings.TELEGRAM_HTML_BACKEND ('auto', 'selectolax', 'lxml',
+    'beautifulsoup'). 'auto' picks the fastest installed parser. Unavailable backends fall back to BeautifulSoup.
+    """
+    backend = (backend or settings.TELEGRAM_HTML_BACKEND or 'auto').lower()
+    if backend in ('auto', 'selectolax') and SelectolaxHTMLParser is not None:
+        return SelectolaxExtractor()
+    if backend in ('auto', 'lxml') and lxml_html is not None:
+        return LxmlExtractor()
+    if backend not in ('auto', 'beautifulsoup'):
+        print(f"TelegramHtmlExtractor: WARNING: Backend '{backend}' is not installed. Falling back to BeautifulSoup.")
+    return BeautifulSoupExtractor()
@@ -0,0 +1,132 @@
+import binascii
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from src.utils.settings_manager import settings
+
+# Standard and URL-safe alphabets (padding is stripped before the check). Deleting them with
+# bytes.translate leaves only invalid characters, several times faster than a regex fullmatch.
+BASE64_PAYLOAD_CHARS = b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/_-'
+# Longer payloads (whole subscription bodies) are not put in the LRU cache: only the last one is
+# remembered, for the is_base64 check and decode of the same body that follow each other.
+MAX_CACHED_PAYLOAD_CHARS = 64 * 1024
+URLSAFE_TO_STANDARD = bytes.maketrans(b'-_', b'+/')
+MAX_NESTED_DEPTH = 3
+MIN_NESTED_PAYLOAD_CHARS = 16
+_MISSING = object()
+
+
+class Base64Service:
+    """
+    Single place where Base64 payloads (subscription bodies, vmess/ssr links, ss userinfo, ...) are
+    decoded. Accepts standard and URL-safe alphabets, padded or unpadded, and decodes each payload
+    once: results (failures included) are kept in an LRU cache bounded by entry count and total size,
+    so "is this Base64?" checks, decoding and protocol validation share one decode. Hits and misses
+    are counted here and read by stats_reporter for the report.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        self.max_entries: int = max_entries or settings.BASE64_CACHE_MAX_ENTRIES
+        self.max_bytes: int = max_bytes or settings.BASE64_CACHE_MAX_MB * 1024 * 1024
+        self._cache: "OrderedDict[str, Optional[bytes]]" = OrderedDict()
+        self._cached_bytes = 0
+        self._last_large_payload: Optional[str] = None
+        self._last_large_decoded: Optional[bytes] = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def decode_uncached(payload: str) -> Optional[bytes]:
+        """Decodes one payload without touching the cache. Returns None if it is not Base64."""
+        try:
+            data = payload.strip().encode('ascii')
+        except UnicodeEncodeError:
+            return None
+        data = data.rstrip(b'=')
+        if len(data) % 4 == 1 or data.translate(None, BASE64_PAYLOAD_CHARS):
+            return None
+        data = data.translate(URLSAFE_TO_STANDARD) + b'=' * (-len(data) % 4)
+        try:
+            return binascii.a2b_base64(data)
+        except binascii.Error:
+            return None
+
+    def decode(self, payload: str) -> Optional[bytes]:
+        """Decoded bytes of payload (surrounding whitespace ignored), or None if it is not Base64."""
+        if len(payload) > MAX_CACHED_PAYLOAD_CHARS:
+            if payload == self._last_large_payload:
+                self.hits += 1
+            else:
+                self.misses += 1
+                self._last_large_payload = payload
+                self._last_large_decoded = self.decode_uncached(payload)
+            return self._last_large_decoded
+
+        decoded = self._cache.get(payload, _MISSING)
+        if decoded is not _MISSING:
+            self._cache.move_to_end(payload)
+            self.hits += 1
+            return decoded
+
+        self.misses += 1
+        decoded = self.decode_uncached(payload)
+        entry_bytes = len(payload) + (len(decoded) if decoded else 0)
+        if entry_bytes <= self.max_bytes:
+            self._cache[payload] = decoded
+            self._cached_bytes += entry_bytes
+            if len(self._cache) > self.max_entries or self._cached_bytes > self.max_bytes:
+                self._evict()
+        return decoded
+
+    def _evict(self):
+        while self._cache and (len(self._cache) > self.max_entries or self._cached_bytes > self.max_bytes):
+            payload, decoded = self._cache.popitem(last=False)
+            self._cached_bytes -= len(payload) + (len(decoded) if decoded else 0)
+
+    def decode_text(self, payload: str) -> Optional[str]:
+        """Like decode, as UTF-8 text (invalid sequences dropped)."""
+        decoded = self.decode(payload)
+        return decoded.decode('utf-8', errors='ignore') if decoded is not None else None
+
+    def is_base64(self, payload: str, min_length: int = 10) -> bool:
+        """True if payload (at least min_length characters) decodes. The decoded bytes stay cached for the decode that usually follows."""
+        return len(payload.strip()) >= min_length and self.decode(payload) is not None
+
+    def decode_nested_text(self, payload: str, max_depth: int = MAX_NESTED_DEPTH) -> Tuple[Optional[str], int]:
+        """
+        Decodes payload and keeps decoding while the result is itself a Base64 blob without any link in it
+        (subscriptions wrapped more than once). Returns (innermost text, number of layers decoded).
+        """
+        decoded = self.decode_text(payload)
+        depth = 1 if decoded is not None else 0
+        while decoded is not None and depth < max_depth and '://' not in decoded:
+            inner_payload = ''.join(decoded.split())
+            if len(inner_payload) < MIN_NESTED_PAYLOAD_CHARS:
+                break
+            inner = self.decode_text(inner_payload)
+            if inner is None or not inner.strip():
+                break
+            decoded = inner
+            depth += 1
+        return decoded, depth
+
+    def decode_lines(self, content: str) -> List[str]:
+        """Decodes a body where every line is a separately encoded link. Lines that do not decode are kept as they are."""
+        lines: List[str] = []
+        for line in content.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            decoded_line = self.decode_text(line)
+            lines.append(decoded_line.strip() if decoded_line else line)
+        return lines
+
+    def clear(self):
+        self._cache.clear()
+        self._cached_bytes = 0
+        self._last_large_payload = None
+        self._last_large_decoded = None
+
+
+# Create a global instance of Base64Service
+base64_service = Base64Service()
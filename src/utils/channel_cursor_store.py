@@ -0,0 +1,114 @@
+import json
+import os
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from src.utils.settings_manager import settings
+
+
+class ChannelCursorStore:
+    """
+    Persists, per Telegram channel, the highest data-post ID already parsed (the cursor) together with
+    the links found in those posts. Later runs only parse posts newer than the cursor and re-emit the
+    cached links of older posts that are still inside the lookback window.
+    The file is rewritten atomically after every channel, so an interrupted run keeps its progress.
+    """
+
+    def __init__(self, file_path: Optional[str] = None):
+        self.file_path = file_path or settings.TELEGRAM_CURSOR_FILE
+        self._cursors: Dict[str, Dict] = {}
+        self.load()
+
+    def load(self):
+        """Loads cursors from disk. A missing or corrupt file starts from an empty state (full scan)."""
+        if not os.path.exists(self.file_path):
+            print(f"ChannelCursorStore: No cursor file at {self.file_path}. All channels will be fully scanned.")
+            return
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._cursors = data
+            print(f"ChannelCursorStore: Loaded cursors for {len(self._cursors)} channels from {self.file_path}.")
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"ChannelCursorStore: WARNING: Could not read cursor file {self.file_path}: {e}. Starting with empty cursors.")
+            self._cursors = {}
+
+    def save(self):
+        """Writes all cursors to a temp file and atomically replaces the cursor file."""
+        tmp_path = f"{self.file_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._cursors, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.file_path)
+        except OSError as e:
+            print(f"ChannelCursorStore: ERROR saving cursors to {self.file_path}: {e}")
+
+    def get_last_post_id(self, channel_username: str) -> Optional[int]:
+        """Returns the highest post ID already parsed for a channel, or None when a full scan is required."""
+        if settings.TELEGRAM_FORCE_FULL_RESCAN:
+            return None
+        entry = self._cursors.get(channel_username)
+        return entry.get('last_post_id') if entry else None
+
+    def get_cached_links(self, channel_username: str, cutoff_date: datetime) -> List[Dict]:
+        """Returns {'protocol', 'link', 'date'} dicts cached for already-seen posts that are newer than cutoff_date."""
+        if settings.TELEGRAM_FORCE_FULL_RESCAN:
+            return []
+        entry = self._cursors.get(channel_username)
+        if not entry:
+            return []
+        return [
+            {'protocol': item['protocol'], 'link': item['link'], 'date': item.get('date')}
+            for item in entry.get('links', [])
+            if self._is_after(item.get('date'), cutoff_date)
+        ]
+
+    def update_channel(self, channel_username: str, last_post_id: Optional[int], new_links: List[Dict], cutoff_date: datetime):
+        """
+        Advances a channel's cursor, merges the links found in newly parsed posts
+        ({'protocol', 'link', 'post_id', 'date'}), drops cached links older than cutoff_date and persists the store.
+        last_post_id is None when the cursor must not move (e.g. an older page failed to fetch).
+        Links without a message date are dated with the time they were stored, so they expire too.
+        """
+        entry = self._cursors.get(channel_username, {}) if not settings.TELEGRAM_FORCE_FULL_RESCAN else {}
+        previous_post_id = entry.get('last_post_id')
+        if last_post_id is None:
+            last_post_id = previous_post_id
+        elif previous_post_id is not None:
+            last_post_id = max(last_post_id, previous_post_id)
+
+        now = datetime.now(timezone.utc).isoformat()
+        stored_at = entry.get('updated_at') or now
+        cached_links = [item if item.get('date') else {**item, 'date': stored_at} for item in entry.get('links', [])]
+        cached_links = [item for item in cached_links if self._is_after(item['date'], cutoff_date)]
+        known_links = {item['link'] for item in cached_links}
+        for item in new_links:
+            if item['link'] not in known_links:
+                cached_links.append(item if item.get('date') else {**item, 'date': now})
+                known_links.add(item['link'])
+
+        self._cursors[channel_username] = {
+            'last_post_id': last_post_id,
+            'updated_at': now,
+            'links': cached_links,
+        }
+        self.save()
+
+    @staticmethod
+    def _is_after(date_str: Optional[str], cutoff_date: datetime) -> bool:
+        """Undated entries (stored before they were dated on update) are kept; dated entries must be newer than the cutoff."""
+        if not date_str:
+            return True
+        try:
+            date = datetime.fromisoformat(date_str)
+        except ValueError:
+            return False
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)
+        return date >= cutoff_date
+
+
+# Create a global instance of ChannelCursorStore
+channel_cursor_store = ChannelCursorStore()
@@ -0,0 +1,100 @@
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from src.utils.parsed_link import ParsedLink, parse_link
+
+# Query / JSON fields that carry the TLS server name, the transport path and the credential, per link format
+SNI_PARAMS = ('sni', 'peer', 'servername')
+PATH_PARAMS = ('path', 'serviceName')
+CREDENTIAL_PARAMS = ('uuid', 'password', 'publickey', 'psk')
+
+
+def endpoint_identity(protocol: str, record: ParsedLink) -> Tuple:
+    """
+    Canonical identity of the server a link points to: the same server republished with another
+    #remark, another query order or other Base64 padding gets the same identity.
+    Links without a host (warp://, wireguard with an endpoint parameter, ...) are identified by the
+    whole link without its tag.
+    """
+    if not record.host:
+        return ('link', protocol, record.link)
+    params = record.params
+    sni = next((params[name] for name in SNI_PARAMS if params.get(name)), '')
+    path = next((params[name] for name in PATH_PARAMS if params.get(name)), '')
+    return (
+        protocol,
+        record.host.lower(),
+        record.port,
+        record.credential,
+        tuple(params.get(name, '') for name in CREDENTIAL_PARAMS),
+        record.transport.lower(),
+        record.security.lower(),
+        sni.lower(),
+        path,
+        params.get('method', ''), # ss / ssr cipher
+    )
+
+
+def link_identity(link_info: Dict) -> Hashable:
+    """Identity key of a {'protocol', 'link'} dict; links that do not parse are keyed by their raw string."""
+    record = parse_link(link_info['link'])
+    if record is None:
+        return ('raw', link_info['link'])
+    return endpoint_identity(link_info['protocol'], record)
+
+
+def completeness_rank(link_info: Dict) -> int:
+    """Default rank: the copy with the most parameters set (host header, fingerprint, ALPN, ...) is kept."""
+    record = parse_link(link_info['link'])
+    return len(record.params) if record is not None else 0
+
+
+class DedupIndex:
+    """
+    Hash index of links keyed by endpoint identity. add() can be called while links stream in; for
+    each identity the best-ranked copy seen so far is kept (the first one on equal rank), in the
+    order identities were first seen.
+    """
+
+    def __init__(self, rank: Optional[Callable[[Dict], float]] = None):
+        self.rank = rank or completeness_rank
+        self._positions: Dict[Hashable, int] = {}
+        self._links: List[Dict] = []
+        self._ranks: List[Optional[float]] = [] # computed on the first duplicate of an identity
+        self.duplicates: int = 0
+
+    def add(self, link_info: Dict) -> bool:
+        """Adds a link. Returns True if its identity was not seen before."""
+        key = link_identity(link_info)
+        position = self._positions.get(key)
+        if position is None:
+            self._positions[key] = len(self._links)
+            self._links.append(link_info)
+            self._ranks.append(None)
+            return True
+
+        self.duplicates += 1
+        kept_rank = self._ranks[position]
+        if kept_rank is None:
+            kept_rank = self._ranks[position] = self.rank(self._links[position])
+        link_rank = self.rank(link_info)
+        if link_rank > kept_rank:
+            self._links[position] = link_info
+            self._ranks[position] = link_rank
+        return False
+
+    def extend(self, links: List[Dict]) -> "DedupIndex":
+        for link_info in links:
+            self.add(link_info)
+        return self
+
+    def links(self) -> List[Dict]:
+        """The kept representative of each identity."""
+        return list(self._links)
+
+    def __len__(self) -> int:
+        return len(self._links)
+
+
+def dedupe_links(links: List[Dict], rank: Optional[Callable[[Dict], float]] = None) -> List[Dict]:
+    """One representative per endpoint identity (see DedupIndex)."""
+    return DedupIndex(rank).extend(links).links()
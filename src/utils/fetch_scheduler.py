@@ -0,0 +1,161 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+from src.utils.settings_manager import settings
+from src.utils.stats_reporter import stats_reporter
+
+
+class HostTokenBucket:
+    """
+    Token bucket that limits the request rate towards a single host.
+    Tokens refill continuously at `rate` per second up to `capacity` (the allowed burst).
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = max(float(rate), 0.01)
+        self.capacity = max(int(capacity), 1)
+        self.tokens: float = float(self.capacity)
+        self.updated_at: float = time.monotonic()
+        self.paused_until: float = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated_at = now
+
+    async def acquire(self):
+        """Waits until a token is available (and any rate-limit pause is over), then consumes it."""
+        async with self._lock: # Waiters for the same host are served in FIFO order
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        """Stops handing out tokens for `seconds` (used after a 429 response) and drains the bucket."""
+        now = time.monotonic()
+        self.paused_until = max(self.paused_until, now + seconds)
+        self.tokens = 0.0
+        self.updated_at = max(self.updated_at, self.paused_until)
+
+
+class FetchScheduler:
+    """
+    Scheduling layer shared by the collectors.
+    - run() executes collection jobs from a priority queue (highest source score first)
+      with a global concurrency cap.
+    - fetch() performs a single GET through the per-host token bucket and absorbs
+      429 responses by pausing the host and retrying, instead of failing the source.
+    """
+
+    def __init__(self,
+                 name: str,
+                 max_concurrency: Optional[int] = None,
+                 per_host_rate: Optional[float] = None,
+                 per_host_burst: Optional[int] = None,
+                 max_rate_limit_retries: Optional[int] = None,
+                 rate_limit_backoff: Optional[float] = None):
+        self.name = name
+        self.max_concurrency = max(int(max_concurrency or settings.MAX_CONCURRENT_FETCHES), 1)
+        self.per_host_rate = per_host_rate or settings.PER_HOST_REQUESTS_PER_SECOND
+        self.per_host_burst = per_host_burst or settings.PER_HOST_BURST
+        self.max_rate_limit_retries = settings.MAX_RATE_LIMIT_RETRIES if max_rate_limit_retries is None else max_rate_limit_retries
+        self.rate_limit_backoff = rate_limit_backoff or settings.RATE_LIMIT_BACKOFF_SECONDS
+        self._buckets: Dict[str, HostTokenBucket] = {}
+        print(f"FetchScheduler ({self.name}): Initialized. Concurrency: {self.max_concurrency}, "
+              f"per-host rate: {self.per_host_rate}/s, burst: {self.per_host_burst}.")
+
+    def _get_bucket(self, url: str) -> HostTokenBucket:
+        host = urlparse(url).netloc.lower()
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = HostTokenBucket(self.per_host_rate, self.per_host_burst)
+            self._buckets[host] = bucket
+        return bucket
+
+    def _get_backoff_seconds(self, response: httpx.Response, attempt: int) -> float:
+        """Honours a numeric Retry-After header, otherwise backs off exponentially."""
+        retry_after = response.headers.get("Retry-After", "").strip()
+        if retry_after.isdigit():
+            return float(retry_after)
+        return self.rate_limit_backoff * (2 ** (attempt - 1))
+
+    async def fetch(self, client: httpx.AsyncClient, url: str, **kwargs) -> httpx.Response:
+        """
+        Sends a rate-limited GET request. A 429 response pauses the whole host and the request
+        is retried up to max_rate_limit_retries times; the last response is returned as-is.
+        """
+        bucket = self._get_bucket(url)
+        attempt = 0
+        while True:
+            await bucket.acquire()
+            response = await client.get(url, **kwargs)
+            if response.status_code != 429 or attempt >= self.max_rate_limit_retries:
+                return response
+            attempt += 1
+            backoff = self._get_backoff_seconds(response, attempt)
+            stats_reporter.increment_rate_limit_retries()
+            print(f"FetchScheduler ({self.name}): Rate limit hit for {url} (429). Pausing host for {backoff:.1f}s "
+                  f"before retry {attempt}/{self.max_rate_limit_retries}.")
+            bucket.pause(backoff)
+
+    @asynccontextmanager
+    async def stream(self, client: httpx.AsyncClient, url: str, **kwargs):
+        """
+        Streaming counterpart of fetch(): yields a response whose body has not been read yet
+        (use aiter_bytes()/aiter_text()). 429 responses are retried exactly like in fetch().
+        """
+        bucket = self._get_bucket(url)
+        attempt = 0
+        while True:
+            await bucket.acquire()
+            async with client.stream("GET", url, **kwargs) as response:
+                if response.status_code != 429 or attempt >= self.max_rate_limit_retries:
+                    yield response
+                    return
+                attempt += 1
+                backoff = self._get_backoff_seconds(response, attempt)
+            stats_reporter.increment_rate_limit_retries()
+            print(f"FetchScheduler ({self.name}): Rate limit hit for {url} (429). Pausing host for {backoff:.1f}s "
+                  f"before retry {attempt}/{self.max_rate_limit_retries}.")
+            bucket.pause(backoff)
+
+    async def run(self, jobs: List[Tuple[str, float, Callable[[], Awaitable[Any]]]]) -> Dict[str, Any]:
+        """
+        Runs (key, priority, job_factory) jobs with at most max_concurrency in flight.
+        Higher priority jobs are started first. Returns {key: result or raised Exception}.
+        """
+        queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        for sequence, (key, priority, job_factory) in enumerate(jobs):
+            queue.put_nowait((-priority, sequence, key, job_factory))
+
+        results: Dict[str, Any] = {}
+
+        async def worker():
+            while True:
+                try:
+                    _, _, key, job_factory = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    results[key] = await job_factory()
+                except Exception as e:
+                    results[key] = e
+
+        worker_count = min(self.max_concurrency, len(jobs))
+        print(f"FetchScheduler ({self.name}): Running {len(jobs)} jobs with {worker_count} workers.")
+        await asyncio.gather(*(worker() for _ in range(worker_count)))
+        return results
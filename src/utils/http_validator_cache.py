@@ -0,0 +1,101 @@
+import json
+import os
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from src.utils.settings_manager import settings
+from src.parsers.parse_cache import compute_parser_version
+
+
+class HttpValidatorCache:
+    """
+    On-disk cache of HTTP validators (ETag / Last-Modified) per source URL, together with the links
+    parsed from the last full response. A 304 Not Modified lets the collector reuse those links
+    without downloading or parsing the body again. Entries stored by another parser version (see
+    compute_parser_version) are ignored, so the body is downloaded and parsed again.
+    """
+
+    def __init__(self, file_path: Optional[str] = None):
+        self.file_path = file_path or settings.HTTP_VALIDATOR_CACHE_FILE
+        self.enabled: bool = settings.ENABLE_HTTP_VALIDATOR_CACHE
+        self.version = compute_parser_version()
+        self._entries: Dict[str, Dict] = {}
+        if self.enabled:
+            self.load()
+
+    def load(self):
+        if not os.path.exists(self.file_path):
+            print(f"HttpValidatorCache: No cache file at {self.file_path}. Starting with an empty cache.")
+            return
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._entries = data
+            print(f"HttpValidatorCache: Loaded validators for {len(self._entries)} URLs from {self.file_path}.")
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"HttpValidatorCache: WARNING: Could not read cache file {self.file_path}: {e}. Starting with an empty cache.")
+            self._entries = {}
+
+    def save(self):
+        """Writes the cache to a temp file and atomically replaces the cache file."""
+        if not self.enabled:
+            return
+        tmp_path = f"{self.file_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.file_path)
+            print(f"HttpValidatorCache: Saved validators for {len(self._entries)} URLs to {self.file_path}.")
+        except OSError as e:
+            print(f"HttpValidatorCache: ERROR saving cache to {self.file_path}: {e}")
+
+    def _current_entry(self, url: str) -> Optional[Dict]:
+        """The entry of a URL, unless it is missing or its links come from another parser version."""
+        entry = self._entries.get(url) if self.enabled else None
+        if not entry or entry.get('parser_version') != self.version:
+            return None
+        return entry
+
+    def get_conditional_headers(self, url: str) -> Dict[str, str]:
+        """Returns If-None-Match / If-Modified-Since headers for a URL with a cached response of this parser version."""
+        entry = self._current_entry(url)
+        if not entry:
+            return {}
+        headers: Dict[str, str] = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def get_cached_response(self, url: str) -> Optional[Dict]:
+        """Returns the cached entry ({'links', 'content_length', ...}) for a URL, if any (of this parser version)."""
+        return self._current_entry(url)
+
+    def store(self, url: str, response_headers, links: List[Dict], content_length: int, complete: bool = True):
+        """
+        Remembers the validators of a full (200) response and the links parsed from it.
+        Responses without ETag or Last-Modified cannot be revalidated and are not cached; neither are
+        bodies cut off at the size cap (complete=False), or a later 304 would reuse the partial links.
+        """
+        if not self.enabled:
+            return
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+        if not complete or (not etag and not last_modified):
+            self._entries.pop(url, None)
+            return
+        self._entries[url] = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'content_length': content_length,
+            'fetched_at': datetime.now(timezone.utc).isoformat(),
+            'parser_version': self.version,
+            'links': [{'protocol': item['protocol'], 'link': item['link']} for item in links],
+        }
+
+
+# Create a global instance of HttpValidatorCache
+http_validator_cache = HttpValidatorCache()
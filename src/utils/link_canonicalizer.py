@@ -0,0 +1,170 @@
+import base64
+import json
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional
+from urllib.parse import quote, unquote, urlsplit
+
+from src.utils.settings_manager import settings
+from src.utils.stats_reporter import stats_reporter
+from src.utils.base64_service import base64_service
+from src.utils.protocol_definitions import PROTOCOL_INFO_MAP
+
+# %XX escapes of RFC 3986 unreserved characters are decoded, every other escape is upper-cased
+PERCENT_ESCAPE_REGEX = re.compile(r'%([0-9A-Fa-f]{2})')
+UNRESERVED_CHARS = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~')
+WHITESPACE_REGEX = re.compile(r'\s+')
+# Characters escaped in the written #remark; the rest (emoji, Persian, ...) stays UTF-8, which is
+# 3-4 bytes per character instead of 9-12 when every byte is percent-encoded
+REMARK_ESCAPE_REGEX = re.compile(r'[%#\s\x00-\x1f\x7f]')
+
+# Query parameters whose value is what clients assume when the key is missing (share-link conventions)
+DEFAULT_QUERY_PARAMS: Dict[str, Dict[str, str]] = {
+    'vless': {'type': 'tcp', 'security': 'none', 'headerType': 'none'},
+    'reality': {'type': 'tcp', 'headerType': 'none'},
+    'trojan': {'type': 'tcp', 'security': 'tls', 'headerType': 'none'},
+    'hysteria2': {'insecure': '0'},
+    'tuic': {'allow_insecure': '0'},
+}
+# vmess JSON fields that may be omitted when empty; the rest are required by VmessValidator
+VMESS_OPTIONAL_FIELDS = ('host', 'path', 'tls', 'sni', 'alpn', 'fp', 'scy')
+# Schemes whose payload is Base64 (only the #remark is rewritten, except vmess whose JSON is re-encoded)
+OPAQUE_SCHEMES = ('ssr',)
+
+
+def normalize_percent_encoding(text: str) -> str:
+    """RFC 3986 normalization: decodes escaped unreserved characters and upper-cases the remaining escapes."""
+    if '%' not in text:
+        return text
+
+    def replace(match) -> str:
+        char = chr(int(match.group(1), 16))
+        return char if char in UNRESERVED_CHARS else '%' + match.group(1).upper()
+
+    return PERCENT_ESCAPE_REGEX.sub(replace, text)
+
+
+@lru_cache(maxsize=None)
+def _is_usable_remark_template(template: str) -> bool:
+    """Checks the template once: it may only use the {protocol} and {index} fields."""
+    try:
+        template.format(protocol='vless', index=1)
+        return True
+    except (KeyError, IndexError, ValueError, AttributeError) as e:
+        print(f"LinkCanonicalizer: WARNING: remark_template '{template}' is invalid ({e!r}). Keeping the original remarks.")
+        return False
+
+
+def short_remark(remark: str, protocol: str, index: int) -> str:
+    """The remark as written to output: the REMARK_TEMPLATE if one is set (and valid), otherwise cleaned and cut to MAX_REMARK_LENGTH."""
+    if settings.REMARK_TEMPLATE and _is_usable_remark_template(settings.REMARK_TEMPLATE):
+        return settings.REMARK_TEMPLATE.format(protocol=protocol, index=index)
+    remark = WHITESPACE_REGEX.sub('_', remark.strip())
+    if settings.MAX_REMARK_LENGTH and len(remark) > settings.MAX_REMARK_LENGTH:
+        remark = remark[:settings.MAX_REMARK_LENGTH]
+    return remark
+
+
+def _quote_remark(remark: str) -> str:
+    return REMARK_ESCAPE_REGEX.sub(lambda match: quote(match.group(0), safe=''), remark)
+
+
+def _canonical_query(protocol: str, query: str) -> str:
+    """
+    Drops empty, default and repeated parameters and sorts the rest by key. Keys and values keep their
+    encoding as written (only normalize_percent_encoding is applied): clients read '+' in keys and
+    passwords literally, so decoding and re-quoting them would change the link.
+    """
+    defaults = DEFAULT_QUERY_PARAMS.get(protocol, {})
+    params: Dict[str, str] = {}
+    for pair in query.split('&'):
+        raw_key, _, raw_value = pair.partition('=')
+        key = unquote(raw_key)
+        if raw_value and key not in params and defaults.get(key) != unquote(raw_value):
+            params[key] = normalize_percent_encoding(raw_key) + '=' + normalize_percent_encoding(raw_value) # duplicated keys: the first value wins, as for ParsedLink
+    return '&'.join(params[key] for key in sorted(params))
+
+
+def _canonical_url_link(protocol: str, link: str, remark: str) -> str:
+    parts = urlsplit(link)
+    netloc = parts.netloc
+    userinfo, at, host_port = netloc.rpartition('@')
+    netloc = normalize_percent_encoding(userinfo) + at + host_port.lower()
+    canonical = f"{parts.scheme.lower()}://{netloc}{normalize_percent_encoding(parts.path)}"
+    query = _canonical_query(protocol, parts.query)
+    if query:
+        canonical += '?' + query
+    if remark:
+        canonical += '#' + _quote_remark(remark)
+    return canonical
+
+
+def _canonical_vmess_link(link: str, remark: str) -> Optional[str]:
+    decoded = base64_service.decode(link[len("vmess://"):].split('#', 1)[0])
+    if decoded is None:
+        return None
+    config_data = json.loads(decoded.decode('utf-8'))
+    if not isinstance(config_data, dict):
+        return None
+    config_data = {key: value for key, value in config_data.items() if not (key in VMESS_OPTIONAL_FIELDS and value in ('', None))}
+    config_data['ps'] = remark
+    payload = json.dumps(config_data, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+    return "vmess://" + base64.b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def canonicalize_link(protocol: str, link: str, index: int = 0) -> str:
+    """
+    Rewrites link to its canonical, smallest equivalent form: normalized percent-encoding, lowercase
+    scheme and host, empty / default / repeated query parameters dropped, query keys sorted and the
+    remark shortened (see short_remark). index numbers links for REMARK_TEMPLATE.
+    Returns link unchanged if it cannot be rewritten or the rewritten form does not validate.
+    """
+    scheme = link.split('://', 1)[0].lower()
+    try:
+        if scheme == 'vmess':
+            decoded = base64_service.decode(link[len("vmess://"):].split('#', 1)[0])
+            old_remark = json.loads(decoded.decode('utf-8')).get('ps', '') if decoded is not None else ''
+            canonical = _canonical_vmess_link(link, short_remark(str(old_remark), protocol, index))
+        else:
+            main_part, _, fragment = link.partition('#')
+            remark = short_remark(unquote(fragment), protocol, index) if fragment or settings.REMARK_TEMPLATE else ''
+            if scheme in OPAQUE_SCHEMES:
+                canonical = main_part + ('#' + _quote_remark(remark) if remark else '')
+            else:
+                canonical = _canonical_url_link(protocol, main_part, remark)
+    except (ValueError, UnicodeDecodeError, AttributeError) as e:
+        print(f"LinkCanonicalizer: Could not canonicalize {protocol} link '{link[:100]}...': {e}")
+        return link
+
+    if canonical is None or canonical == link:
+        return link
+    validator_info = PROTOCOL_INFO_MAP.get('vless' if protocol == 'reality' else protocol)
+    if validator_info and not validator_info["validator"].is_valid(canonical):
+        print(f"LinkCanonicalizer: Canonical form of {protocol} link '{link[:100]}...' does not validate. Keeping the original.")
+        return link
+    return canonical
+
+
+def canonicalize_links(links: List[Dict]) -> List[Dict]:
+    """
+    Canonicalization stage run before OutputManager.save_configs: returns the links with canonical
+    'link' values (other keys are kept), drops links that became identical and records the saved
+    bytes per protocol in stats_reporter.
+    """
+    if not settings.CANONICALIZE_OUTPUT_LINKS:
+        return links
+
+    canonical_links: List[Dict] = []
+    seen_links = set()
+    protocol_indexes: Dict[str, int] = {}
+    for link_info in links:
+        protocol = link_info['protocol']
+        protocol_indexes[protocol] = protocol_indexes.get(protocol, 0) + 1
+        canonical = canonicalize_link(protocol, link_info['link'], protocol_indexes[protocol])
+        stats_reporter.record_canonicalization(protocol, len(link_info['link'].encode('utf-8')), len(canonical.encode('utf-8')))
+        if canonical in seen_links:
+            continue
+        seen_links.add(canonical)
+        canonical_links.append({**link_info, 'link': canonical})
+    print(f"LinkCanonicalizer: Canonicalized {len(links)} links ({len(links) - len(canonical_links)} became identical and were dropped).")
+    return canonical_links
@@ -0,0 +1,69 @@
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.utils.protocol_definitions import get_scheme_protocol_map
+from src.utils.protocol_validators.vless_validator import VlessValidator
+from src.utils.settings_manager import settings
+
+# Any "scheme://rest" run up to whitespace or a quote. The scheme is resolved with a dict lookup
+# instead of a 17-way alternation over every position of the text.
+SCHEME_LINK_REGEX = re.compile(r'([A-Za-z][A-Za-z0-9+.-]*)://[^\s"\']+')
+
+
+class LinkScanner:
+    """
+    Single-pass link finder: locates every scheme://... run in a text and resolves its scheme
+    (case-insensitively) to an active protocol through a precomputed map.
+    Handles the sftp:// alias of ssh and upgrades VLESS links with security=reality to 'reality'.
+    """
+
+    def __init__(self, active_protocols: Optional[Iterable[str]] = None):
+        active = set(settings.ACTIVE_PROTOCOLS if active_protocols is None else active_protocols)
+        self.reality_enabled = 'reality' in active
+        self.vless_enabled = 'vless' in active
+        # VLESS links must be found when only 'reality' is active, since Reality is a VLESS variant.
+        self.scheme_map: Dict[str, str] = get_scheme_protocol_map(active | {'vless'} if self.reality_enabled else active)
+        # Longest first, for schemes glued to preceding text (e.g. "Configvless://")
+        self._schemes_by_length = sorted(self.scheme_map, key=len, reverse=True)
+        self._unknown_schemes: Dict[str, Optional[str]] = {}
+
+    def resolve_scheme(self, scheme: str) -> Optional[Tuple[str, str]]:
+        """Returns (protocol, matched scheme) for a scheme as found in the text, or None if it is not an active protocol."""
+        scheme_lower = scheme.lower()
+        protocol = self.scheme_map.get(scheme_lower)
+        if protocol is not None:
+            return protocol, scheme_lower
+        if scheme_lower not in self._unknown_schemes:
+            self._unknown_schemes[scheme_lower] = next(
+                (known for known in self._schemes_by_length if scheme_lower.endswith(known)), None
+            )
+        known_scheme = self._unknown_schemes[scheme_lower]
+        return (self.scheme_map[known_scheme], known_scheme) if known_scheme else None
+
+    def _resolve_vless(self, link: str) -> Optional[str]:
+        if self.reality_enabled and 'reality' in link and VlessValidator.is_reality_link(link):
+            return 'reality'
+        return 'vless' if self.vless_enabled else None
+
+    def scan(self, text: str) -> List[Tuple[str, str]]:
+        """Returns (protocol, link) pairs in text order. Schemes are lowercased in the returned links."""
+        results: List[Tuple[str, str]] = []
+        for match in SCHEME_LINK_REGEX.finditer(text):
+            resolved = self.resolve_scheme(match.group(1))
+            if resolved is None:
+                continue
+            protocol, scheme = resolved
+            link = scheme + match.group(0)[match.end(1) - match.start():] # scheme + "://..."
+            if protocol == 'vless':
+                protocol = self._resolve_vless(link)
+                if protocol is None:
+                    continue
+            results.append((protocol, link))
+        return results
+
+    def contains_link(self, text: str) -> bool:
+        """Cheap check used to decide whether decoded content is worth parsing."""
+        for match in SCHEME_LINK_REGEX.finditer(text):
+            if self.resolve_scheme(match.group(1)) is not None:
+                return True
+        return False
@@ -1,8 +1,14 @@
 import os
+import json
 import base64
-from typing import List, Dict
-from collections import defaultdict
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from typing import List, Dict, Optional, Set, Tuple
 from src.utils.settings_manager import settings
+from src.utils.stats_reporter import stats_reporter
+from src.utils.subscription_writer import SubscriptionFileWriter
+from src.utils.output_sharding import jump_consistent_hash, link_shard_key, shard_count, shard_file_path, stale_shard_files
+from src.utils.structured_output import ClashYamlWriter, SingBoxJsonWriter
 
 class OutputManager:
     def __init__(self):
@@ -29,134 +35,261 @@ class OutputManager:
         """
         Saves collected unique links into the new structured output files.
         لینک‌های منحصر به فرد جمع‌آوری شده را در فایل‌های خروجی ساختاریافته جدید ذخیره می‌کند.
+        Links are sorted alphabetically once, grouped by the files they belong to (mixed and
+        protocol-specific) and written one output (or shard) at a time in every format (plaintext,
+        base64, Clash YAML and SingBox JSON, see structured_output), so only one file per format is
+        open at once. Each file is written to a temp file that replaces the previous one when its
+        writer is closed, and only if its digest differs from the one in the previous manifest
+        (see _save_manifest). On an error, files not yet closed keep their previous version.
+        With SHARD_OUTPUT every output is split into '<name>_001.txt', ... shards instead (see
+        output_sharding), listed in the shard index (see _save_shard_index). Every shard up to the
+        shard count is written, even an empty one, so no shard URL goes missing.
         """
         print(f"\nOutputManager: Saving {len(unique_links)} unique collected configs to new structure...")
 
-        mixed_links_plaintext: List[str] = [] 
-        mixed_links_base64: List[str] = []
+        if not settings.GENERATE_MIXED_PROTOCOL_FILE:
+            print("OutputManager: Mixed protocol file generation is disabled in settings.")
+        if not settings.GENERATE_PROTOCOL_SPECIFIC_FILES:
+            print("OutputManager: Protocol-specific file generation is disabled in settings.")
+        else:
+            print(f"OutputManager: Generating protocol-specific files in '{settings.FULL_PLAINTEXT_PROTOCOL_SPECIFIC_DIR}' and '{settings.FULL_BASE64_PROTOCOL_SPECIFIC_DIR}'...")
 
-        protocol_specific_links_plaintext: Dict[str, List[str]] = defaultdict(list)
-        protocol_specific_links_base64: Dict[str, List[str]] = defaultdict(list)
+        # If no specific protocols are defined for the mixed output, include all active protocols
+        mixed_protocols = settings.PROTOCOLS_FOR_MIXED_OUTPUT or settings.ACTIVE_PROTOCOLS
+        mixed_output = (settings.PLAINTEXT_MIXED_FILE, settings.BASE64_MIXED_FILE)
 
-        for link_info in unique_links:
+        def link_outputs(protocol: str) -> List[Tuple[str, str]]:
+            # (plaintext path, base64 path) of every output a link of this protocol belongs to
+            outputs = []
+            if settings.GENERATE_MIXED_PROTOCOL_FILE and protocol in mixed_protocols:
+                outputs.append(mixed_output)
+            # Only save protocol-specific files for active protocols
+            if settings.GENERATE_PROTOCOL_SPECIFIC_FILES and protocol in settings.ACTIVE_PROTOCOLS:
+                file_name = f"{protocol}_links.txt"
+                outputs.append((os.path.join(settings.FULL_PLAINTEXT_PROTOCOL_SPECIFIC_DIR, file_name),
+                                os.path.join(settings.FULL_BASE64_PROTOCOL_SPECIFIC_DIR, file_name)))
+            return outputs
+
+        entries: List[Tuple[str, str]] = []
+        for link_info in sorted(unique_links, key=lambda item: item.get('link') or ''): # Sort alphabetically for consistency
             protocol = link_info.get('protocol')
             link = link_info.get('link')
-
             if not protocol or not link:
                 print(f"OutputManager: WARNING: Received incomplete link_info: {link_info}. Skipping.")
                 continue
+            entries.append((protocol, link))
 
-            # Add to mixed output lists if enabled and protocol matches criteria
-            if settings.GENERATE_MIXED_PROTOCOL_FILE:
-                if settings.PROTOCOLS_FOR_MIXED_OUTPUT:
-                    if protocol in settings.PROTOCOLS_FOR_MIXED_OUTPUT:
-                        mixed_links_plaintext.append(link)
-                        mixed_links_base64.append(link)
-                elif protocol in settings.ACTIVE_PROTOCOLS: # If no specific protocols are defined, include all active protocols in mixed output
-                    mixed_links_plaintext.append(link)
-                    mixed_links_base64.append(link)
-
-            # Add to protocol-specific grouping if enabled
-            if settings.GENERATE_PROTOCOL_SPECIFIC_FILES:
-                if protocol in settings.ACTIVE_PROTOCOLS: # Only save for active protocols
-                    protocol_specific_links_plaintext[protocol].append(link)
-                    protocol_specific_links_base64[protocol].append(link)
-
-        # Sort all relevant link lists alphabetically for consistency
-        mixed_links_plaintext.sort()
-        mixed_links_base64.sort()
-
-        # Save mixed protocol files (if enabled)
-        if settings.GENERATE_MIXED_PROTOCOL_FILE:
-            print(f"OutputManager: Attempting to save {len(mixed_links_plaintext)} mixed plaintext links to {settings.PLAINTEXT_MIXED_FILE}")
-            self._write_plaintext_file(settings.PLAINTEXT_MIXED_FILE, mixed_links_plaintext)
-            print(f"OutputManager: Attempting to save {len(mixed_links_base64)} mixed base64 links to {settings.BASE64_MIXED_FILE}")
-            self._write_base64_encoded_file(settings.BASE64_MIXED_FILE, mixed_links_base64)
-        else:
-            print("OutputManager: Mixed protocol file generation is disabled in settings.")
+        # Sharding: number of shards per output, from the links' stable keys and plaintext sizes
+        shard_keys: List[int] = []
+        shard_counts: Dict[Tuple[str, str], int] = {}
+        if settings.SHARD_OUTPUT:
+            output_entries: Dict[Tuple[str, str], List[Tuple[int, int]]] = {}
+            for protocol, link in entries:
+                key = link_shard_key(link)
+                shard_keys.append(key)
+                size = len(link.encode('utf-8')) + 1
+                for output in link_outputs(protocol):
+                    output_entries.setdefault(output, []).append((key, size))
+            for output, output_shard_entries in output_entries.items():
+                shard_counts[output] = shard_count(output_shard_entries, settings.SHARD_MAX_LINKS, settings.SHARD_MAX_BYTES)
+                print(f"OutputManager: Splitting {self._manifest_key(output[0])} ({len(output_shard_entries)} links) into {shard_counts[output]} shards.")
 
-        # Save protocol-specific files (if enabled)
-        if settings.GENERATE_PROTOCOL_SPECIFIC_FILES:
-            self._write_protocol_specific_files_pair(protocol_specific_links_plaintext, protocol_specific_links_base64)
-        else:
-            print("OutputManager: Protocol-specific file generation is disabled in settings.")
+        # (output, shard) -> its links in order; shard is None for unsharded outputs
+        output_links: Dict[Tuple[Tuple[str, str], Optional[int]], List[str]] = {}
+        if settings.GENERATE_MIXED_PROTOCOL_FILE and not settings.SHARD_OUTPUT:
+            output_links[(mixed_output, None)] = [] # written even when empty
+        for output, output_shard_count in shard_counts.items():
+            for shard in range(output_shard_count): # empty shards too, so shard files stay numbered without gaps
+                output_links[(output, shard)] = []
+        for index, (protocol, link) in enumerate(entries):
+            for output in link_outputs(protocol):
+                shard = jump_consistent_hash(shard_keys[index], shard_counts[output]) if settings.SHARD_OUTPUT else None
+                output_links.setdefault((output, shard), []).append(link)
+
+        previous_files = self._load_manifest().get('files', {})
+        all_writers: List[SubscriptionFileWriter] = []
+
+        def previous_digest(file_path: str) -> Optional[str]:
+            return previous_files.get(self._manifest_key(file_path), {}).get('sha256')
+
+        def output_file_writers(plaintext_path: str, base64_path: str) -> List[SubscriptionFileWriter]:
+            # Writers of every format for one output; delta files are kept for the plaintext one
+            paths = self._format_paths(plaintext_path, base64_path)
+            writers = [
+                SubscriptionFileWriter(plaintext_path, previous_digest=previous_digest(plaintext_path),
+                                       delta_path_prefix=self._delta_path_prefix(plaintext_path) if settings.EMIT_DELTA_FILES else None),
+                SubscriptionFileWriter(base64_path, encode_base64=True, header=self._base64_header(),
+                                       previous_digest=previous_digest(base64_path)),
+            ]
+            if 'clash' in paths:
+                writers.append(ClashYamlWriter(paths['clash'], previous_digest=previous_digest(paths['clash'])))
+            if 'singbox' in paths:
+                writers.append(SingBoxJsonWriter(paths['singbox'], previous_digest=previous_digest(paths['singbox'])))
+            return writers
+
+        # (output, shard) -> writers, each closed (and its file replaced) before the next output is opened
+        output_writers: Dict[Tuple[Tuple[str, str], Optional[int]], List[SubscriptionFileWriter]] = {}
+        try:
+            for (output, shard), links in output_links.items():
+                paths = output if shard is None else (shard_file_path(output[0], shard), shard_file_path(output[1], shard))
+                writers = output_file_writers(*paths)
+                with ExitStack() as stack:
+                    for writer in writers:
+                        stack.enter_context(writer)
+                    for link in links:
+                        for writer in writers:
+                            writer.add(link)
+                output_writers[(output, shard)] = writers
+                all_writers.extend(writers)
+        except OSError as e:
+            print(f"OutputManager: ERROR saving configs, files not yet written kept their previous version: {e}")
+            return
+
+        changed_count = sum(1 for writer in all_writers if writer.changed)
+        print(f"OutputManager: All configs saved to new respective files ({changed_count} of {len(all_writers)} files changed).")
+        for writer in all_writers:
+            stats_reporter.record_output_file(writer.format_name, writer.link_count, getattr(writer, 'skipped_count', 0), writer.elapsed_seconds)
+        self._remove_stale_output_files({output for output, _ in output_writers}, {writer.file_path for writer in all_writers})
+        self._save_manifest(all_writers, previous_files)
+        if settings.SHARD_OUTPUT:
+            self._save_shard_index(output_writers)
+
+    def _format_paths(self, plaintext_path: str, base64_path: str) -> Dict[str, str]:
+        """Path of one output in every enabled format, keyed by format name."""
+        paths = {'plaintext': plaintext_path, 'base64': base64_path}
+        if settings.GENERATE_CLASH_FILES:
+            paths['clash'] = self._structured_output_path(settings.FULL_CLASH_OUTPUT_PATH, plaintext_path, '.yaml')
+        if settings.GENERATE_SINGBOX_FILES:
+            paths['singbox'] = self._structured_output_path(settings.FULL_SINGBOX_OUTPUT_PATH, plaintext_path, '.json')
+        return paths
+
+    def _remove_stale_output_files(self, outputs: Set[Tuple[str, str]], written_paths: Set[str]):
+        """
+        Removes files of this run's outputs that were not written in this run: shards left over from
+        a run with more shards (or from before sharding was disabled) and, with sharding enabled, the
+        unsharded file, so no client keeps fetching a list that is no longer updated.
+        """
+        for plaintext_path, base64_path in outputs:
+            for file_path in self._format_paths(plaintext_path, base64_path).values():
+                stale_paths = stale_shard_files(file_path, written_paths)
+                if settings.SHARD_OUTPUT and os.path.exists(file_path):
+                    stale_paths.append(file_path)
+                for stale_path in stale_paths:
+                    try:
+                        os.remove(stale_path)
+                        print(f"OutputManager: Removed stale output file {stale_path}")
+                    except OSError as e:
+                        print(f"OutputManager: WARNING: Could not remove stale output file {stale_path}: {e}")
+
+    def _save_shard_index(self, output_writers: Dict[Tuple[Tuple[str, str], Optional[int]], List[SubscriptionFileWriter]]):
+        """
+        Writes the shard index: for every output (keyed like the manifest, by its unsharded plaintext
+        path) the total link count and its shards in order, each with its link and plaintext byte
+        counts and its file in every format. Not rewritten when its content did not change.
+        """
+        outputs: Dict[str, Dict] = {}
+        for (output, shard), writers in sorted(output_writers.items(), key=lambda item: (item[0][0], item[0][1])):
+            output_index = outputs.setdefault(self._manifest_key(output[0]), {'links': 0, 'shards': []})
+            output_index['links'] += writers[0].link_count
+            output_index['shards'].append({
+                'shard': shard + 1,
+                'links': writers[0].link_count,
+                'bytes': writers[0].byte_count,
+                'files': {writer.format_name: self._manifest_key(writer.file_path) for writer in writers},
+            })
+        index = {'max_links': settings.SHARD_MAX_LINKS, 'max_bytes': settings.SHARD_MAX_BYTES, 'outputs': outputs}
+
+        try:
+            with open(settings.SHARD_INDEX_FILE, 'r', encoding='utf-8') as f:
+                if json.load(f) == index:
+                    print("OutputManager: Shard layout unchanged. Shard index kept as is.")
+                    return
+        except (OSError, ValueError):
+            pass
+        tmp_path = f"{settings.SHARD_INDEX_FILE}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(index, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, settings.SHARD_INDEX_FILE)
+            print(f"OutputManager: Saved shard index ({len(outputs)} outputs) to {settings.SHARD_INDEX_FILE}")
+        except OSError as e:
+            print(f"OutputManager: ERROR saving shard index to {settings.SHARD_INDEX_FILE}: {e}")
+
+    def _structured_output_path(self, format_root: str, plaintext_path: str, extension: str) -> str:
+        """Path of a Clash / SingBox file: the plaintext file's layout under format_root, with the format's extension."""
+        relative_path = os.path.relpath(plaintext_path, settings.FULL_PLAINTEXT_OUTPUT_PATH)
+        return os.path.join(format_root, os.path.splitext(relative_path)[0] + extension)
 
-        print("OutputManager: All configs saved to new respective files.")
+    def _manifest_key(self, file_path: str) -> str:
+        """Manifest entries are keyed by the path relative to the subscription directory ('/'-separated)."""
+        return os.path.relpath(file_path, settings.FULL_SUB_DIR_PATH).replace(os.sep, '/')
 
-    def _write_plaintext_file(self, file_path: str, links: List[str]):
-        """Writes a list of links to a file, each on a new line (plaintext)."""
+    def _delta_path_prefix(self, file_path: str) -> str:
+        """Delta files mirror the output layout under the delta directory: <delta dir>/<relative path without .txt>."""
+        return os.path.join(settings.FULL_DELTA_OUTPUT_PATH, os.path.splitext(os.path.relpath(file_path, settings.FULL_SUB_DIR_PATH))[0])
+
+    def _load_manifest(self) -> Dict:
+        if not os.path.exists(settings.OUTPUT_MANIFEST_FILE):
+            return {}
         try:
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                for link in links:
-                    f.write(link + '\n')
-            print(f"OutputManager: Saved {len(links)} plaintext links to {file_path}")
-        except Exception as e:
-            print(f"OutputManager: ERROR saving plaintext links to {file_path}: {e}")
-            # traceback.print_exc() # Uncomment for full traceback if needed
-
-    def _write_base64_encoded_file(self, file_path: str, links: List[str]):
+            with open(settings.OUTPUT_MANIFEST_FILE, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            return manifest if isinstance(manifest, dict) else {}
+        except (OSError, ValueError) as e:
+            print(f"OutputManager: WARNING: Could not read output manifest {settings.OUTPUT_MANIFEST_FILE}: {e}. All files will be compared by content.")
+            return {}
+
+    def _save_manifest(self, written: List[SubscriptionFileWriter], previous_files: Dict[str, Dict]):
         """
-        Encodes a list of links to base64 and writes them to a file.
-        Includes a header if enabled in settings.
+        Writes the manifest of this run's output files: digest, link and byte counts and the time
+        each file last changed (plus the added / removed counts of that change when delta files
+        are emitted), so downstream mirrors can sync only changed files. Not rewritten when no
+        file changed.
         """
+        now = datetime.now(timezone.utc).isoformat()
+        files: Dict[str, Dict] = {}
+        for writer in written:
+            key = self._manifest_key(writer.file_path)
+            entry = {
+                'sha256': writer.digest,
+                'links': writer.link_count,
+                'bytes': writer.byte_count,
+                'updated_at': now if writer.changed else previous_files.get(key, {}).get('updated_at', now),
+            }
+            if writer.added_count is not None:
+                entry['added'] = writer.added_count
+                entry['removed'] = writer.removed_count
+            elif not writer.changed and 'added' in previous_files.get(key, {}):
+                # Unchanged file: its delta files (and counts) still describe its latest change
+                entry['added'] = previous_files[key]['added']
+                entry['removed'] = previous_files[key]['removed']
+            files[key] = entry
+
+        if files == previous_files:
+            print("OutputManager: No output file changed. Manifest kept as is.")
+            return
+        tmp_path = f"{settings.OUTPUT_MANIFEST_FILE}.tmp"
         try:
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            concatenated_links = "\n".join(links)
-            encoded_bytes = base64.b64encode(concatenated_links.encode('utf-8'))
-            encoded_string = encoded_bytes.decode('utf-8')
-
-            with open(file_path, 'w', encoding='utf-8') as f:
-                if settings.OUTPUT_HEADER_BASE64_ENABLED:
-                    header_template = """//profile-title: base64:{}
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'generated_at': now, 'files': files}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, settings.OUTPUT_MANIFEST_FILE)
+            print(f"OutputManager: Saved output manifest ({len(files)} files) to {settings.OUTPUT_MANIFEST_FILE}")
+        except OSError as e:
+            print(f"OutputManager: ERROR saving output manifest to {settings.OUTPUT_MANIFEST_FILE}: {e}")
+
+    def _base64_header(self) -> Optional[str]:
+        """Header written before the encoded links of base64 files, if enabled in settings."""
+        if not settings.OUTPUT_HEADER_BASE64_ENABLED:
+            return None
+        header_template = """//profile-title: base64:{}
 //profile-update-interval: 1
 //subscription-userinfo: upload=0; download=0; total=10737418240000000; expire=2546249531
 //support-url: https://t.me/your_support_channel # Replace with your actual support channel
 //profile-web-page-url: https://github.com/your_repo # Replace with your actual repo
 """
-                    default_title = "My-Config-Subscription"
-                    encoded_title = base64.b64encode(default_title.encode('utf-8')).decode('utf-8')
-                    f.write(header_template.format(encoded_title) + "\n")
-                    print(f"OutputManager: Added Base64 header to {file_path}.")
-                else:
-                    print(f"OutputManager: Base64 header is disabled for {file_path}.")
-
-                f.write(encoded_string)
-            print(f"OutputManager: Saved {len(links)} base64 encoded links to {file_path}")
-        except Exception as e:
-            print(f"OutputManager: ERROR saving base64 encoded links to {file_path}: {e}")
-            # traceback.print_exc() # Uncomment for full traceback if needed
-
-
-    def _write_protocol_specific_files_pair(self, 
-                                             plaintext_links_by_protocol: Dict[str, List[str]], 
-                                             base64_links_by_protocol: Dict[str, List[str]]):
-        """
-        Writes separate files for each protocol in both plaintext/protocols/ and base64/protocols/.
-        """
-        print(f"OutputManager: Generating protocol-specific files in '{settings.FULL_PLAINTEXT_PROTOCOL_SPECIFIC_DIR}' and '{settings.FULL_BASE64_PROTOCOL_SPECIFIC_DIR}'...")
-
-        # Plaintext protocol-specific files
-        os.makedirs(settings.FULL_PLAINTEXT_PROTOCOL_SPECIFIC_DIR, exist_ok=True)
-        for protocol, links in plaintext_links_by_protocol.items():
-            if not links:
-                print(f"OutputManager: No plaintext links for protocol '{protocol}'. Skipping file creation for plaintext.")
-                continue
-            links.sort()
-            file_name = f"{protocol}_links.txt"
-            file_path = os.path.join(settings.FULL_PLAINTEXT_PROTOCOL_SPECIFIC_DIR, file_name)
-            self._write_plaintext_file(file_path, links)
-
-        # Base64 protocol-specific files
-        os.makedirs(settings.FULL_BASE64_PROTOCOL_SPECIFIC_DIR, exist_ok=True)
-        for protocol, links in base64_links_by_protocol.items():
-            if not links:
-                print(f"OutputManager: No base64 links for protocol '{protocol}'. Skipping file creation for base64.")
-                continue
-            links.sort()
-            file_name = f"{protocol}_links.txt"
-            file_path = os.path.join(settings.FULL_BASE64_PROTOCOL_SPECIFIC_DIR, file_name)
-            self._write_base64_encoded_file(file_path, links)
+        default_title = "My-Config-Subscription"
+        encoded_title = base64.b64encode(default_title.encode('utf-8')).decode('utf-8')
+        return header_template.format(encoded_title) + "\n"
 
 # Create a global instance of OutputManager
 output_manager = OutputManager()
\ No newline at end of file
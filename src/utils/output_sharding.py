@@ -0,0 +1,79 @@
+import hashlib
+import os
+import re
+from typing import List, Set, Tuple
+
+JUMP_HASH_MULTIPLIER = 2862933555777941757
+UINT64_MASK = 0xFFFFFFFFFFFFFFFF
+# shard_count grows to at most this many times the average-based estimate
+SHARD_GROWTH_LIMIT = 2
+
+
+def jump_consistent_hash(key: int, num_buckets: int) -> int:
+    """
+    Jump consistent hash (Lamping & Veach, 2014): maps a 64-bit key to a bucket in [0, num_buckets).
+    Growing from n to n + 1 buckets moves only ~1/(n + 1) of the keys, all into the new bucket.
+    """
+    bucket, jump = -1, 0
+    while jump < num_buckets:
+        bucket = jump
+        key = (key * JUMP_HASH_MULTIPLIER + 1) & UINT64_MASK
+        jump = int((bucket + 1) * (float(1 << 31) / float((key >> 33) + 1)))
+    return bucket
+
+
+def link_shard_key(link: str) -> int:
+    """
+    Stable 64-bit key of a link (the same in every run, unlike hash()). The '#remark' fragment is left
+    out, so a remark that changes between runs (e.g. a REMARK_TEMPLATE with {index}) does not move
+    the link to another shard.
+    """
+    return int.from_bytes(hashlib.blake2b(link.split('#', 1)[0].encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def shard_count(entries: List[Tuple[int, int]], max_links: int, max_bytes: int) -> int:
+    """
+    Number of shards for (key, size) entries, so that shards hold about max_links links and max_bytes
+    bytes at most (0 = no limit). Starts from the average-based estimate and, while jump hashing
+    leaves a shard over a limit, grows by the worst overflow ratio (at least one shard), up to
+    SHARD_GROWTH_LIMIT times the estimate: past that, a few shards stay slightly over the limit
+    rather than small outputs getting many near-empty shards. Deterministic for a given set of entries.
+    """
+    total_bytes = sum(size for _, size in entries)
+    count = max(1, -(-len(entries) // max_links) if max_links > 0 else 1, -(-total_bytes // max_bytes) if max_bytes > 0 else 1)
+    max_count = max(count, min(len(entries), count * SHARD_GROWTH_LIMIT))
+    while count < max_count:
+        shard_links = [0] * count
+        shard_bytes = [0] * count
+        for key, size in entries:
+            shard = jump_consistent_hash(key, count)
+            shard_links[shard] += 1
+            shard_bytes[shard] += size
+        overflow = 1.0
+        for links, size in zip(shard_links, shard_bytes):
+            if max_links > 0:
+                overflow = max(overflow, links / max_links)
+            if max_bytes > 0 and links > 1:
+                overflow = max(overflow, size / max_bytes)
+        if overflow <= 1.0:
+            break
+        count = min(max_count, max(count + 1, int(count * overflow)))
+    return count
+
+
+def shard_file_path(file_path: str, shard: int) -> str:
+    """'.../mixed_links.txt', 0 -> '.../mixed_links_001.txt'"""
+    stem, extension = os.path.splitext(file_path)
+    return f"{stem}_{shard + 1:03d}{extension}"
+
+
+def stale_shard_files(file_path: str, written_paths: Set[str]) -> List[str]:
+    """Shard files of file_path on disk ('<stem>_NNN<ext>') that were not written in this run."""
+    directory = os.path.dirname(file_path)
+    if not os.path.isdir(directory):
+        return []
+    stem, extension = os.path.splitext(os.path.basename(file_path))
+    shard_pattern = re.compile(re.escape(stem) + r'_\d{3}' + re.escape(extension) + '$')
+    return [os.path.join(directory, name) for name in os.listdir(directory)
+            if shard_pattern.match(name) and os.path.join(directory, name) not in written_paths]
+
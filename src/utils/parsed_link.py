@@ -0,0 +1,200 @@
+import json
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from src.utils.settings_manager import settings
+from src.utils.base64_service import base64_service
+
+# Schemes whose whole payload is Base64 instead of a URL
+VMESS_SCHEME = 'vmess'
+SSR_SCHEME = 'ssr'
+SS_SCHEME = 'ss'
+WARP_SCHEME = 'warp'
+
+
+class ParsedLink:
+    """
+    One proxy link parsed into its parts. Records come from the shared parse_link cache, so treat
+    them (params included) as read-only.
+
+    protocol:   scheme as written ('vless', 'hy2', 'sftp', ...; validators only accept lowercase ones)
+    host:       server address, IPv6 without brackets ('' if the link has none)
+    port:       server port, or None if the link has none
+    credential: UUID / password / userinfo the server authenticates with ('' if none)
+    transport:  network type ('ws', 'grpc', ...; '' if not given)
+    security:   'tls', 'reality', 'none', ... ('' if not given)
+    params:     query parameters (first value of each, blank values dropped, as parse_qs does);
+                for vmess the decoded JSON fields, for ssr / ss the decoded method fields
+    link:       the link without its #tag (vmess links keep it: see parse_link)
+    """
+
+    __slots__ = ('protocol', 'host', 'port', 'credential', 'transport', 'security', 'params', 'link')
+
+    def __init__(self, protocol: str, host: str, port: Optional[int], credential: str,
+                 transport: str, security: str, params: Dict[str, str], link: str):
+        self.protocol = protocol
+        self.host = host
+        self.port = port
+        self.credential = credential
+        self.transport = transport
+        self.security = security
+        self.params = params
+        self.link = link
+
+    def _authority(self) -> str:
+        return self.link.partition('://')[2].split('?', 1)[0].split('/', 1)[0]
+
+    def has_userinfo(self) -> bool:
+        """True if the authority has a userinfo part ('@'), even an empty one (credential is '' for both)."""
+        return '@' in self._authority()
+
+    def has_strict_authority(self) -> bool:
+        """True if urllib.parse reads host and port the same way: IPv6 hosts in brackets, a digits-only port."""
+        host_port = self._authority().rpartition('@')[2]
+        if ':' in self.host and not host_port.startswith('['):
+            return False
+        return self.port is None or host_port.rpartition(':')[2].isdigit()
+
+    def __repr__(self) -> str:
+        return f"ParsedLink({self.protocol}://{self.host}:{self.port}, transport={self.transport!r}, security={self.security!r})"
+
+
+def _parse_port(port_str: str) -> Optional[int]:
+    """Port number (int() rules, as the validators always used), or None if it is missing. Raises ValueError on a non-numeric port."""
+    if not port_str:
+        return None
+    return int(port_str)
+
+
+def _vmess_port(value) -> Optional[int]:
+    """Port of the vmess JSON: a number or a numeric string (int() rules, so 443, 443.0 and "443" are accepted)."""
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _split_host_port(host_port: str) -> Tuple[str, Optional[int]]:
+    """Splits host[:port]; IPv6 hosts may be bracketed ([::1]:443) and come back without brackets."""
+    if host_port.startswith('['):
+        host, _, rest = host_port[1:].partition(']')
+        if rest and not rest.startswith(':'):
+            raise ValueError(f"invalid address '{host_port}'")
+        return host, _parse_port(rest[1:])
+    if ':' not in host_port:
+        return host_port, None
+    host, _, port_str = host_port.rpartition(':')
+    return host, _parse_port(port_str)
+
+
+def _query_params(query: str) -> Dict[str, str]:
+    params: Dict[str, str] = {}
+    for key, value in parse_qsl(query):
+        params.setdefault(key, value)
+    return params
+
+
+def _parse_url_link(protocol: str, link: str, rest: str) -> ParsedLink:
+    """scheme://[credential@]host[:port][/path][?query] links (everything except vmess / ssr / ss)."""
+    query = ''
+    if '?' in rest:
+        rest, query = rest.split('?', 1)
+    netloc = rest.split('/', 1)[0]
+    credential, _, host_port = netloc.rpartition('@')
+    host, port = _split_host_port(host_port)
+    params = _query_params(query)
+    return ParsedLink(protocol, host, port, credential, params.get('type', ''), params.get('security', ''), params, link)
+
+
+def _parse_vmess_link(link: str, payload: str) -> Optional[ParsedLink]:
+    decoded = base64_service.decode(payload)
+    if decoded is None:
+        return None
+    config_data = json.loads(decoded.decode('utf-8'))
+    if not isinstance(config_data, dict):
+        return None
+    params = {str(key): str(value) for key, value in config_data.items()}
+    host = config_data.get('add')
+    return ParsedLink(VMESS_SCHEME, host if isinstance(host, str) else '', _vmess_port(config_data.get('port')), params.get('id', ''),
+                      params.get('net', ''), params.get('tls', ''), params, link)
+
+
+def _parse_ssr_link(link: str, payload: str) -> Optional[ParsedLink]:
+    """ssr://base64(server:port:protocol:method:obfs:base64(password)/?params)"""
+    decoded = base64_service.decode(payload.split('/?')[0])
+    if decoded is None:
+        return None
+    core, _, query = decoded.decode('utf-8').partition('/?')
+    parts = core.split(':')
+    if len(parts) < 6: # server, port, protocol, method, obfs, password
+        return None
+    params = _query_params(query)
+    params.update(protocol=parts[2], method=parts[3], obfs=parts[4])
+    return ParsedLink(SSR_SCHEME, parts[0], _parse_port(parts[1]), parts[5], '', '', params, link)
+
+
+def _parse_ss_link(link: str, payload: str) -> Optional[ParsedLink]:
+    """ss://base64(method:password@host:port), or SIP002 ss://base64url(method:password)@host:port[/?plugin=...]"""
+    decoded = base64_service.decode(payload)
+    if decoded is not None:
+        body = decoded.decode('utf-8')
+        query = ''
+    else:
+        body, _, query = payload.partition('?')
+    if '@' not in body:
+        return None
+    user_info, server_info = body.rsplit('@', 1)
+    server_info = server_info.split('/', 1)[0]
+    if ':' not in user_info:
+        user_info_bytes = base64_service.decode(user_info)
+        if user_info_bytes is None:
+            return None
+        user_info = user_info_bytes.decode('utf-8')
+    if ':' not in user_info:
+        return None
+    method, password = user_info.split(':', 1)
+    host, port = _split_host_port(server_info)
+    params = _query_params(query)
+    params['method'] = method
+    return ParsedLink(SS_SCHEME, host, port, password, '', '', params, link)
+
+
+def _parse_link_uncached(link: str) -> Optional[ParsedLink]:
+    scheme, separator, rest = link.partition('://')
+    if not separator or not scheme:
+        return None
+    protocol = scheme
+    try:
+        if protocol == VMESS_SCHEME:
+            return _parse_vmess_link(link, rest)
+        if protocol == SSR_SCHEME:
+            return _parse_ssr_link(link, rest)
+        if protocol == SS_SCHEME:
+            return _parse_ss_link(link, rest)
+        return _parse_url_link(protocol, link, rest)
+    except (ValueError, UnicodeDecodeError): # json.JSONDecodeError is a ValueError
+        if protocol == WARP_SCHEME: # warp links are only checked for their prefix, so keep them without an endpoint
+            return ParsedLink(protocol, '', None, '', '', '', {}, link)
+        return None
+
+
+_parse_link_cached = lru_cache(maxsize=settings.PARSED_LINK_CACHE_SIZE)(_parse_link_uncached)
+
+
+def parse_link(link: str) -> Optional[ParsedLink]:
+    """
+    Parses link into a ParsedLink, or None if it is malformed. The #tag is ignored, so the scanner,
+    the cleaners (which only rewrite tags) and the validators all share one parse per link.
+    vmess links carry their name inside the Base64 JSON; a #tag after it is kept in the payload and
+    makes the link fail to decode, as it always did.
+    """
+    link = link.strip()
+    if not link.startswith('vmess://'):
+        link = link.split('#', 1)[0]
+    return _parse_link_cached(link)
+
+
+def parse_link_cache_info():
+    """functools cache statistics (hits, misses, maxsize, currsize) of parse_link."""
+    return _parse_link_cached.cache_info()
@@ -1,5 +1,4 @@
-import re
-from typing import Dict, List, Type, Union
+from typing import Dict, Iterable, Type, Union
 
 from src.utils.protocol_validators.base_validator import BaseValidator
 from src.utils.protocol_validators.vmess_validator import VmessValidator
@@ -44,12 +43,10 @@ PROTOCOL_INFO_MAP: Dict[str, Dict[str, Union[str, Type[BaseValidator]]]] = {
     "anytls": {"prefix": "anytls://", "validator": AnytlsValidator},
 }
 
-ORDERED_PROTOCOLS_FOR_MATCHING: List[str] = [
-    "reality",
-    "vmess", "vless", "trojan", "ss", "ssr", "hysteria", "hysteria2",
-    "tuic", "wireguard", "ssh", "warp", "juicity", "http", "socks5",
-    "mieru", "snell", "anytls"
-]
+# Extra schemes that resolve to a protocol defined above.
+SCHEME_ALIASES: Dict[str, str] = {
+    "sftp": "ssh",
+}
 
 
 def get_active_protocol_info() -> Dict[str, Dict[str, Union[str, Type[BaseValidator]]]]:
@@ -63,49 +60,21 @@ def get_active_protocol_info() -> Dict[str, Dict[str, Union[str, Type[BaseValida
             active_info[protocol_name] = {"prefix": f"{protocol_name}://", "validator": BaseValidator}
     return active_info
 
-def get_combined_protocol_full_regex() -> re.Pattern:
+def get_scheme_protocol_map(active_protocols: Iterable[str]) -> Dict[str, str]:
     """
-    Returns a compiled RegEx pattern that can detect the *full* link of any active protocol.
-    This version focuses on robustness against common regex syntax errors in URLs
-    by using a broad character match for the URL content, ensuring the pattern itself is well-formed.
-    It primarily aims to fix "unterminated subpattern" errors.
+    Maps lowercase link schemes ("vless", "hy2", "sftp", ...) to protocol names for the given protocols.
+    'reality' has no scheme of its own; it is detected on VLESS links by LinkScanner.
     """
-    active_protocols_info = get_active_protocol_info()
-    
-    full_patterns_list = []
-    
-    # Generic URL matching part: matches any character (except newline by default) zero or more times,
-    # until a whitespace character is encountered, or the end of the string.
-    # This is safer than explicitly listing all URL characters, as it avoids missing any.
-    # It also avoids issues with regex special characters within the URL content itself.
-    url_content_pattern = r'[^\s"\']+' # Matches any non-whitespace, non-quote character. More robust for splitting.
-
-    for info in active_protocols_info.values():
-        prefix = info.get("prefix")
-        if isinstance(prefix, str):
-            # Escape the literal prefix to ensure it's matched exactly.
-            # Then, append the broad URL content pattern.
-            # The entire unit is a non-capturing group.
-            full_patterns_list.append(r"(?:" + re.escape(prefix) + url_content_pattern + r")")
-
-    # Special handling for "ssh" if it needs alternative prefixes like "sftp://".
-    # Ensure this is only added once if not already present via PROTOCOL_INFO_MAP.
-    if "ssh" in settings.ACTIVE_PROTOCOLS and "sftp://" not in [info.get("prefix") for info in active_protocols_info.values()]:
-        full_patterns_list.append(r"(?:" + re.escape("sftp://") + url_content_pattern + r")")
-    
-    # Also add specific patterns for protocols that might not start with "protocol://" but have other well-defined structures.
-    # For instance, a common pattern for "reality" might start with "reality", but not necessarily "reality://".
-    # For now, "reality" handling is left to specific heuristic in ConfigParser.
-    
-    combined_full_regex_str = '|'.join(full_patterns_list)
-    print(f"protocol_definitions: Generated combined FULL regex string: {combined_full_regex_str}")
-
-    if not combined_full_regex_str:
-        print("protocol_definitions: WARNING: No active protocols found to build combined FULL regex. Returning empty match regex.")
-        return re.compile(r'a^') # This regex will never match anything.
-
-    # Compile the final regex with UNICODE flag for potentially broad character sets and IGNORECASE for prefixes.
-    # re.DOTALL is not typically needed here as we want to capture within lines, not across them.
-    # The [^\s"\']+ prevents matching beyond the actual link if it's followed by text.
-    return re.compile(combined_full_regex_str, re.IGNORECASE | re.UNICODE)
-
+    active_protocols = set(active_protocols)
+    scheme_map: Dict[str, str] = {}
+    for protocol_name in active_protocols:
+        if protocol_name == 'reality':
+            continue
+        info = PROTOCOL_INFO_MAP.get(protocol_name)
+        prefix = info["prefix"] if info else f"{protocol_name}://"
+        if isinstance(prefix, str) and prefix.endswith("://"):
+            scheme_map[prefix[:-3].lower()] = protocol_name
+    for alias, protocol_name in SCHEME_ALIASES.items():
+        if protocol_name in active_protocols:
+            scheme_map.setdefault(alias, protocol_name)
+    return scheme_map
@@ -1,30 +1,19 @@
 from src.utils.protocol_validators.base_validator import BaseValidator
-from urllib.parse import urlparse, parse_qs, unquote, quote
+from src.utils.parsed_link import ParsedLink
+from src.utils.protocol_validators.validation_primitives import is_valid_host, is_valid_port
+from urllib.parse import unquote, quote
 
 class AnytlsValidator(BaseValidator):
     @staticmethod
-    def is_valid(link: str) -> bool:
-        if not link.startswith("anytls://"):
-            return False
-        try:
-            parsed_url = urlparse(link)
-            
-            # Anytls typically includes server:port in netloc
-            if not parsed_url.netloc: return False
-            
-            host, port_str = (parsed_url.hostname or ""), (parsed_url.port or 0)
-            if not BaseValidator._is_valid_port(port_str): return False
-            if not (BaseValidator._is_valid_domain(host) or BaseValidator._is_valid_ipv4(host) or BaseValidator._is_valid_ipv6(host)):
-                return False
-            
-            # Anytls is a generic TLS tunnel, might have parameters for SNI, ALPN etc.
-            # For simplicity, we just check for basic URL structure for now.
-            # Stricter checks like:
-            # if not 'sni' in parse_qs(parsed_url.query) or not parse_qs(parsed_url.query)['sni'][0]: return False
-            
-            return True
-        except Exception:
+    def validate_record(record: ParsedLink) -> bool:
+        if record.protocol != "anytls":
             return False
+        # Anytls is a generic TLS tunnel, might have parameters for SNI, ALPN etc.
+        # For simplicity, we just check for basic URL structure for now.
+        if not record.has_strict_authority(): return False
+        if not is_valid_port(record.port): return False
+        if not is_valid_host(record.host): return False
+        return True
 
     @staticmethod
     def clean(link: str) -> str:
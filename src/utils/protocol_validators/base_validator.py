@@ -1,8 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import Optional, Union # Ensure Union is imported and used
-import re
-import ipaddress # Used for IP address validation
-import uuid # Used for UUID validation
+from typing import Dict, List, Optional, Sequence, Union # Ensure Union is imported and used
+
+from src.utils.parsed_link import ParsedLink, parse_link
+from src.utils.protocol_validators import validation_primitives
+
 
 class BaseValidator(ABC):
     """
@@ -10,15 +11,49 @@ class BaseValidator(ABC):
     هر Validator پروتکل باید از این کلاس ارث ببرد و متدهای انتزاعی آن را پیاده‌سازی کند.
     """
 
+    @classmethod
+    def is_valid(cls, link: str) -> bool:
+        """
+        بررسی می‌کند که آیا یک لینک پروکسی معتبر است یا خیر.
+        لینک یک بار با parse_link (کش‌شده) به ParsedLink تبدیل و سپس با validate_record بررسی می‌شود.
+        
+        Args:
+            link (str): لینک پروکسی مورد نظر برای اعتبارسنجی.
+
+        Returns:
+            bool: True اگر لینک معتبر باشد، در غیر این صورت False.
+        """
+        record = parse_link(link)
+        return record is not None and bool(cls.validate_record(record))
+
+    @classmethod
+    def validate_many(cls, links: Sequence[str]) -> List[int]:
+        """
+        نسخه دسته‌ای is_valid: اندیس لینک‌های معتبر را (به ترتیب) برمی‌گرداند.
+        لینک‌های تکراری (بدون در نظر گرفتن تگ) فقط یک بار بررسی می‌شوند.
+        """
+        results: Dict[str, bool] = {}
+        valid_indices: List[int] = []
+        for index, link in enumerate(links):
+            record = parse_link(link)
+            if record is None:
+                continue
+            is_valid = results.get(record.link)
+            if is_valid is None:
+                is_valid = results[record.link] = bool(cls.validate_record(record))
+            if is_valid:
+                valid_indices.append(index)
+        return valid_indices
+
     @staticmethod
     @abstractmethod
-    def is_valid(link: str) -> bool:
+    def validate_record(record: ParsedLink) -> bool:
         """
-        بررسی می‌کند که آیا یک لینک پروکسی معتبر است یا خیر.
+        بررسی می‌کند که آیا یک لینک پارس‌شده معتبر است یا خیر.
         پیاده‌سازی این متد باید منطق اعتبارسنجی مخصوص پروتکل را در بر گیرد.
         
         Args:
-            link (str): لینک پروکسی مورد نظر برای اعتبارسنجی.
+            record (ParsedLink): لینک پارس‌شده (فقط خواندنی، از کش مشترک parse_link).
 
         Returns:
             bool: True اگر لینک معتبر باشد، در غیر این صورت False.
@@ -40,64 +75,39 @@ class BaseValidator(ABC):
         """
         pass # این متد باید توسط کلاس‌های فرزند پیاده‌سازی شود
 
-    # --- Common Helper Static Methods for Validation ---
+    # --- Common Helper Static Methods for Validation (cached, see validation_primitives) ---
 
     @staticmethod
     def _is_valid_ipv4(ip: str) -> bool:
         """بررسی می‌کند که آیا یک رشته آدرس IPv4 معتبر است."""
-        try:
-            return isinstance(ipaddress.ip_address(ip), ipaddress.IPv4Address)
-        except ValueError:
-            return False
+        return validation_primitives.is_valid_ipv4(ip)
 
     @staticmethod
     def _is_valid_ipv6(ip: str) -> bool:
         """بررسی می‌کند که آیا یک رشته آدرس IPv6 معتبر است."""
-        try:
-            return isinstance(ipaddress.ip_address(ip), ipaddress.IPv6Address)
-        except ValueError:
-            return False
+        return validation_primitives.is_valid_ipv6(ip)
 
     @staticmethod
     def _is_valid_ip_address(ip: str) -> bool:
         """بررسی می‌کند که آیا یک رشته آدرس IP (IPv4 یا IPv6) معتبر است. همچنین IPV6 محصور در [] را مدیریت می‌کند."""
-        if ip.startswith("[") and ip.endswith("]"):
-            ip = ip[1:-1] # Remove brackets for IPv6 address validation
-        try:
-            ipaddress.ip_address(ip)
-            return True
-        except ValueError:
-            return False
+        return validation_primitives.is_valid_ip_address(ip)
 
     @staticmethod
     def _is_valid_domain(hostname: str) -> bool:
         """بررسی می‌کند که آیا یک رشته نام دامنه معتبر است."""
-        if not hostname or len(hostname) > 255:
-            return False
-        if hostname.endswith("."):
-            hostname = hostname[:-1] # Remove trailing dot if present
-        
-        # Regex for valid domain labels (parts separated by dots)
-        # Each label must be 1-63 characters long, start and end with an alphanumeric character,
-        # and contain only alphanumeric characters or hyphens.
-        # This is a strict check for standard domain names.
-        domain_label_pattern = re.compile(r"^(?!-)[a-zA-Z0-9-]{1,63}(?<!-)$")
-        return all(domain_label_pattern.match(x) for x in hostname.split("."))
+        return validation_primitives.is_valid_domain(hostname)
+
+    @staticmethod
+    def _is_valid_host(host: str) -> bool:
+        """بررسی می‌کند که آیا یک رشته نام دامنه یا آدرس IP (IPv4 یا IPv6) معتبر است."""
+        return validation_primitives.is_valid_host(host)
 
     @staticmethod
     def _is_valid_port(port: Union[int, str]) -> bool:
         """بررسی می‌کند که آیا یک پورت عددی معتبر است (بین 1 تا 65535)."""
-        try:
-            port_int = int(port)
-            return 1 <= port_int <= 65535
-        except (ValueError, TypeError):
-            return False
+        return validation_primitives.is_valid_port(port)
 
     @staticmethod
     def _is_valid_uuid(value: str) -> bool:
         """بررسی می‌کند که آیا یک رشته UUID معتبر است."""
-        try:
-            uuid.UUID(str(value))
-            return True
-        except ValueError:
-            return False
\ No newline at end of file
+        return validation_primitives.is_valid_uuid(str(value))
@@ -1,25 +1,21 @@
 from src.utils.protocol_validators.base_validator import BaseValidator
-from urllib.parse import urlparse
+from src.utils.parsed_link import ParsedLink
+from src.utils.protocol_validators.validation_primitives import is_valid_host, is_valid_port
 
 class HttpValidator(BaseValidator):
     @staticmethod
-    def is_valid(link: str) -> bool:
-        if not (link.startswith("http://") or link.startswith("https://")):
+    def validate_record(record: ParsedLink) -> bool:
+        if record.protocol not in ("http", "https"):
             return False
-        try:
-            parsed_url = urlparse(link)
-            # Basic validation: must have a scheme, network location (host:port), and a valid port.
-            if not parsed_url.scheme or not parsed_url.netloc:
-                return False
-            
-            host, port_str = (parsed_url.hostname or ""), (parsed_url.port or 80)
-            if not BaseValidator._is_valid_port(port_str):
-                return False
-            if not (BaseValidator._is_valid_domain(host) or BaseValidator._is_valid_ipv4(host) or BaseValidator._is_valid_ipv6(host)):
-                return False
-            return True
-        except Exception:
+        # Basic validation: must have a network location (host[:port]) and a valid port.
+        if not record.has_strict_authority():
             return False
+        port = record.port or 80
+        if not is_valid_port(port):
+            return False
+        if not is_valid_host(record.host):
+            return False
+        return True
 
     @staticmethod
     def clean(link: str) -> str:
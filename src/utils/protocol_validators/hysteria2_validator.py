@@ -1,41 +1,25 @@
 from src.utils.protocol_validators.base_validator import BaseValidator
-from urllib.parse import urlparse, parse_qs, unquote, quote
+from src.utils.parsed_link import ParsedLink
+from src.utils.protocol_validators.validation_primitives import is_valid_host, is_valid_port
+from urllib.parse import unquote, quote
 
 class Hysteria2Validator(BaseValidator):
     @staticmethod
-    def is_valid(link: str) -> bool:
+    def validate_record(record: ParsedLink) -> bool:
         # Hysteria2 can start with 'hy2://' or 'hysteria2://'
-        if not (link.startswith("hysteria2://") or link.startswith("hy2://")):
+        if record.protocol not in ("hysteria2", "hy2"):
             return False
-        try:
-            # Normalize to 'hysteria2://' for consistent parsing
-            normalized_link = link.replace("hy2://", "hysteria2://", 1)
-            parsed_url = urlparse(normalized_link)
-            
-            password_part = parsed_url.username # Hysteria2 uses username as password
-            if not password_part: return False
+        if not record.credential: return False # Hysteria2 uses the userinfo part as password
 
-            host_port_part = parsed_url.netloc
-            if '@' in host_port_part: # If password was explicitly in netloc
-                host_port_part = host_port_part.split('@', 1)[-1] # Take the host:port part
-            
-            if ':' not in host_port_part: return False
+        if not is_valid_port(record.port): return False
+        if not is_valid_host(record.host): return False
 
-            host, port_str = host_port_part.rsplit(':', 1)
-            port = int(port_str)
+        # Hysteria2 always uses TLS, usually requires 'sni' or 'insecure=1' for self-signed
+        params = record.params
+        if not ('sni' in params or params.get('insecure', '').lower() == '1'):
+            return False # Stricter check than Hysteria v1
 
-            if not BaseValidator._is_valid_port(port): return False
-            if not (BaseValidator._is_valid_domain(host) or BaseValidator._is_valid_ipv4(host) or BaseValidator._is_valid_ipv6(host)):
-                return False
-            
-            query_params = parse_qs(parsed_url.query)
-            # Hysteria2 always uses TLS, usually requires 'sni' or 'insecure=1' for self-signed
-            if not ('sni' in query_params or ('insecure' in query_params and query_params['insecure'][0].lower() == '1')):
-                return False # Stricter check than Hysteria v1
-            
-            return True
-        except Exception:
-            return False
+        return True
 
     @staticmethod
     def clean(link: str) -> str:
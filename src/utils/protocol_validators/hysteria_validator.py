@@ -1,38 +1,21 @@
 from src.utils.protocol_validators.base_validator import BaseValidator
-from urllib.parse import urlparse, parse_qs, unquote, quote
+from src.utils.parsed_link import ParsedLink
+from src.utils.protocol_validators.validation_primitives import is_valid_host, is_valid_port
+from urllib.parse import unquote, quote
 
 class HysteriaValidator(BaseValidator):
     @staticmethod
-    def is_valid(link: str) -> bool:
-        if not link.startswith("hysteria://"):
+    def validate_record(record: ParsedLink) -> bool:
+        if record.protocol != "hysteria":
             return False
-        try:
-            parsed_url = urlparse(link)
-            host_port_part = parsed_url.netloc
-            if ':' not in host_port_part: return False
+        if record.has_userinfo(): return False # hysteria:// links carry auth in the query, not before the host
 
-            host, port_str = host_port_part.rsplit(':', 1)
-            port = int(port_str)
+        if not is_valid_port(record.port): return False
+        if not is_valid_host(record.host): return False
 
-            if not BaseValidator._is_valid_port(port): return False
-            if not (BaseValidator._is_valid_domain(host) or BaseValidator._is_valid_ipv4(host) or BaseValidator._is_valid_ipv6(host)):
-                return False
-            
-            query_params = parse_qs(parsed_url.query)
-            
-            # Hysteria typically requires TLS parameters (peer, ca, autocert, insecure)
-            if not ( 'peer' in query_params or 'ca' in query_params or 'autocert' in query_params or 
-                     ('insecure' in query_params and query_params['insecure'][0].lower() == '1') ):
-                # This check can be made stricter based on common Hysteria configs.
-                # For now, it's a basic check that *some* TLS related param exists.
-                pass # Making it permissive as in example, for broader acceptance.
-            
-            # Common parameters like 'up' (upload bandwidth), 'down' (download bandwidth), 'obfs'
-            # No strict validation for values unless specified.
-            
-            return True
-        except Exception:
-            return False
+        # Hysteria typically requires TLS parameters (peer, ca, autocert, insecure), and has common
+        # parameters like 'up', 'down', 'obfs'. Permissive for broader acceptance: no strict checks.
+        return True
 
     @staticmethod
     def clean(link: str) -> str:
@@ -1,41 +1,25 @@
 from src.utils.protocol_validators.base_validator import BaseValidator
-from urllib.parse import urlparse, parse_qs, unquote, quote
+from src.utils.parsed_link import ParsedLink
+from src.utils.protocol_validators.validation_primitives import is_valid_host, is_valid_port
+from urllib.parse import unquote, quote
 
 class JuicityValidator(BaseValidator):
     @staticmethod
-    def is_valid(link: str) -> bool:
-        if not link.startswith("juicity://"):
+    def validate_record(record: ParsedLink) -> bool:
+        if record.protocol != "juicity":
             return False
-        try:
-            parsed_url = urlparse(link)
-            
-            password_part = parsed_url.username # Juicity uses username for password
-            if not password_part: return False # Need a password
+        if not record.credential: return False # Juicity uses the userinfo part for the password
 
-            host_port_part = parsed_url.netloc
-            if '@' in host_port_part:
-                host_port_part = host_port_part.split('@', 1)[-1] # Take the host:port part
-            
-            if ':' not in host_port_part: return False
+        if not is_valid_port(record.port): return False
+        if not is_valid_host(record.host): return False
 
-            host, port_str = host_port_part.rsplit(':', 1)
-            port = int(port_str)
+        # Juicity usually requires 'security=tls' and 'sni' or 'insecure=1'
+        if record.security.lower() != 'tls':
+            return False # Juicity typically implies TLS
+        if not ('sni' in record.params or record.params.get('insecure', '').lower() == '1'):
+            return False # Requires SNI or insecure flag
 
-            if not BaseValidator._is_valid_port(port): return False
-            if not (BaseValidator._is_valid_domain(host) or BaseValidator._is_valid_ipv4(host) or BaseValidator._is_valid_ipv6(host)):
-                return False
-            
-            query_params = parse_qs(parsed_url.query)
-            # Juicity usually requires 'security=tls' and 'sni' or 'insecure=1'
-            if not ('security' in query_params and query_params['security'][0].lower() == 'tls'):
-                return False # Juicity typically implies TLS
-
-            if not ('sni' in query_params or ('insecure' in query_params and query_params['insecure'][0].lower() == '1')):
-                return False # Requires SNI or insecure flag
-            
-            return True
-        except Exception:
-            return False
+        return True
 
     @staticmethod
     def clean(link: str) -> str:
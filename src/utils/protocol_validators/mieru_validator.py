@@ -1,29 +1,19 @@
 from src.utils.protocol_validators.base_validator import BaseValidator
-from urllib.parse import urlparse, parse_qs, unquote, quote
+from src.utils.parsed_link import ParsedLink
+from src.utils.protocol_validators.validation_primitives import is_valid_host, is_valid_port
+from urllib.parse import unquote, quote
 
 class MieruValidator(BaseValidator):
     @staticmethod
-    def is_valid(link: str) -> bool:
-        if not link.startswith("mieru://"):
-            return False
-        try:
-            parsed_url = urlparse(link)
-            
-            # Mieru typically includes server:port in netloc
-            if not parsed_url.netloc: return False
-            
-            host, port_str = (parsed_url.hostname or ""), (parsed_url.port or 0)
-            if not BaseValidator._is_valid_port(port_str): return False
-            if not (BaseValidator._is_valid_domain(host) or BaseValidator._is_valid_ipv4(host) or BaseValidator._is_valid_ipv6(host)):
-                return False
-            
-            # Mieru might have specific parameters in query or fragment.
-            # For simplicity, a basic URL structure check is sufficient.
-            # More specific checks (e.g. for protocol versions, keys etc.) can be added here.
-            
-            return True
-        except Exception:
+    def validate_record(record: ParsedLink) -> bool:
+        if record.protocol != "mieru":
             return False
+        # Mieru typically includes server:port in netloc. Specific parameters (protocol versions,
+        # keys, ...) in query or fragment are not checked.
+        if not record.has_strict_authority(): return False
+        if not is_valid_port(record.port): return False
+        if not is_valid_host(record.host): return False
+        return True
 
     @staticmethod
     def clean(link: str) -> str:
@@ -1,34 +1,22 @@
 from src.utils.protocol_validators.base_validator import BaseValidator
-from urllib.parse import urlparse, parse_qs, unquote, quote
+from src.utils.parsed_link import ParsedLink
+from src.utils.protocol_validators.validation_primitives import is_valid_host, is_valid_port
+from urllib.parse import unquote, quote
 
 class SnellValidator(BaseValidator):
     @staticmethod
-    def is_valid(link: str) -> bool:
-        if not link.startswith("snell://"):
+    def validate_record(record: ParsedLink) -> bool:
+        if record.protocol != "snell":
             return False
-        try:
-            parsed_url = urlparse(link)
-            
-            # Snell links use clientid@server:port format, or just server:port
-            netloc_parts = parsed_url.netloc.split('@')
-            host_port_part = netloc_parts[-1] # Always the last part after @
+        # Snell links use clientid@server:port format, or just server:port
+        if not is_valid_port(record.port): return False
+        if not is_valid_host(record.host): return False
 
-            if ':' not in host_port_part: return False
-            
-            host, port_str = host_port_part.rsplit(':', 1)
-            
-            if not BaseValidator._is_valid_port(int(port_str)): return False
-            if not (BaseValidator._is_valid_domain(host) or BaseValidator._is_valid_ipv4(host) or BaseValidator._is_valid_ipv6(host)):
-                return False
-            
-            # Snell often has 'psk' (Pre-Shared Key) in query params.
-            query_params = parse_qs(parsed_url.query)
-            if not 'psk' in query_params or not query_params['psk'][0]:
-                return False # PSK is usually required for Snell
+        # Snell often has 'psk' (Pre-Shared Key) in query params.
+        if not record.params.get('psk'):
+            return False # PSK is usually required for Snell
 
-            return True
-        except Exception:
-            return False
+        return True
 
     @staticmethod
     def clean(link: str) -> str:
@@ -1,38 +1,21 @@
 from src.utils.protocol_validators.base_validator import BaseValidator
-from urllib.parse import urlparse, unquote, quote
+from src.utils.parsed_link import ParsedLink
+from src.utils.protocol_validators.validation_primitives import is_valid_host, is_valid_port
+from urllib.parse import unquote, quote
 
 class SshValidator(BaseValidator):
     @staticmethod
-    def is_valid(link: str) -> bool:
-        if not (link.startswith("ssh://") or link.startswith("sftp://")):
+    def validate_record(record: ParsedLink) -> bool:
+        if record.protocol not in ("ssh", "sftp"):
             return False
-        try:
-            parsed_url = urlparse(link)
-            
-            user_host_port_part = parsed_url.netloc
-            if not user_host_port_part: return False # Need at least host:port
+        if record.has_userinfo() and not record.credential: return False # Username should not be empty if provided
 
-            host_port = user_host_port_part
-            if '@' in user_host_port_part:
-                user_part, host_port = user_host_port_part.split('@', 1)
-                if not user_part: return False # Username should not be empty if provided
-            
-            host = host_port
-            port = 22 # Default SSH port
-            if ':' in host_port:
-                host, port_str = host_port.rsplit(':', 1)
-                port = int(port_str)
-                if not BaseValidator._is_valid_port(port): return False
+        port = record.port if record.port is not None else 22 # Default SSH port
+        if not is_valid_port(port): return False
+        if not is_valid_host(record.host): return False
 
-            if not (BaseValidator._is_valid_domain(host) or BaseValidator._is_valid_ipv4(host) or BaseValidator._is_valid_ipv6(host)):
-                return False
-            
-            # SSH links usually don't have complex query params for authentication, mostly password or key in URL
-            # but that's less common for actual SSH clients in URL format.
-            
-            return True
-        except Exception:
-            return False
+        # SSH links usually don't have complex query params for authentication.
+        return True
 
     @staticmethod
     def clean(link: str) -> str:
@@ -1,56 +1,35 @@
 import base64
 import re
 from src.utils.protocol_validators.base_validator import BaseValidator
-from urllib.parse import urlparse, parse_qs, unquote, quote
+from src.utils.parsed_link import ParsedLink
+from src.utils.protocol_validators.validation_primitives import is_valid_host, is_valid_port
+from src.utils.base64_service import base64_service
+from urllib.parse import unquote, quote
 
 class SsrValidator(BaseValidator):
     @staticmethod
-    def is_valid(link: str) -> bool:
-        if not link.startswith("ssr://"):
+    def validate_record(record: ParsedLink) -> bool:
+        # Decoded format: server:port:protocol:method:obfs:password_base64/?params (see parse_link)
+        if record.protocol != "ssr":
+            return False
+        if not is_valid_port(record.port):
+            return False
+        if not is_valid_host(record.host):
             return False
-        try:
-            base64_part_with_tag = link[6:]
-            base64_part = base64_part_with_tag.split('#')[0].split('/?')[0] # Remove tag and query for decoding
-
-            # Add padding and decode
-            base64_part_padded = base64_part.replace('-', '+').replace('_', '/')
-            missing_padding = len(base64_part_padded) % 4
-            if missing_padding != 0:
-                base64_part_padded += '=' * (4 - missing_padding)
-            
-            decoded_bytes = base64.b64decode(base64_part_padded, validate=True)
-            decoded_str = decoded_bytes.decode('utf-8')
-
-            # Expected format after decoding: server:port:protocol:method:obfs:password_base64/?params#tag
-            parts = decoded_str.split(':')
-            if len(parts) < 6: # server, port, protocol, method, obfs, password
-                return False
-
-            host = parts[0]
-            port = int(parts[1])
-            protocol = parts[2] # SSR Protocol
-            method = parts[3]
-            obfs = parts[4]
-            password_encoded = parts[5].split('/?')[0] # Get password part before query string
 
-            if not BaseValidator._is_valid_port(port):
-                return False
-            if not (BaseValidator._is_valid_domain(host) or BaseValidator._is_valid_ipv4(host) or BaseValidator._is_valid_ipv6(host)):
+        # Password part can be empty, but if present, should be decodable (urlsafe base64)
+        if record.credential:
+            password_bytes = base64_service.decode(record.credential)
+            if password_bytes is None:
+                return False # Invalid password base64
+            try:
+                password_bytes.decode('utf-8')
+            except UnicodeDecodeError:
                 return False
-            
-            # Password part can be empty, but if present, should be decodable (urlsafe base64)
-            if password_encoded:
-                try:
-                    base64.urlsafe_b64decode(password_encoded + '==').decode('utf-8')
-                except Exception:
-                    return False # Invalid password base64
-
-            # Query parameters are often base64 encoded for SSR (e.g. obfsparam, protparam)
-            # Full validation of these is complex but basic structure should be fine.
 
-            return True
-        except Exception:
-            return False
+        # Query parameters are often base64 encoded for SSR (e.g. obfsparam, protparam)
+        # Full validation of these is complex but basic structure should be fine.
+        return True
 
     @staticmethod
     def clean(link: str) -> str:
@@ -69,13 +48,11 @@ class SsrValidator(BaseValidator):
         # Re-encode the main base64 part to ensure proper padding and valid characters
         # This is crucial for SSR as the entire config is base64
         try:
-            # Add padding, decode, then re-encode for a clean version
-            base64_part_padded = base64_core.replace('-', '+').replace('_', '/')
-            missing_padding = len(base64_part_padded) % 4
-            if missing_padding != 0:
-                base64_part_padded += '=' * (4 - missing_padding)
-            
-            decoded_str = base64.b64decode(base64_part_padded, validate=True).decode('utf-8')
+            # Decode (cached from is_valid), then re-encode for a clean version
+            decoded_bytes = base64_service.decode(base64_core)
+            if decoded_bytes is None:
+                raise ValueError("SSR payload is not Base64")
+            decoded_str = decoded_bytes.decode('utf-8')
             re_encoded_b64 = base64.urlsafe_b64encode(decoded_str.encode('utf-8')).decode().rstrip('=')
             main_part = f"ssr://{re_encoded_b64}"
 
@@ -0,0 +1,105 @@
+import ipaddress
+import re
+import uuid
+from functools import lru_cache
+from typing import Dict, Tuple, Union
+
+from src.utils.settings_manager import settings
+
+# Valid domain label: 1-63 alphanumerics or hyphens, not starting or ending with a hyphen (compiled once)
+DOMAIN_LABEL_REGEX = re.compile(r"^(?!-)[a-zA-Z0-9-]{1,63}(?<!-)$")
+HEX_DIGITS = b'0123456789abcdefABCDEF'
+UUID_HYPHEN_POSITIONS = (8, 13, 18, 23)
+
+# Host and UUID checks are pure and repeat across a run on a much smaller set of distinct values,
+# so their results are kept in bounded LRU caches (cache_settings.validation_cache_size entries each).
+_cached = lru_cache(maxsize=settings.VALIDATION_CACHE_SIZE)
+
+
+@_cached
+def is_valid_ipv4(ip: str) -> bool:
+    """True for an IPv4 address."""
+    try:
+        return isinstance(ipaddress.ip_address(ip), ipaddress.IPv4Address)
+    except ValueError:
+        return False
+
+
+@_cached
+def is_valid_ipv6(ip: str) -> bool:
+    """True for an IPv6 address (without brackets)."""
+    try:
+        return isinstance(ipaddress.ip_address(ip), ipaddress.IPv6Address)
+    except ValueError:
+        return False
+
+
+def is_valid_ip_address(ip: str) -> bool:
+    """True for an IPv4 or IPv6 address; IPv6 may be bracketed ([::1])."""
+    if ip.startswith("[") and ip.endswith("]"):
+        ip = ip[1:-1]
+    return is_valid_ipv4(ip) or is_valid_ipv6(ip)
+
+
+@_cached
+def is_valid_domain(hostname: str) -> bool:
+    """True for a domain name made of valid labels (a trailing dot is allowed)."""
+    if not hostname or len(hostname) > 255:
+        return False
+    if hostname.endswith("."):
+        hostname = hostname[:-1]
+    return all(DOMAIN_LABEL_REGEX.match(label) for label in hostname.split("."))
+
+
+@_cached
+def is_valid_host(host: str) -> bool:
+    """True for a domain name, IPv4 or IPv6 address (IPv6 without brackets)."""
+    return is_valid_domain(host) or is_valid_ipv4(host) or is_valid_ipv6(host)
+
+
+@_cached
+def is_valid_uuid(value: str) -> bool:
+    """
+    True for a UUID. The canonical 8-4-4-4-12 form is checked on its bytes; other spellings
+    uuid.UUID accepts (no hyphens, braces, urn:uuid: prefix) fall back to uuid.UUID.
+    """
+    try:
+        data = value.encode('ascii')
+    except UnicodeEncodeError:
+        return False
+    if len(data) == 36 and all(data[position] == 0x2D for position in UUID_HYPHEN_POSITIONS): # '-'
+        hex_digits = data.replace(b'-', b'')
+        return len(hex_digits) == 32 and not hex_digits.translate(None, HEX_DIGITS)
+    try:
+        uuid.UUID(value)
+        return True
+    except ValueError:
+        return False
+
+
+def is_valid_port(port: Union[int, str, None]) -> bool:
+    """True for a port number between 1 and 65535, given as int or decimal string."""
+    if isinstance(port, int):
+        return 1 <= port <= 65535
+    if isinstance(port, str):
+        port = port.strip()
+        return 0 < len(port) <= 5 and port.isdigit() and 1 <= int(port) <= 65535
+    return False
+
+
+CACHED_PRIMITIVES = {
+    'host': is_valid_host,
+    'domain': is_valid_domain,
+    'ipv4': is_valid_ipv4,
+    'ipv6': is_valid_ipv6,
+    'uuid': is_valid_uuid,
+}
+
+
+def primitive_cache_stats() -> Dict[str, Tuple[int, int]]:
+    """(hits, misses) of each cached primitive."""
+    stats: Dict[str, Tuple[int, int]] = {}
+    for name, primitive in CACHED_PRIMITIVES.items():
+        info = primitive.cache_info()
+        stats[name] = (info.hits, info.misses)
+    return stats
@@ -1,8 +1,10 @@
 import re
 import json
 from typing import Optional, Dict
-from urllib.parse import urlparse, parse_qs, unquote
+from urllib.parse import unquote
 from src.utils.protocol_validators.base_validator import BaseValidator
+from src.utils.parsed_link import ParsedLink, parse_link
+from src.utils.protocol_validators.validation_primitives import is_valid_host, is_valid_port, is_valid_uuid
 
 class VlessValidator(BaseValidator):
     """
@@ -10,60 +12,34 @@ class VlessValidator(BaseValidator):
     """
 
     @staticmethod
-    def is_valid(link: str) -> bool:
+    def validate_record(record: ParsedLink) -> bool:
         """
         بررسی می‌کند که آیا لینک VLESS معتبر است یا خیر.
         """
-        if not link.startswith("vless://"):
+        if record.protocol != "vless":
             return False
-        try:
-            parsed_url = urlparse(link)
-
-            # Decode the userinfo part (UUID@host:port)
-            userinfo_part = parsed_url.netloc
-            if '@' not in userinfo_part:
-                return False # Expected format: UUID@host:port
-
-            uuid_str, host_port = userinfo_part.split('@', 1)
-
-            if not VlessValidator._is_valid_uuid(uuid_str):
-                return False
-
-            if ':' not in host_port:
-                return False # Expected format: host:port
-
-            host, port_str = host_port.rsplit(':', 1) # Use rsplit to handle IPv6 addresses with colons
-
-            if not VlessValidator._is_valid_port(int(port_str)):
-                return False
 
-            if not VlessValidator._is_valid_domain(host) and \
-               not VlessValidator._is_valid_ipv4(host) and \
-               not VlessValidator._is_valid_ipv6(host):
-                return False
-
-            # Check query parameters for necessary fields if needed (e.g., type=ws, security=tls, flow, reality)
-            query_params = parse_qs(parsed_url.query)
+        # Expected format: UUID@host:port
+        if not is_valid_uuid(record.credential):
+            return False
+        if not is_valid_port(record.port):
+            return False
+        if not is_valid_host(record.host):
+            return False
 
-            # Basic check for 'type' (network type like ws, grpc etc.)
-            if 'type' in query_params and query_params['type'][0] not in ['tcp', 'ws', 'grpc', 'h2', 'quic']:
-                return False
+        # Basic check for 'type' (network type like ws, grpc etc.)
+        if 'type' in record.params and record.transport not in ['tcp', 'ws', 'grpc', 'h2', 'quic']:
+            return False
 
-            # Basic check for 'security' (tls, reality)
-            if 'security' in query_params and query_params['security'][0] not in ['tls', 'reality', 'none']:
-                return False
+        # Basic check for 'security' (tls, reality)
+        if 'security' in record.params and record.security not in ['tls', 'reality', 'none']:
+            return False
 
-            # If 'security=reality', make sure 'pbk' is present (basic check, can be more thorough)
-            if query_params.get('security', [''])[0] == 'reality' and 'pbk' not in query_params:
-                # For Reality, check for some common reality parameters
-                return False # Minimal check for reality
+        # If 'security=reality', make sure 'pbk' is present (basic check, can be more thorough)
+        if record.security == 'reality' and 'pbk' not in record.params:
+            return False # Minimal check for reality
 
-            return True
-        except ValueError:
-            return False # Port conversion failed
-        except Exception as e:
-            # print(f"VLESS validation failed for {link}: {e}") # For debugging
-            return False
+        return True
 
     @staticmethod
     def clean(link: str) -> str:
@@ -81,13 +57,10 @@ class VlessValidator(BaseValidator):
     def is_reality_link(link: str) -> bool:
         """
         بررسی می‌کند که آیا یک لینک VLESS خاص یک لینک Reality است.
-        این متد توسط ConfigParser برای تشخیص "reality" فراخوانی می‌شود.
+        این متد توسط LinkScanner برای تشخیص "reality" فراخوانی می‌شود؛ پارس لینک در کش parse_link
+        می‌ماند و اعتبارسنجی بعدی از همان رکورد استفاده می‌کند.
         """
         if not link.startswith("vless://"):
             return False
-        try:
-            parsed_url = urlparse(link)
-            query_params = parse_qs(parsed_url.query)
-            return query_params.get('security', [''])[0] == 'reality'
-        except Exception:
-            return False
\ No newline at end of file
+        record = parse_link(link)
+        return record is not None and record.security == 'reality'
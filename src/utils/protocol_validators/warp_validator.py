@@ -1,33 +1,21 @@
 from src.utils.protocol_validators.base_validator import BaseValidator
-from urllib.parse import urlparse, parse_qs, unquote, quote
+from src.utils.parsed_link import ParsedLink
+from urllib.parse import unquote, quote, urlsplit
 
 class WarpValidator(BaseValidator):
     @staticmethod
-    def is_valid(link: str) -> bool:
-        if not link.startswith("warp://"):
+    def validate_record(record: ParsedLink) -> bool:
+        # Warp links are often simple, sometimes just "warp://". More complex ones might have a
+        # UUID for WARP+ or an endpoint in the netloc, and 'name', 'orgid', 'license' query
+        # parameters for Team / WARP+ configs. No strict validation needed: the prefix is enough, as
+        # long as urllib can split the link (no unbalanced '[' / ']', bracketed hosts are IPv6).
+        if record.protocol != "warp":
             return False
         try:
-            parsed_url = urlparse(link)
-            # Warp links are often simple, sometimes just "warp://".
-            # More complex ones might have a UUID for WARP+ or a specific parameter for teams.
-            
-            # If there's a netloc, it could be a UUID or an endpoint.
-            if parsed_url.netloc:
-                if not BaseValidator._is_valid_uuid(parsed_url.netloc) and \
-                   not BaseValidator._is_valid_domain(parsed_url.netloc) and \
-                   not BaseValidator._is_valid_ipv4(parsed_url.netloc) and \
-                   not BaseValidator._is_valid_ipv6(parsed_url.netloc):
-                    # It could be a simple "warp://" or something else we don't validate strictly
-                    pass 
-            
-            # Check for common query parameters like 'name', 'orgid', 'license'
-            query_params = parse_qs(parsed_url.query)
-            # If 'orgid' or 'license' is present, it usually indicates a Team Warp or WARP+ config.
-            # No strict validation needed for now, just checking existence of prefix.
-            
-            return True
-        except Exception:
+            urlsplit(record.link)
+        except ValueError:
             return False
+        return True
 
     @staticmethod
     def clean(link: str) -> str:
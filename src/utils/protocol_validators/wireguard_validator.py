@@ -1,37 +1,31 @@
 import base64
 from src.utils.protocol_validators.base_validator import BaseValidator
-from urllib.parse import urlparse, parse_qs, unquote, quote
+from src.utils.parsed_link import ParsedLink
+from src.utils.protocol_validators.validation_primitives import is_valid_host, is_valid_port
+from urllib.parse import unquote, quote
 
 class WireguardValidator(BaseValidator):
     @staticmethod
-    def is_valid(link: str) -> bool:
-        if not link.startswith("wireguard://"):
+    def validate_record(record: ParsedLink) -> bool:
+        if record.protocol != "wireguard":
             return False
-        try:
-            parsed_url = urlparse(link)
-            
-            query_params = parse_qs(parsed_url.query)
 
-            # WireGuard links MUST contain a 'publickey' parameter
-            if 'publickey' not in query_params or not query_params['publickey'][0]:
-                return False
-            
-            # Endpoint is usually host:port
-            if 'endpoint' in query_params and query_params['endpoint'][0]:
-                endpoint = query_params['endpoint'][0]
-                if ':' not in endpoint: return False
-                host, port_str = endpoint.rsplit(':', 1)
-                if not BaseValidator._is_valid_port(int(port_str)): return False
-                if not (BaseValidator._is_valid_domain(host) or BaseValidator._is_valid_ipv4(host) or BaseValidator._is_valid_ipv6(host)):
-                    return False
-            
-            # The 'netloc' part might contain a key as well, but 'publickey' in query is more standard for links.
-            # No strict validation for 'privatekey' if it's there (often not in shareable links).
-            
-            return True
-        except Exception:
+        # WireGuard links MUST contain a 'publickey' parameter
+        if not record.params.get('publickey'):
             return False
 
+        # Endpoint is usually host:port
+        endpoint = record.params.get('endpoint')
+        if endpoint:
+            if ':' not in endpoint: return False
+            host, port_str = endpoint.rsplit(':', 1)
+            if not is_valid_port(port_str): return False
+            if not is_valid_host(host): return False
+
+        # The netloc part might contain a key as well, but 'publickey' in query is more standard for links.
+        # No strict validation for 'privatekey' if it's there (often not in shareable links).
+        return True
+
     @staticmethod
     def clean(link: str) -> str:
         cleaned_link = link.strip()
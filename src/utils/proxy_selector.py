@@ -0,0 +1,103 @@
+import heapq
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.settings_manager import settings
+from src.utils.stats_reporter import stats_reporter
+from src.utils.dedup_index import completeness_rank
+
+# Keys collectors attach to link dicts for selection only; they are stripped before links are persisted
+LINK_METADATA_KEYS = ('source', 'source_type', 'date')
+# Number of link parameters at which a link counts as fully specified for the completeness criterion
+COMPLETE_PARAM_COUNT = 10
+# Score given to a criterion that cannot be computed for a link (undated web link, unknown source)
+NEUTRAL_CRITERION = 0.5
+
+
+def strip_link_metadata(links: List[Dict]) -> List[Dict]:
+    """Returns {'protocol', 'link'} dicts without the selection metadata (see LINK_METADATA_KEYS)."""
+    return [{key: value for key, value in link_info.items() if key not in LINK_METADATA_KEYS} for link_info in links]
+
+
+class LinkQualityScorer:
+    """
+    Quality score of a link: weighted sum (settings.PROXY_SELECTION_WEIGHTS) of three criteria in [0, 1]:
+    freshness (age of the Telegram post relative to the lookback window), source score (min-max
+    normalized over all sources) and completeness (number of link parameters).
+    """
+
+    def __init__(self, source_scores: Optional[Dict[str, float]] = None, now: Optional[datetime] = None):
+        self.weights = settings.PROXY_SELECTION_WEIGHTS
+        self.now = now or datetime.now(timezone.utc)
+        self.lookback_seconds = settings.TELEGRAM_MESSAGE_LOOKBACK_DURATION.total_seconds()
+        self.source_scores = source_scores or {}
+        self.min_source_score = min(self.source_scores.values(), default=0)
+        self.source_score_range = max(self.source_scores.values(), default=0) - self.min_source_score
+
+    def freshness(self, link_info: Dict) -> float:
+        date = link_info.get('date')
+        if not date or self.lookback_seconds <= 0:
+            return NEUTRAL_CRITERION
+        try:
+            posted = datetime.fromisoformat(date) if isinstance(date, str) else date
+        except ValueError:
+            return NEUTRAL_CRITERION
+        if posted.tzinfo is None:
+            posted = posted.replace(tzinfo=timezone.utc)
+        age_seconds = (self.now - posted).total_seconds()
+        return min(1.0, max(0.0, 1 - age_seconds / self.lookback_seconds))
+
+    def source_score(self, link_info: Dict) -> float:
+        score = self.source_scores.get(link_info.get('source'))
+        if score is None or self.source_score_range <= 0:
+            return NEUTRAL_CRITERION
+        return (score - self.min_source_score) / self.source_score_range
+
+    def completeness(self, link_info: Dict) -> float:
+        return min(completeness_rank(link_info), COMPLETE_PARAM_COUNT) / COMPLETE_PARAM_COUNT
+
+    def score(self, link_info: Dict) -> float:
+        return (self.weights.get('freshness', 0) * self.freshness(link_info)
+                + self.weights.get('source_score', 0) * self.source_score(link_info)
+                + self.weights.get('completeness', 0) * self.completeness(link_info))
+
+
+def select_top_links(links: List[Dict], scorer: Optional[LinkQualityScorer] = None) -> List[Dict]:
+    """
+    Applies settings.MAX_PROXIES_PER_PROTOCOL and settings.MAX_TOTAL_PROXIES (0 or a missing protocol
+    means no limit): links stream through one bounded min-heap per protocol, then the survivors through
+    one bounded heap for the total, so only the best-scoring links are kept in O(n log k) without sorting
+    the whole list. On equal score the earlier link wins. Kept links are returned in their original
+    order; drop counts are recorded in stats_reporter.
+    """
+    scorer = scorer or LinkQualityScorer()
+    protocol_heaps: Dict[str, List[Tuple[float, int, int]]] = {}
+    dropped_by_protocol_limit: Dict[str, int] = {}
+
+    for position, link_info in enumerate(links):
+        protocol = link_info['protocol']
+        limit = settings.MAX_PROXIES_PER_PROTOCOL.get(protocol, 0)
+        entry = (scorer.score(link_info), -position, position) # smallest = worst score, latest on ties
+        heap = protocol_heaps.setdefault(protocol, [])
+        if limit <= 0 or len(heap) < limit:
+            heapq.heappush(heap, entry)
+        else:
+            heapq.heappushpop(heap, entry)
+            dropped_by_protocol_limit[protocol] = dropped_by_protocol_limit.get(protocol, 0) + 1
+
+    survivors = [entry for heap in protocol_heaps.values() for entry in heap]
+    dropped_by_total_limit: Dict[str, int] = {}
+    if 0 < settings.MAX_TOTAL_PROXIES < len(survivors):
+        kept = heapq.nlargest(settings.MAX_TOTAL_PROXIES, survivors)
+        kept_positions = {entry[2] for entry in kept}
+        for entry in survivors:
+            if entry[2] not in kept_positions:
+                protocol = links[entry[2]]['protocol']
+                dropped_by_total_limit[protocol] = dropped_by_total_limit.get(protocol, 0) + 1
+        survivors = kept
+
+    selected = [links[position] for position in sorted(entry[2] for entry in survivors)]
+    stats_reporter.record_proxy_selection(scorer.weights, dropped_by_protocol_limit, dropped_by_total_limit)
+    print(f"ProxySelector: Kept {len(selected)} of {len(links)} links "
+          f"({sum(dropped_by_protocol_limit.values())} over per-protocol limits, {sum(dropped_by_total_limit.values())} over the total limit).")
+    return selected
@@ -39,8 +39,32 @@ class Settings:
         )
         max_msg_per_channel: Optional[int] = self.config_data.get('collection_settings', {}).get('telegram_max_messages_per_channel', 500)
         self.TELEGRAM_MAX_MESSAGES_PER_CHANNEL = None if max_msg_per_channel == "None" else max_msg_per_channel
+        self.TELEGRAM_PAGINATION_ENABLED: bool = self.config_data.get('collection_settings', {}).get('telegram_pagination_enabled', True)
+        self.TELEGRAM_MAX_PAGES_PER_CHANNEL: int = self.config_data.get('collection_settings', {}).get('telegram_max_pages_per_channel', 25)
+        self.TELEGRAM_HTML_BACKEND: str = self.config_data.get('collection_settings', {}).get('telegram_html_backend', 'auto')
+        self.TELEGRAM_FORCE_FULL_RESCAN: bool = self.config_data.get('collection_settings', {}).get('telegram_force_full_rescan', False)
 
         self.COLLECTION_TIMEOUT_SECONDS = self.config_data.get('collection_settings', {}).get('collection_timeout_seconds', 15)
+        self.ENABLE_STREAMING_DOWNLOAD: bool = self.config_data.get('collection_settings', {}).get('enable_streaming_download', True)
+        # Web source bodies larger than this are cut off; links parsed before the cap are kept.
+        self.MAX_SUBSCRIPTION_BODY_BYTES: int = int(self.config_data.get('collection_settings', {}).get('max_subscription_body_mb', 20) * 1024 * 1024)
+
+        # Fetch Scheduler Settings (global concurrency cap and per-host token bucket)
+        self.MAX_CONCURRENT_FETCHES: int = self.config_data.get('fetch_scheduler', {}).get('max_concurrent_fetches', 8)
+        self.PER_HOST_REQUESTS_PER_SECOND: float = self.config_data.get('fetch_scheduler', {}).get('per_host_requests_per_second', 2.0)
+        self.PER_HOST_BURST: int = self.config_data.get('fetch_scheduler', {}).get('per_host_burst', 4)
+        self.MAX_RATE_LIMIT_RETRIES: int = self.config_data.get('fetch_scheduler', {}).get('max_rate_limit_retries', 3)
+        self.RATE_LIMIT_BACKOFF_SECONDS: float = self.config_data.get('fetch_scheduler', {}).get('rate_limit_backoff_seconds', 10)
+
+        # Cache Settings
+        self.ENABLE_HTTP_VALIDATOR_CACHE: bool = self.config_data.get('cache_settings', {}).get('enable_http_validator_cache', True)
+        self.ENABLE_PARSE_CACHE: bool = self.config_data.get('cache_settings', {}).get('enable_parse_cache', True)
+        self.PARSE_CACHE_MAX_ENTRIES: int = self.config_data.get('cache_settings', {}).get('parse_cache_max_entries', 20000)
+        self.PERSIST_PARSE_CACHE: bool = self.config_data.get('cache_settings', {}).get('persist_parse_cache', False)
+        self.BASE64_CACHE_MAX_ENTRIES: int = self.config_data.get('cache_settings', {}).get('base64_cache_max_entries', 50000)
+        self.BASE64_CACHE_MAX_MB: int = self.config_data.get('cache_settings', {}).get('base64_cache_max_mb', 64)
+        self.PARSED_LINK_CACHE_SIZE: int = self.config_data.get('cache_settings', {}).get('parsed_link_cache_size', 100000)
+        self.VALIDATION_CACHE_SIZE: int = self.config_data.get('cache_settings', {}).get('validation_cache_size', 65536)
 
 
         # Parser Settings
@@ -49,6 +73,12 @@ class Settings:
         self.ENABLE_SINGBOX_PARSER: bool = self.config_data.get('parser_settings', {}).get('enable_singbox_parser', True)
         self.ENABLE_JSON_PARSER: bool = self.config_data.get('parser_settings', {}).get('enable_json_parser', True)
         self.IGNORE_UNPARSEABLE_CONTENT: bool = self.config_data.get('parser_settings', {}).get('ignore_unparseable_content', False)
+        # Clash configs larger than this are parsed event by event (one proxy in memory at a time) instead of yaml.safe_load.
+        self.CLASH_STREAMING_THRESHOLD_KB: int = self.config_data.get('parser_settings', {}).get('clash_streaming_threshold_kb', 512)
+        # JSON / SingBox bodies larger than this are walked incrementally instead of being loaded as a whole document.
+        self.JSON_STREAMING_THRESHOLD_KB: int = self.config_data.get('parser_settings', {}).get('json_streaming_threshold_kb', 1024)
+        # Phrases cut (with anything after them) from the end of link candidates. None = built-in list in text_cleaner.
+        self.TRAILING_JUNK_PHRASES: Optional[List[str]] = self.config_data.get('parser_settings', {}).get('trailing_junk_phrases')
 
 
         # Discovery Settings
@@ -71,6 +101,25 @@ class Settings:
         # Proxy Limits
         self.MAX_TOTAL_PROXIES: int = self.config_data.get('proxy_limits', {}).get('max_total_proxies', 1000)
         self.MAX_PROXIES_PER_PROTOCOL: Dict[str, int] = self.config_data.get('proxy_limits', {}).get('max_proxies_per_protocol', {})
+        # Weights of the quality score used to pick the links kept under these limits (freshness, source score, completeness)
+        self.PROXY_SELECTION_WEIGHTS: Dict[str, float] = self.config_data.get('proxy_limits', {}).get(
+            'selection_weights', {'freshness': 0.5, 'source_score': 0.3, 'completeness': 0.2}
+        )
+
+        # Output Link Canonicalization (applied before OutputManager.save_configs)
+        self.CANONICALIZE_OUTPUT_LINKS: bool = self.config_data.get('output_settings', {}).get('canonicalize_links', True)
+        self.REMARK_TEMPLATE: Optional[str] = self.config_data.get('output_settings', {}).get('remark_template', None) # e.g. "{protocol}-{index}"
+        self.MAX_REMARK_LENGTH: int = self.config_data.get('output_settings', {}).get('max_remark_length', 64)
+        # Write added / removed delta files next to the subscription files (see OutputManager)
+        self.EMIT_DELTA_FILES: bool = self.config_data.get('output_settings', {}).get('emit_delta_files', False)
+        # Native client formats written next to the URI lists (see structured_output)
+        self.GENERATE_CLASH_FILES: bool = self.config_data.get('output_settings', {}).get('generate_clash_files', True)
+        self.GENERATE_SINGBOX_FILES: bool = self.config_data.get('output_settings', {}).get('generate_singbox_files', True)
+        # Split every output into '<name>_001.txt', ... of at most N links / N plaintext bytes (0 = no limit),
+        # links assigned to shards by a stable hash (see output_sharding)
+        self.SHARD_OUTPUT: bool = self.config_data.get('output_settings', {}).get('shard_output', False)
+        self.SHARD_MAX_LINKS: int = self.config_data.get('output_settings', {}).get('shard_max_links', 500)
+        self.SHARD_MAX_BYTES: int = self.config_data.get('output_settings', {}).get('shard_max_bytes', 0)
 
         # File Paths
         # Use self.PROJECT_ROOT which is already defined in __init__
@@ -87,6 +136,9 @@ class Settings:
         self.DISCOVERED_WEBSITES_FILE: str = os.path.join(self.PROJECT_ROOT, self.SOURCES_DIR_NAME, self.config_data.get('file_paths', {}).get('discovered_websites_file', 'discovered_websites.txt'))
         self.TIMEOUT_TELEGRAM_CHANNELS_FILE: str = os.path.join(self.PROJECT_ROOT, self.OUTPUT_DIR_NAME, self.config_data.get('file_paths', {}).get('timeout_telegram_channels_file', 'timeout_telegram_channels.json'))
         self.TIMEOUT_WEBSITES_FILE: str = os.path.join(self.PROJECT_ROOT, self.OUTPUT_DIR_NAME, self.config_data.get('file_paths', {}).get('timeout_websites_file', 'timeout_websites.json'))
+        self.HTTP_VALIDATOR_CACHE_FILE: str = os.path.join(self.PROJECT_ROOT, self.OUTPUT_DIR_NAME, self.config_data.get('file_paths', {}).get('http_validator_cache_file', 'http_validator_cache.json'))
+        self.PARSE_CACHE_FILE: str = os.path.join(self.PROJECT_ROOT, self.OUTPUT_DIR_NAME, self.config_data.get('file_paths', {}).get('parse_cache_file', 'parse_cache.json'))
+        self.TELEGRAM_CURSOR_FILE: str = os.path.join(self.PROJECT_ROOT, self.OUTPUT_DIR_NAME, self.config_data.get('file_paths', {}).get('telegram_cursor_file', 'telegram_channel_cursors.json'))
 
         # Subscription Output Paths
         self.SUB_DIR_NAME: str = self.config_data.get('file_paths', {}).get('sub_dir', 'subs')
@@ -106,6 +158,18 @@ class Settings:
         self.FULL_PLAINTEXT_PROTOCOL_SPECIFIC_DIR: str = os.path.join(self.FULL_PLAINTEXT_OUTPUT_PATH, self.PROTOCOL_SPECIFIC_SUB_DIR_NAME)
         self.FULL_BASE64_PROTOCOL_SPECIFIC_DIR: str = os.path.join(self.FULL_BASE64_OUTPUT_PATH, self.PROTOCOL_SPECIFIC_SUB_DIR_NAME)
 
+        # Clash YAML / SingBox JSON outputs, same layout as plaintext (mixed file + protocols/)
+        self.CLASH_OUTPUT_DIR_NAME: str = self.config_data.get('file_paths', {}).get('clash_output_dir', 'clash')
+        self.SINGBOX_OUTPUT_DIR_NAME: str = self.config_data.get('file_paths', {}).get('singbox_output_dir', 'singbox')
+        self.FULL_CLASH_OUTPUT_PATH: str = os.path.join(self.FULL_SUB_DIR_PATH, self.CLASH_OUTPUT_DIR_NAME)
+        self.FULL_SINGBOX_OUTPUT_PATH: str = os.path.join(self.FULL_SUB_DIR_PATH, self.SINGBOX_OUTPUT_DIR_NAME)
+
+        # Incremental publishing: digest manifest of the subscription files and added / removed delta files
+        self.OUTPUT_MANIFEST_FILE: str = os.path.join(self.FULL_SUB_DIR_PATH, self.config_data.get('file_paths', {}).get('manifest_file', 'manifest.json'))
+        self.DELTA_SUB_DIR_NAME: str = self.config_data.get('file_paths', {}).get('delta_sub_dir', 'deltas')
+        self.FULL_DELTA_OUTPUT_PATH: str = os.path.join(self.FULL_SUB_DIR_PATH, self.DELTA_SUB_DIR_NAME)
+        self.SHARD_INDEX_FILE: str = os.path.join(self.FULL_SUB_DIR_PATH, self.config_data.get('file_paths', {}).get('shard_index_file', 'shards.json'))
+
         # Report File Path
         self.REPORT_FILE: str = os.path.join(self.PROJECT_ROOT, self.OUTPUT_DIR_NAME, self.config_data.get('file_paths', {}).get('report_file', 'report.md'))
 
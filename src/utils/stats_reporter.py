@@ -25,6 +25,23 @@ class StatsReporter:
         self.initial_active_websites: int = 0
         self.newly_timed_out_channels: Set[str] = set()
         self.newly_timed_out_websites: Set[str] = set()
+        self.rate_limit_retries: int = 0
+        self.http_cache_hits: int = 0
+        self.http_cache_misses: int = 0
+        self.http_cache_bytes_saved: int = 0
+        self.parse_cache_hits: int = 0
+        self.parse_cache_misses: int = 0
+        self.streamed_body_modes: Dict[str, int] = {}
+        self.oversized_bodies: int = 0
+        self.cleaning_rule_hits: Dict[str, int] = {}
+        self.content_class_counts: Dict[str, int] = {}
+        self.content_class_confidence: Dict[str, float] = {}
+        self.structured_conversions: Dict[str, Dict[str, int]] = {}
+        self.semantic_duplicates: int = 0
+        self.canonicalization_bytes: Dict[str, Dict[str, int]] = {}
+        self.selection_weights: Dict[str, float] = {}
+        self.output_format_stats: Dict[str, Dict[str, float]] = {} # format -> files / entries / skipped / seconds
+        self.selection_drops: Dict[str, Dict[str, int]] = {} # protocol -> {'protocol_limit': n, 'total_limit': n}
 
     def start_report(self, initial_active_telegram_channels: int, initial_active_websites: int):
         """Starts the reporting period."""
@@ -65,6 +82,73 @@ class StatsReporter:
         """Increments the count of newly discovered websites."""
         self.discovered_website_count += 1
 
+    def increment_rate_limit_retries(self):
+        """Increments the count of requests retried after a 429 (rate limit) response."""
+        self.rate_limit_retries += 1
+
+    def record_http_cache_hit(self, bytes_saved: int):
+        """Records a 304 Not Modified response and the body size it avoided downloading."""
+        self.http_cache_hits += 1
+        self.http_cache_bytes_saved += bytes_saved
+
+    def record_http_cache_miss(self):
+        """Records a full download of a web source."""
+        self.http_cache_misses += 1
+
+    def record_parse_cache_hit(self):
+        """Records a ConfigParser.parse_content call answered from the parse cache."""
+        self.parse_cache_hits += 1
+
+    def record_parse_cache_miss(self):
+        """Records a ConfigParser.parse_content call that ran the full parsing pipeline."""
+        self.parse_cache_misses += 1
+
+    def record_semantic_duplicates(self, count: int):
+        """Records links dropped by the final dedup because another link points to the same server."""
+        self.semantic_duplicates += count
+
+    def record_output_file(self, format_name: str, entries: int, skipped: int, seconds: float):
+        """Records one written output file of a format (plaintext, base64, clash, singbox) and the time spent on it."""
+        format_stats = self.output_format_stats.setdefault(format_name, {'files': 0, 'entries': 0, 'skipped': 0, 'seconds': 0.0})
+        format_stats['files'] += 1
+        format_stats['entries'] += entries
+        format_stats['skipped'] += skipped
+        format_stats['seconds'] += seconds
+
+    def record_proxy_selection(self, weights: Dict[str, float], dropped_by_protocol_limit: Dict[str, int], dropped_by_total_limit: Dict[str, int]):
+        """Records the quality-score weights and the links dropped by MAX_PROXIES_PER_PROTOCOL / MAX_TOTAL_PROXIES."""
+        self.selection_weights = dict(weights)
+        for limit_name, drops in (('protocol_limit', dropped_by_protocol_limit), ('total_limit', dropped_by_total_limit)):
+            for protocol, count in drops.items():
+                protocol_drops = self.selection_drops.setdefault(protocol, {'protocol_limit': 0, 'total_limit': 0})
+                protocol_drops[limit_name] += count
+
+    def record_canonicalization(self, protocol: str, bytes_before: int, bytes_after: int):
+        """Records the size of one output link before and after canonicalization."""
+        protocol_bytes = self.canonicalization_bytes.setdefault(protocol, {'before': 0, 'after': 0})
+        protocol_bytes['before'] += bytes_before
+        protocol_bytes['after'] += bytes_after
+
+    def record_streamed_body(self, mode: str, oversized: bool):
+        """Records how a downloaded web source body was parsed (links / base64 / buffered) and whether it hit the size cap."""
+        self.streamed_body_modes[mode] = self.streamed_body_modes.get(mode, 0) + 1
+        if oversized:
+            self.oversized_bodies += 1
+
+    def record_cleaning_rule_hit(self, rule_name: str):
+        """Counts a trailing-junk cleaning rule that cut a link candidate."""
+        self.cleaning_rule_hits[rule_name] = self.cleaning_rule_hits.get(rule_name, 0) + 1
+
+    def record_content_class(self, content_class: str, confidence: float):
+        """Records the class chosen by the content sniffer for a parsed body, with its confidence."""
+        self.content_class_counts[content_class] = self.content_class_counts.get(content_class, 0) + 1
+        self.content_class_confidence[content_class] = self.content_class_confidence.get(content_class, 0.0) + confidence
+
+    def record_structured_conversion(self, source_format: str, outcome: str):
+        """Counts one proxy object of a structured config (clash / singbox) by outcome: converted, invalid, unsupported or inactive."""
+        outcomes = self.structured_conversions.setdefault(source_format, {})
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
     def add_newly_timed_out_channel(self, channel_name: str):
         """Adds a Telegram channel that newly entered timeout state."""
         self.newly_timed_out_channels.add(channel_name)
@@ -79,6 +163,8 @@ class StatsReporter:
         """
         from src.utils.settings_manager import settings as current_settings # Import inside function
         from src.utils.source_manager import source_manager as current_source_manager # Import here for clarity
+        from src.utils.protocol_validators import validation_primitives # Import here to avoid circular dependency
+        from src.utils.base64_service import base64_service # Counts its own cache hits (no per-lookup call into this module)
 
         report_lines: List[str] = []
 
@@ -107,6 +193,19 @@ class StatsReporter:
                 report_lines.append(f"| {protocol} | {count} |")
         else:
             report_lines.append("هیچ لینکی بر اساس پروتکل جمع‌آوری نشده است.")
+
+        report_lines.append("\n### ۲.۲. انتخاب بهترین لینک‌ها (محدودیت تعداد پروکسی):")
+        report_lines.append(f"- حداکثر کل پروکسی‌ها: {current_settings.MAX_TOTAL_PROXIES}")
+        if self.selection_weights:
+            criteria = "، ".join(f"{name}: {weight}" for name, weight in self.selection_weights.items())
+            report_lines.append(f"- معیارهای امتیاز کیفیت (وزن‌ها): {criteria}")
+        if self.selection_drops:
+            report_lines.append("| پروتکل | حذف‌شده (محدودیت پروتکل) | حذف‌شده (محدودیت کل) |")
+            report_lines.append("| :------ | :------------------------ | :-------------------- |")
+            for protocol, drops in sorted(self.selection_drops.items()):
+                report_lines.append(f"| {protocol} | {drops['protocol_limit']} | {drops['total_limit']} |")
+        else:
+            report_lines.append("- هیچ لینکی به دلیل محدودیت تعداد حذف نشد.")
         report_lines.append("\n")
 
         report_lines.append("## ۳. آمار مدیریت منابع")
@@ -114,6 +213,7 @@ class StatsReporter:
         report_lines.append(f"- وب‌سایت‌های فعال (ابتدای اجرا): {self.initial_active_websites}")
         report_lines.append(f"- کانال‌های تلگرام تازه کشف شده: **{self.discovered_channel_count}**")
         report_lines.append(f"- وب‌سایت‌های تازه کشف شده: **{self.discovered_website_count}**")
+        report_lines.append(f"- درخواست‌های تکرار شده به دلیل محدودیت نرخ (429): {self.rate_limit_retries}")
         
         if self.newly_timed_out_channels:
             report_lines.append("\n### ۳.۱. کانال‌های تلگرام تازه تایم‌اوت شده (به دلیل خطاهای مکرر):")
@@ -237,6 +337,91 @@ class StatsReporter:
             report_lines.append("هیچ لینکی از هیچ منبعی جمع‌آوری نشده است.")
         report_lines.append("\n")
 
+        report_lines.append("## ۶. آمار کش و کارایی")
+        report_lines.append("\n### ۶.۱. کش اعتبارسنج HTTP (ETag / Last-Modified):")
+        report_lines.append(f"- بدون تغییر (304، استفاده از لینک‌های ذخیره‌شده): {self.http_cache_hits}")
+        report_lines.append(f"- دانلود کامل: {self.http_cache_misses}")
+        report_lines.append(f"- حجم صرفه‌جویی شده: {self.http_cache_bytes_saved / 1024:.1f} KB")
+
+        report_lines.append("\n### ۶.۲. کش نتایج پارس (هش محتوا):")
+        parse_cache_lookups = self.parse_cache_hits + self.parse_cache_misses
+        parse_cache_hit_rate = (self.parse_cache_hits / parse_cache_lookups * 100) if parse_cache_lookups else 0
+        report_lines.append(f"- استفاده از نتیجه‌ی ذخیره‌شده: {self.parse_cache_hits}")
+        report_lines.append(f"- پارس کامل: {self.parse_cache_misses}")
+        report_lines.append(f"- نرخ موفقیت کش: {parse_cache_hit_rate:.1f}%")
+
+        report_lines.append("\n### ۶.۳. دانلود جریانی منابع وب:")
+        if self.streamed_body_modes:
+            for mode, count in sorted(self.streamed_body_modes.items()):
+                report_lines.append(f"- حالت پارس '{mode}': {count}")
+        else:
+            report_lines.append("- هیچ منبع وبی دانلود نشد.")
+        report_lines.append(f"- منابع قطع‌شده به دلیل عبور از سقف حجم: {self.oversized_bodies}")
+
+        report_lines.append("\n### ۶.۴. قوانین پاکسازی انتهای لینک:")
+        if self.cleaning_rule_hits:
+            for rule_name, count in sorted(self.cleaning_rule_hits.items(), key=lambda item: item[1], reverse=True):
+                report_lines.append(f"- {rule_name}: {count}")
+        else:
+            report_lines.append("- هیچ قانونی اعمال نشد.")
+
+        report_lines.append("\n### ۶.۵. تشخیص نوع محتوا:")
+        if self.content_class_counts:
+            report_lines.append("| نوع محتوا | تعداد | میانگین اطمینان |")
+            report_lines.append("|---|---|---|")
+            for content_class, count in sorted(self.content_class_counts.items(), key=lambda item: item[1], reverse=True):
+                average_confidence = self.content_class_confidence.get(content_class, 0.0) / count
+                report_lines.append(f"| {content_class} | {count} | {average_confidence:.2f} |")
+        else:
+            report_lines.append("- هیچ محتوایی پارس نشد.")
+
+        report_lines.append("\n### ۶.۶. تبدیل پروکسی‌های ساختاریافته به لینک:")
+        if self.structured_conversions:
+            report_lines.append("| قالب | تبدیل‌شده | نامعتبر | نوع پشتیبانی‌نشده | پروتکل غیرفعال |")
+            report_lines.append("|---|---|---|---|---|")
+            for source_format, outcomes in sorted(self.structured_conversions.items()):
+                report_lines.append(
+                    f"| {source_format} | {outcomes.get('converted', 0)} | {outcomes.get('invalid', 0)} | "
+                    f"{outcomes.get('unsupported', 0)} | {outcomes.get('inactive', 0)} |"
+                )
+        else:
+            report_lines.append("- هیچ پروکسی ساختاریافته‌ای پردازش نشد.")
+
+        report_lines.append("\n### ۶.۷. کش رمزگشایی Base64:")
+        base64_lookups = base64_service.hits + base64_service.misses
+        base64_hit_rate = (base64_service.hits / base64_lookups * 100) if base64_lookups else 0
+        report_lines.append(f"- استفاده از نتیجه‌ی ذخیره‌شده: {base64_service.hits}")
+        report_lines.append(f"- رمزگشایی کامل: {base64_service.misses}")
+        report_lines.append(f"- نرخ موفقیت کش: {base64_hit_rate:.1f}%")
+
+        report_lines.append("\n### ۶.۸. کش بررسی‌های پایه اعتبارسنجی (host / UUID):")
+        for primitive_name, (hits, misses) in validation_primitives.primitive_cache_stats().items():
+            lookups = hits + misses
+            hit_rate = (hits / lookups * 100) if lookups else 0
+            report_lines.append(f"- {primitive_name}: {hits} استفاده از کش، {misses} بررسی کامل (نرخ موفقیت کش: {hit_rate:.1f}%)")
+
+        report_lines.append("\n### ۶.۹. حذف لینک‌های تکراری (بر اساس هویت سرور):")
+        report_lines.append(f"- لینک‌های حذف‌شده به دلیل اشاره به سرور تکراری: {self.semantic_duplicates}")
+
+        report_lines.append("\n### ۶.۱۰. کوچک‌سازی لینک‌های خروجی (canonicalization):")
+        if self.canonicalization_bytes:
+            for protocol, protocol_bytes in sorted(self.canonicalization_bytes.items()):
+                saved_bytes = protocol_bytes['before'] - protocol_bytes['after']
+                saved_percent = (saved_bytes / protocol_bytes['before'] * 100) if protocol_bytes['before'] else 0
+                report_lines.append(f"- {protocol.upper()}: {saved_bytes} بایت صرفه‌جویی ({saved_percent:.1f}%)")
+        else:
+            report_lines.append("- هیچ لینکی کوچک‌سازی نشد.")
+
+        report_lines.append("\n### ۶.۱۱. زمان تولید فرمت‌های خروجی:")
+        if self.output_format_stats:
+            report_lines.append("| فرمت | تعداد فایل | ورودی‌های نوشته‌شده | لینک‌های پشتیبانی‌نشده | زمان (ms) |")
+            report_lines.append("| :--- | :--------- | :------------------ | :--------------------- | :-------- |")
+            for format_name, format_stats in self.output_format_stats.items():
+                report_lines.append(f"| {format_name} | {format_stats['files']} | {format_stats['entries']} | {format_stats['skipped']} | {format_stats['seconds'] * 1000:.1f} |")
+        else:
+            report_lines.append("- هیچ فایل خروجی‌ای نوشته نشد.")
+        report_lines.append("\n")
+
         report_lines.append("---")
         report_lines.append("**پایان گزارش.**")
         
@@ -0,0 +1,341 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Set
+from urllib.parse import unquote
+
+from src.utils.base64_service import base64_service
+from src.utils.parsed_link import ParsedLink, parse_link
+from src.utils.subscription_writer import SubscriptionFileWriter
+
+# ParsedLink -> Clash/Mihomo proxy or SingBox outbound (the reverse of the converters in
+# src/parsers). Builders get a record of an already validated link and its display name and return
+# None for links the format cannot express (SSR in SingBox, SS with a plugin, ...).
+ProxyBuilder = Callable[[ParsedLink, str], Optional[Dict]]
+
+TRUE_FLAGS = ('1', 'true')
+
+
+def _compact(entry: Dict) -> Dict:
+    """Drops None / '' / empty dict values, recursively, so optional fields are simply left out."""
+    compacted = {}
+    for key, value in entry.items():
+        if isinstance(value, dict):
+            value = _compact(value)
+            if not value:
+                continue
+        elif value is None or value == '':
+            continue
+        compacted[key] = value
+    return compacted
+
+
+def _flag(value: Optional[str]) -> Optional[bool]:
+    return True if value and value.lower() in TRUE_FLAGS else None
+
+
+def _split_values(value: Optional[str]) -> Optional[List[str]]:
+    return [item for item in value.split(',') if item] if value else None
+
+
+def _decode_ssr_param(value: Optional[str]) -> Optional[str]:
+    decoded = base64_service.decode(value) if value else None
+    return decoded.decode('utf-8', errors='replace') if decoded is not None else None
+
+
+def link_name(link: str, record: ParsedLink) -> str:
+    """Display name of a link: its #tag (vmess: the 'ps' field), or protocol-host:port without one."""
+    name = record.params.get('ps', '') if record.protocol == 'vmess' else unquote(link.partition('#')[2])
+    return name.strip() or f"{record.protocol}-{record.host}:{record.port}"
+
+
+def _transport(record: ParsedLink) -> Dict[str, str]:
+    """
+    Network, host, path and gRPC service name, from vless/trojan query parameters or vmess JSON
+    fields. Network is 'tcp', 'ws', 'grpc', 'h2' (HTTP/2, written 'h2' or 'http' in links) or
+    'tcp-http' (TCP with HTTP/1.1 header obfuscation).
+    """
+    params = record.params
+    if record.protocol == 'vmess':
+        network, path, service_name = params.get('net') or 'tcp', params.get('path'), params.get('path')
+        header_type = params.get('type')
+    else:
+        network, path, service_name = params.get('type') or 'tcp', params.get('path'), params.get('serviceName')
+        header_type = params.get('headerType')
+    if network == 'http':
+        network = 'h2'
+    elif network == 'tcp' and header_type == 'http':
+        network = 'tcp-http'
+    return {'network': network, 'host': params.get('host'), 'path': path, 'service_name': service_name}
+
+
+# --- Clash ---
+
+def _clash_transport(record: ParsedLink) -> Dict:
+    transport = _transport(record)
+    network = transport['network']
+    if network == 'ws':
+        return {'network': 'ws', 'ws-opts': {'path': transport['path'], 'headers': {'Host': transport['host']}}}
+    if network == 'grpc':
+        return {'network': 'grpc', 'grpc-opts': {'grpc-service-name': transport['service_name']}}
+    if network == 'h2':
+        return {'network': 'h2', 'h2-opts': {'host': [transport['host']] if transport['host'] else None, 'path': transport['path']}}
+    if network == 'tcp-http':
+        return {'network': 'http', 'http-opts': {'path': [transport['path'] or '/'], 'headers': {'Host': [transport['host']] if transport['host'] else None}}}
+    return {}
+
+
+def clash_vmess(record: ParsedLink, name: str) -> Optional[Dict]:
+    params = record.params
+    aid = params.get('aid', '0')
+    proxy = {
+        'name': name, 'type': 'vmess', 'server': record.host, 'port': record.port, 'uuid': record.credential,
+        'alterId': int(aid) if aid.isdigit() else 0, 'cipher': params.get('scy') or 'auto', 'udp': True,
+        'tls': True if params.get('tls') == 'tls' else None, 'servername': params.get('sni'),
+        'client-fingerprint': params.get('fp'),
+    }
+    proxy.update(_clash_transport(record))
+    return proxy
+
+
+def clash_vless(record: ParsedLink, name: str) -> Optional[Dict]:
+    params = record.params
+    proxy = {
+        'name': name, 'type': 'vless', 'server': record.host, 'port': record.port, 'uuid': record.credential, 'udp': True,
+        'tls': True if record.security in ('tls', 'reality') else None, 'servername': params.get('sni'),
+        'flow': params.get('flow'), 'client-fingerprint': params.get('fp'), 'alpn': _split_values(params.get('alpn')),
+        'skip-cert-verify': _flag(params.get('allowInsecure')),
+    }
+    if record.security == 'reality':
+        proxy['reality-opts'] = {'public-key': params.get('pbk'), 'short-id': params.get('sid')}
+    proxy.update(_clash_transport(record))
+    return proxy
+
+
+def clash_trojan(record: ParsedLink, name: str) -> Optional[Dict]:
+    params = record.params
+    proxy = {
+        'name': name, 'type': 'trojan', 'server': record.host, 'port': record.port, 'password': unquote(record.credential),
+        'udp': True, 'sni': params.get('sni') or params.get('peer'), 'client-fingerprint': params.get('fp'),
+        'alpn': _split_values(params.get('alpn')), 'skip-cert-verify': _flag(params.get('allowInsecure')),
+    }
+    proxy.update(_clash_transport(record))
+    return proxy
+
+
+def clash_ss(record: ParsedLink, name: str) -> Optional[Dict]:
+    if record.params.get('plugin'):
+        return None
+    return {'name': name, 'type': 'ss', 'server': record.host, 'port': record.port, 'cipher': record.params['method'],
+            'password': record.credential, 'udp': True}
+
+
+def clash_ssr(record: ParsedLink, name: str) -> Optional[Dict]:
+    params = record.params
+    password = _decode_ssr_param(record.credential)
+    if password is None:
+        return None
+    return {
+        'name': name, 'type': 'ssr', 'server': record.host, 'port': record.port, 'cipher': params['method'],
+        'password': password, 'protocol': params['protocol'], 'obfs': params['obfs'], 'udp': True,
+        'protocol-param': _decode_ssr_param(params.get('protoparam')), 'obfs-param': _decode_ssr_param(params.get('obfsparam')),
+    }
+
+
+def clash_hysteria2(record: ParsedLink, name: str) -> Optional[Dict]:
+    params = record.params
+    return {
+        'name': name, 'type': 'hysteria2', 'server': record.host, 'port': record.port, 'password': unquote(record.credential),
+        'sni': params.get('sni'), 'skip-cert-verify': _flag(params.get('insecure')), 'obfs': params.get('obfs'),
+        'obfs-password': params.get('obfs-password'), 'alpn': _split_values(params.get('alpn')),
+    }
+
+
+def clash_tuic(record: ParsedLink, name: str) -> Optional[Dict]:
+    params = record.params
+    uuid, _, password = unquote(record.credential).partition(':')
+    return {
+        'name': name, 'type': 'tuic', 'server': record.host, 'port': record.port, 'uuid': uuid, 'password': password,
+        'sni': params.get('sni'), 'congestion-controller': params.get('congestion_control'),
+        'udp-relay-mode': params.get('udp_relay_mode'), 'alpn': _split_values(params.get('alpn')),
+        'skip-cert-verify': _flag(params.get('allow_insecure')),
+    }
+
+
+CLASH_BUILDERS: Dict[str, ProxyBuilder] = {
+    'vmess': clash_vmess, 'vless': clash_vless, 'trojan': clash_trojan, 'ss': clash_ss, 'ssr': clash_ssr,
+    'hysteria2': clash_hysteria2, 'hy2': clash_hysteria2, 'tuic': clash_tuic,
+}
+
+
+# --- SingBox ---
+
+def _singbox_transport(record: ParsedLink) -> Optional[Dict]:
+    transport = _transport(record)
+    network = transport['network']
+    if network == 'ws':
+        return {'type': 'ws', 'path': transport['path'], 'headers': {'Host': transport['host']}}
+    if network == 'grpc':
+        return {'type': 'grpc', 'service_name': transport['service_name']}
+    if network in ('h2', 'tcp-http'): # HTTP/2 with TLS, HTTP/1.1 without
+        return {'type': 'http', 'host': [transport['host']] if transport['host'] else None, 'path': transport['path']}
+    return None
+
+
+def _singbox_tls(enabled: bool, server_name: Optional[str], insecure: Optional[str] = None, alpn: Optional[str] = None,
+                 fingerprint: Optional[str] = None) -> Optional[Dict]:
+    if not enabled:
+        return None
+    return {
+        'enabled': True, 'server_name': server_name, 'insecure': _flag(insecure), 'alpn': _split_values(alpn),
+        'utls': {'enabled': True, 'fingerprint': fingerprint} if fingerprint else None,
+    }
+
+
+def singbox_vmess(record: ParsedLink, name: str) -> Optional[Dict]:
+    params = record.params
+    aid = params.get('aid', '0')
+    return {
+        'type': 'vmess', 'tag': name, 'server': record.host, 'server_port': record.port, 'uuid': record.credential,
+        'security': params.get('scy') or 'auto', 'alter_id': int(aid) if aid.isdigit() else 0,
+        'tls': _singbox_tls(params.get('tls') == 'tls', params.get('sni'), alpn=params.get('alpn'), fingerprint=params.get('fp')),
+        'transport': _singbox_transport(record),
+    }
+
+
+def singbox_vless(record: ParsedLink, name: str) -> Optional[Dict]:
+    params = record.params
+    tls = _singbox_tls(record.security in ('tls', 'reality'), params.get('sni'), params.get('allowInsecure'),
+                       params.get('alpn'), params.get('fp'))
+    if record.security == 'reality':
+        tls['reality'] = {'enabled': True, 'public_key': params.get('pbk'), 'short_id': params.get('sid')}
+        tls['utls'] = {'enabled': True, 'fingerprint': params.get('fp') or 'chrome'} # REALITY requires uTLS
+    return {
+        'type': 'vless', 'tag': name, 'server': record.host, 'server_port': record.port, 'uuid': record.credential,
+        'flow': params.get('flow'), 'tls': tls, 'transport': _singbox_transport(record),
+    }
+
+
+def singbox_trojan(record: ParsedLink, name: str) -> Optional[Dict]:
+    params = record.params
+    return {
+        'type': 'trojan', 'tag': name, 'server': record.host, 'server_port': record.port, 'password': unquote(record.credential),
+        'tls': _singbox_tls(record.security != 'none', params.get('sni') or params.get('peer'), params.get('allowInsecure'),
+                            params.get('alpn'), params.get('fp')),
+        'transport': _singbox_transport(record),
+    }
+
+
+def singbox_ss(record: ParsedLink, name: str) -> Optional[Dict]:
+    if record.params.get('plugin'):
+        return None
+    return {'type': 'shadowsocks', 'tag': name, 'server': record.host, 'server_port': record.port,
+            'method': record.params['method'], 'password': record.credential}
+
+
+def singbox_hysteria2(record: ParsedLink, name: str) -> Optional[Dict]:
+    params = record.params
+    return {
+        'type': 'hysteria2', 'tag': name, 'server': record.host, 'server_port': record.port, 'password': unquote(record.credential),
+        'obfs': {'type': params.get('obfs'), 'password': params.get('obfs-password')} if params.get('obfs') else None,
+        'tls': _singbox_tls(True, params.get('sni'), params.get('insecure'), params.get('alpn')),
+    }
+
+
+def singbox_tuic(record: ParsedLink, name: str) -> Optional[Dict]:
+    params = record.params
+    uuid, _, password = unquote(record.credential).partition(':')
+    return {
+        'type': 'tuic', 'tag': name, 'server': record.host, 'server_port': record.port, 'uuid': uuid, 'password': password,
+        'congestion_control': params.get('congestion_control'), 'udp_relay_mode': params.get('udp_relay_mode'),
+        'tls': _singbox_tls(True, params.get('sni'), params.get('allow_insecure'), params.get('alpn')),
+    }
+
+
+SINGBOX_BUILDERS: Dict[str, ProxyBuilder] = {
+    'vmess': singbox_vmess, 'vless': singbox_vless, 'trojan': singbox_trojan, 'ss': singbox_ss,
+    'hysteria2': singbox_hysteria2, 'hy2': singbox_hysteria2, 'tuic': singbox_tuic,
+}
+
+
+class StructuredConfigWriter(SubscriptionFileWriter, ABC):
+    """
+    Base of the Clash / SingBox writers: each added link is parsed (shared parse_link cache), given
+    a unique name and turned into one proxy entry by the format's builder. Links the format cannot
+    express are counted in skipped_count; link_count is the number of entries written.
+    """
+
+    builders: Dict[str, ProxyBuilder] = {}
+
+    def __init__(self, file_path: str, previous_digest: Optional[str] = None):
+        super().__init__(file_path, previous_digest=previous_digest)
+        self.skipped_count = 0
+        self._used_names: Set[str] = set()
+        self._name_suffixes: Dict[str, int] = {} # last numeric suffix tried per name
+
+    def _unique_name(self, name: str) -> str:
+        """Clash names and SingBox tags must be unique: repeated names get ' 2', ' 3', ... appended."""
+        candidate = name
+        suffix = self._name_suffixes.get(name, 1)
+        while candidate in self._used_names:
+            suffix += 1
+            candidate = f"{name} {suffix}"
+        self._name_suffixes[name] = suffix
+        self._used_names.add(candidate)
+        return candidate
+
+    def _add(self, link: str):
+        record = parse_link(link)
+        builder = self.builders.get(record.protocol) if record is not None else None
+        entry = builder(record, self._unique_name(link_name(link, record))) if builder else None
+        if entry is None:
+            self.skipped_count += 1
+            return
+        self._write_entry(json.dumps(_compact(entry), ensure_ascii=False))
+        self.link_count += 1
+
+    @abstractmethod
+    def _write_entry(self, entry_json: str):
+        """Writes one proxy entry (a JSON object) in the format's syntax."""
+        pass
+
+
+class ClashYamlWriter(StructuredConfigWriter):
+    """
+    Clash/Mihomo 'proxies:' file. Each proxy is one YAML flow mapping line written in JSON syntax
+    (valid YAML), so entries are streamed without a YAML library.
+    """
+
+    builders = CLASH_BUILDERS
+
+    @property
+    def format_name(self) -> str:
+        return 'clash'
+
+    def _begin(self):
+        self._write(b'proxies:\n')
+
+    def _write_entry(self, entry_json: str):
+        self._write(f"  - {entry_json}\n".encode('utf-8'))
+
+    def _finish(self):
+        if not self.link_count:
+            self._write(b'  []\n')
+
+
+class SingBoxJsonWriter(StructuredConfigWriter):
+    """SingBox '{"outbounds": [...]}' file, one outbound per line."""
+
+    builders = SINGBOX_BUILDERS
+
+    @property
+    def format_name(self) -> str:
+        return 'singbox'
+
+    def _begin(self):
+        self._write(b'{"outbounds": [')
+
+    def _write_entry(self, entry_json: str):
+        self._write((',\n  ' if self.link_count else '\n  ').encode('utf-8') + entry_json.encode('utf-8'))
+
+    def _finish(self):
+        self._write(b'\n]}\n' if self.link_count else b']}\n')
@@ -0,0 +1,159 @@
+import base64
+import hashlib
+import os
+import time
+from typing import Iterable, Optional, Set
+
+# Multiple of 3, so every chunk encodes to Base64 without padding and the chunks concatenate
+# to exactly the encoding of the whole file.
+BASE64_CHUNK_BYTES = 3 * 16384
+DIGEST_READ_BYTES = 1024 * 1024
+
+
+def file_digest(file_path: str) -> Optional[str]:
+    """SHA-256 hex digest of a file, None if it does not exist."""
+    if not os.path.exists(file_path):
+        return None
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(DIGEST_READ_BYTES), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_link_set(file_path: str) -> Set[str]:
+    if not os.path.exists(file_path):
+        return set()
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return {line.rstrip('\n') for line in f if line.strip()}
+
+
+def _write_lines_atomically(file_path: str, lines: Iterable[str]):
+    tmp_path = f"{file_path}.tmp"
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for line in lines:
+            f.write(line + '\n')
+    os.replace(tmp_path, file_path)
+
+
+class SubscriptionFileWriter:
+    """
+    Streams links into one subscription file, plaintext (one link per line) or Base64 (the
+    newline-joined links, encoded incrementally in 3-byte-aligned chunks, after an optional
+    plaintext header). Everything goes to '<file_path>.tmp', which replaces file_path only when the
+    with-block exits without an exception, so clients never fetch a half-written file; on an
+    exception the temp file is removed and the previous file is kept.
+
+    The SHA-256 digest of the content is computed while writing. If it equals previous_digest (or,
+    without one, the digest of the existing file) the existing file is left untouched. With
+    delta_path_prefix (plaintext files only), '<prefix>.added.txt' / '<prefix>.removed.txt' list the
+    links added / removed against the previous file; like the file itself they are only rewritten
+    when the content changed, so they always describe its latest change.
+
+    Other output formats subclass it and override _begin / _add / _finish (see structured_output).
+    """
+
+    def __init__(self, file_path: str, encode_base64: bool = False, header: Optional[str] = None,
+                 previous_digest: Optional[str] = None, delta_path_prefix: Optional[str] = None):
+        self.file_path = file_path
+        self.tmp_path = f"{file_path}.tmp"
+        self.encode_base64 = encode_base64
+        self.header = header
+        self.previous_digest = previous_digest
+        self.delta_path_prefix = delta_path_prefix
+        self.link_count = 0
+        self.byte_count = 0
+        self.digest: Optional[str] = None
+        self.changed: Optional[bool] = None # set once the file is committed
+        self.added_count: Optional[int] = None # set when delta files were rewritten
+        self.removed_count: Optional[int] = None
+        self.elapsed_seconds = 0.0 # time spent formatting and writing this file
+        self._hash = hashlib.sha256()
+        self._pending = bytearray() # Base64 input not encoded yet (less than one chunk)
+        self._file = None
+
+    def __enter__(self) -> "SubscriptionFileWriter":
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        self._file = open(self.tmp_path, 'wb')
+        start = time.perf_counter()
+        self._begin()
+        self.elapsed_seconds += time.perf_counter() - start
+        return self
+
+    @property
+    def format_name(self) -> str:
+        return 'base64' if self.encode_base64 else 'plaintext'
+
+    def _write(self, data: bytes):
+        self._hash.update(data)
+        self.byte_count += len(data)
+        self._file.write(data)
+
+    def add(self, link: str):
+        """Appends one link."""
+        start = time.perf_counter()
+        self._add(link)
+        self.elapsed_seconds += time.perf_counter() - start
+
+    def _begin(self):
+        if self.header:
+            self._write(self.header.encode('utf-8'))
+
+    def _add(self, link: str):
+        if not self.encode_base64:
+            self._write(link.encode('utf-8') + b'\n')
+        else:
+            if self.link_count:
+                self._pending += b'\n'
+            self._pending += link.encode('utf-8')
+            if len(self._pending) >= BASE64_CHUNK_BYTES:
+                aligned_length = len(self._pending) - len(self._pending) % 3
+                self._write(base64.b64encode(self._pending[:aligned_length]))
+                del self._pending[:aligned_length]
+        self.link_count += 1
+
+    def _finish(self):
+        if self._pending:
+            self._write(base64.b64encode(self._pending)) # last chunk, padded
+
+    def _update_delta_files(self):
+        previous_links = _read_link_set(self.file_path)
+        with open(self.tmp_path, 'r', encoding='utf-8') as f:
+            new_links = [line.rstrip('\n') for line in f if line.strip()]
+        added = [link for link in new_links if link not in previous_links]
+        removed = sorted(previous_links.difference(new_links))
+        _write_lines_atomically(f"{self.delta_path_prefix}.added.txt", added)
+        _write_lines_atomically(f"{self.delta_path_prefix}.removed.txt", removed)
+        self.added_count, self.removed_count = len(added), len(removed)
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        committed = False
+        try:
+            if exc_type is None:
+                start = time.perf_counter()
+                self._finish()
+                self.elapsed_seconds += time.perf_counter() - start
+                self._file.close()
+                self.digest = self._hash.hexdigest()
+                previous_digest = self.previous_digest if os.path.exists(self.file_path) else None
+                self.changed = self.digest != (previous_digest or file_digest(self.file_path))
+                if self.changed:
+                    if self.delta_path_prefix:
+                        self._update_delta_files() # needs the previous file, so before it is replaced
+                    os.replace(self.tmp_path, self.file_path)
+                else:
+                    os.remove(self.tmp_path)
+                committed = True
+        finally:
+            if not committed:
+                self._file.close()
+                if os.path.exists(self.tmp_path):
+                    os.remove(self.tmp_path)
+        if not committed:
+            return False
+        if self.changed:
+            print(f"SubscriptionFileWriter: Saved {self.link_count} {self.format_name} links to {self.file_path}")
+        else:
+            print(f"SubscriptionFileWriter: {self.file_path} is unchanged ({self.link_count} links). Kept the existing file.")
+        return False
@@ -0,0 +1,34 @@
+from src.utils import link_canonicalizer
+from src.utils.link_canonicalizer import canonicalize_link, short_remark
+from src.utils.settings_manager import settings
+
+
+def test_plus_in_query_values_is_kept():
+    link = "hysteria2://pw@a.example.com:443?sni=a.example.com&obfs=salamander&obfs-password=a+b&insecure=0#n"
+    assert canonicalize_link('hysteria2', link) == "hysteria2://pw@a.example.com:443?obfs=salamander&obfs-password=a+b&sni=a.example.com#n"
+
+
+def test_wireguard_public_key_keeps_its_encoding():
+    link = "wireguard://priv%3D@a.example.com:51820?publickey=abc+def/ghi=&address=10.0.0.2%2F32&mtu=#n"
+    assert canonicalize_link('wireguard', link) == "wireguard://priv%3D@a.example.com:51820?address=10.0.0.2%2F32&publickey=abc+def/ghi=#n"
+
+
+def test_invalid_remark_template_keeps_the_remark(monkeypatch):
+    monkeypatch.setattr(settings, 'REMARK_TEMPLATE', "{protocol}-{name}")
+    link_canonicalizer._is_usable_remark_template.cache_clear()
+    assert short_remark("my node", 'vless', 1) == "my_node"
+    monkeypatch.setattr(settings, 'REMARK_TEMPLATE', "{protocol}-{index}")
+    assert short_remark("my node", 'vless', 1) == "vless-1"
+
+
+def test_non_ascii_remark_is_not_percent_encoded():
+    for remark in ("🇩🇪 سرور آلمان", "%F0%9F%87%A9%F0%9F%87%AA%20%D8%B3%D8%B1%D9%88%D8%B1"):
+        link = f"vless://d342d11e-d424-4583-b36e-524ab1f0afa4@a.example.com:443?security=tls&sni=a.example.com#{remark}"
+        canonical = canonicalize_link('vless', link)
+        assert canonical.endswith("#🇩🇪_سرور_آلمان") or canonical.endswith("#🇩🇪_سرور")
+        assert len(canonical.encode('utf-8')) <= len(link.encode('utf-8'))
+
+
+def test_remark_keeps_hash_and_percent_escaped():
+    link = "ss://YWVzLTI1Ni1nY206cHc@a.example.com:8388#a%23b%25c"
+    assert canonicalize_link('ss', link) == link
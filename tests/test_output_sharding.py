@@ -0,0 +1,44 @@
+import json
+import os
+
+from src.utils.output_manager import OutputManager
+from src.utils.output_sharding import SHARD_GROWTH_LIMIT, link_shard_key, shard_count, shard_file_path
+from src.utils.settings_manager import settings
+
+
+def _use_output_dir(monkeypatch, tmp_path):
+    sub_dir = settings.FULL_SUB_DIR_PATH
+    for name, value in list(vars(settings).items()):
+        if isinstance(value, str) and value.startswith(sub_dir):
+            monkeypatch.setattr(settings, name, str(tmp_path) + value[len(sub_dir):])
+
+
+def test_shard_count_growth_is_limited():
+    entries = [(link_shard_key(f"vless://u{i}@h{i}.com:443"), 40) for i in range(18)]
+    assert shard_count(entries, 3, 0) <= 6 * SHARD_GROWTH_LIMIT
+
+
+def test_every_shard_file_is_written(monkeypatch, tmp_path):
+    _use_output_dir(monkeypatch, tmp_path)
+    monkeypatch.setattr(settings, 'ACTIVE_PROTOCOLS', ['vless'])
+    monkeypatch.setattr(settings, 'PROTOCOLS_FOR_MIXED_OUTPUT', [])
+    monkeypatch.setattr(settings, 'SHARD_OUTPUT', True)
+    monkeypatch.setattr(settings, 'SHARD_MAX_LINKS', 3)
+    monkeypatch.setattr(settings, 'SHARD_MAX_BYTES', 0)
+    links = [f"vless://u{i}@h{i}.com:443#n{i}" for i in range(18)]
+    OutputManager().save_configs([{'protocol': 'vless', 'link': link} for link in links])
+
+    with open(settings.SHARD_INDEX_FILE, encoding='utf-8') as f:
+        shards = json.load(f)['outputs']['plaintext/mixed_links.txt']['shards']
+    assert [entry['shard'] for entry in shards] == list(range(1, len(shards) + 1))
+    written_links = []
+    for shard in range(len(shards)):
+        with open(shard_file_path(settings.PLAINTEXT_MIXED_FILE, shard), encoding='utf-8') as f:
+            written_links.extend(line.strip() for line in f if line.strip())
+    assert sorted(written_links) == sorted(links)
+    assert not os.path.exists(shard_file_path(settings.PLAINTEXT_MIXED_FILE, len(shards)))
+
+
+def test_shard_key_ignores_the_remark():
+    assert link_shard_key("vless://u1@h1.com:443#vless-1") == link_shard_key("vless://u1@h1.com:443#vless-7")
+    assert link_shard_key("vless://u1@h1.com:443") != link_shard_key("vless://u2@h1.com:443")
@@ -0,0 +1,25 @@
+from src.utils.text_cleaner import TextCleaner
+
+UUID = "d342d11e-d424-4583-b36e-524ab1f0afa4"
+
+
+def test_phrase_inside_host_path_and_query_is_kept():
+    cleaner = TextCleaner(["Channel"])
+    link = f"vless://{UUID}@channel.example.com:443?type=ws&host=Channel.example.com&path=%2Fchannel#node"
+    assert cleaner.strip_trailing_junk(link) == link
+
+
+def test_phrase_inside_a_remark_word_is_kept():
+    cleaner = TextCleaner(["Channel"])
+    link = f"vless://{UUID}@a.example.com:443#MyChannel"
+    assert cleaner.strip_trailing_junk(link) == link
+
+
+def test_phrase_after_whitespace_is_cut():
+    cleaner = TextCleaner(["Channel"])
+    assert cleaner.strip_trailing_junk(f"vless://{UUID}@a.example.com:443#node Channel @foo") == f"vless://{UUID}@a.example.com:443#node"
+
+
+def test_phrase_word_in_fragment_is_cut():
+    cleaner = TextCleaner(["Channel"])
+    assert cleaner.strip_trailing_junk("trojan://pass@a.example.com:443#free-channel-1") == "trojan://pass@a.example.com:443#free-"